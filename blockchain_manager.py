@@ -1,11 +1,18 @@
+import requests
 from web3 import Web3
 from eth_account import Account
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from config import RPC_ENDPOINTS, SUPPORTED_CHAINS
 
+# ERC-20 function selectors used for raw eth_call batches
+BALANCE_OF_SELECTOR = bytes.fromhex('70a08231')
+DECIMALS_SELECTOR = '0x313ce567'
+
 class BlockchainManager:
     def __init__(self):
         self.web3_instances = {}
+        self._rpc_session = requests.Session()  # keep-alive connection for batched JSON-RPC calls
+        self._token_decimals = {}  # (chain, token) -> decimals; ERC-20 decimals never change
         self._initialize_web3_instances()
     
     def _initialize_web3_instances(self):
@@ -92,6 +99,50 @@ class BlockchainManager:
             print(f"Error getting balance for {chain}: {e}")
             return None
     
+    def batch_get_balances(self, chain: str, token_address: str, address: str) -> Tuple[float, Optional[float]]:
+        """Get token and native balances for an address in a single JSON-RPC batch request"""
+        rpc_url = RPC_ENDPOINTS.get(chain)
+        if chain not in self.web3_instances or not rpc_url:
+            return 0.0, None
+        
+        try:
+            balance_of_data = '0x' + (BALANCE_OF_SELECTOR + bytes(12) + bytes.fromhex(address[2:])).hex()
+            token = Web3.to_checksum_address(token_address)
+            decimals_key = (chain, token)
+            batch = [
+                {'jsonrpc': '2.0', 'id': 1, 'method': 'eth_call',
+                 'params': [{'to': token, 'data': balance_of_data}, 'latest']},
+                {'jsonrpc': '2.0', 'id': 3, 'method': 'eth_getBalance',
+                 'params': [Web3.to_checksum_address(address), 'latest']}
+            ]
+            if decimals_key not in self._token_decimals:
+                batch.append({'jsonrpc': '2.0', 'id': 2, 'method': 'eth_call',
+                              'params': [{'to': token, 'data': DECIMALS_SELECTOR}, 'latest']})
+            response = self._rpc_session.post(rpc_url, json=batch, timeout=10)
+            items = response.json() if response.ok else None
+            if 400 <= response.status_code < 500 or isinstance(items, dict):
+                # The provider rejected the batch itself; send the calls one at a time instead
+                items = [self._rpc_session.post(rpc_url, json=call, timeout=10).json() for call in batch]
+            else:
+                response.raise_for_status()
+            
+            # Batch responses may come back in any order, so match them up by id
+            results = {}
+            for item in items:
+                result = item.get('result')
+                if result and result != '0x':
+                    results[item.get('id')] = int(result, 16)
+            
+            if 2 in results:
+                self._token_decimals[decimals_key] = results[2]
+            decimals = self._token_decimals.get(decimals_key, 18)
+            token_balance = results.get(1, 0) / (10 ** decimals)
+            native_balance = results[3] / 10 ** 18 if 3 in results else None
+            return token_balance, native_balance
+        except Exception as e:
+            print(f"Error getting batched balances for {chain}: {e}")
+            return 0.0, None
+    
     def estimate_gas(self, chain: str, from_address: str, to_address: str, 
                     value_wei: int) -> Optional[int]:
         """Estimate gas for a transfer"""
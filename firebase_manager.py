@@ -298,6 +298,22 @@ class FirebaseManager:
             print(f"Error getting Twitter user info: {e}")
             return {'isAuthenticated': False}
     
+    def get_twitter_auth_by_twitter_id(self, twitter_id: str) -> Optional[Dict[str, Any]]:
+        """Get the Twitter authentication data linked to an X user ID"""
+        try:
+            if not self.db:
+                return None
+            
+            docs = self.db.collection('twitter_auth').where('twitterId', '==', str(twitter_id)).limit(1).stream()
+            for doc in docs:
+                return doc.to_dict()
+            
+            return None
+            
+        except Exception as e:
+            print(f"Error getting Twitter auth by X ID: {e}")
+            return None
+    
     def remove_twitter_auth(self, user_id: int) -> bool:
         """Remove Twitter authentication data"""
         try:
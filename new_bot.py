@@ -8,11 +8,31 @@ import logging
 import asyncio
 import json
 import re
+import time
+import bisect
+import functools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from types import MappingProxyType
+import aiohttp
+import requests
 from dotenv import load_dotenv
 from aiohttp import web
+from eth_abi import encode as abi_encode, decode as abi_decode
+from web3 import Web3
 from config import TRADING_CONFIG
 
+try:
+    import uvloop  # faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson  # faster JSON encoding for the health endpoint
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -23,7 +43,647 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Slippage used until a user picks their own
+DEFAULT_SLIPPAGE = TRADING_CONFIG.get('BSC', {}).get('slippage', 0.5)
+
+# Token scan results are shared across users and refresh clicks for a short while
+SCAN_CACHE_TTL = 20  # seconds
+SCAN_CACHE_MAX_ENTRIES = 512
+
+# Trade screens only need taxes / holder data to be roughly current, so the
+# GoPlus half of a scan is kept much longer than the DexView market half
+SCAN_META_TTL = 3600  # seconds
+
+# Scans that finish faster than this skip the interim "Scanning..." message
+PLACEHOLDER_DELAY = 0.5  # seconds
+
+# ERC-20 name/symbol/decimals never change, so they are kept without a TTL
+TOKEN_INFO_CACHE_MAX_ENTRIES = 1024
+
+# Per-chat conversation state is bounded so abandoned flows can't grow it forever
+TRADING_STATE_MAX_ENTRIES = 10_000
+WALLET_CACHE_MAX_ENTRIES = 10_000
+SCAN_RESULT_TTL = 300  # seconds a scan stays available for refresh / Buy-Sell
+STATE_SWEEP_INTERVAL = 60  # seconds between expired-state sweeps
+QUICK_BALANCE_TTL = 5  # seconds a quick buy/sell screen reuses the last native balance
+TOKEN_BALANCE_TTL = 10  # seconds sell percentage buttons reuse the last token balance
+PRIVATE_KEY_CACHE_TTL = 300  # seconds a decrypted key is kept for back-to-back trades
+X_USER_CACHE_TTL = 300  # seconds an X user ID -> Telegram user link is reused
+
+# Trade results are posted as soon as the transaction is broadcast and edited
+# once its receipt shows up
+TX_CONFIRM_POLL_INTERVAL = 3  # seconds
+TX_CONFIRM_TIMEOUT = 180  # seconds
+
+# Outbound message pacing, kept under Telegram's flood limits
+GLOBAL_SEND_RATE = 30  # messages per second across all chats
+CHAT_SEND_RATE = 1  # messages per second within one chat...
+CHAT_SEND_BURST = 3  # ...with short bursts allowed (e.g. placeholder + edit)
+CHAT_LIMITER_MAX_ENTRIES = 10_000
+
+# X mention polling backs off while nothing is being tweeted at the bot
+X_POLL_INTERVAL = 30  # seconds
+X_POLL_MAX_INTERVAL = 300  # seconds
+
+# Replies go through an external API; don't let a slow reply hold up tweet processing
+TWEET_REPLY_TIMEOUT = 10  # seconds
+
+# getUpdates long poll: Telegram holds the request open until an update arrives,
+# so the poll itself paces the main loop. The socket read timeout sits above it.
+UPDATES_POLL_TIMEOUT = 50  # seconds
+UPDATES_SOCK_READ_TIMEOUT = 65  # seconds
+UPDATES_TOTAL_TIMEOUT = 75  # seconds
+
+# Worker threads for the synchronous web3 / Firestore clients
+IO_POOL_MAX_WORKERS = 32
+
+# Plain decimal amounts such as "1", "0.5" or ".25"; checked before float() so
+# typos are rejected without going through the exception path
+_AMOUNT_RE = re.compile(r'^\s*(?:\d+(?:\.\d*)?|\.\d+)\s*$')
+
+# A pasted private key: 64 hex characters, optionally 0x-prefixed
+_PRIVATE_KEY_RE = re.compile(r'(?:0x)?([0-9a-fA-F]{64})')
+
+def _parse_amount(amount_text):
+    """Return amount_text as a float, or None if it is not a plain decimal number"""
+    if not _AMOUNT_RE.match(amount_text):
+        return None
+    return float(amount_text)
+
+# @TweetFets commands, e.g. "@TweetFets SCAN 0x... BSC", "@TweetFets Buy 0.01 0x... ETH"
+# or "@TweetFets Sell 0x... 0.01"
+_TWEET_HELP_RE = re.compile(r'@TweetFets\s+help', re.IGNORECASE)
+_TWEET_SCAN_RE = re.compile(r'@TweetFets\s+SCAN\s+(0x[a-fA-F0-9]{40})\s+(BSC|ETH|SEPOLIA)', re.IGNORECASE)
+_TWEET_AMOUNT_FIRST_RE = re.compile(r'@TweetFets\s+(Buy|Sell)\s+([0-9.]+)\s+(0x[a-fA-F0-9]{40})(?:\s+([A-Z-]+))?')
+_TWEET_ADDRESS_FIRST_RE = re.compile(r'@TweetFets\s+(Buy|Sell)\s+(0x[a-fA-F0-9]{40})\s+([0-9.]+)(?:\s+([A-Z-]+))?')
+
+def _tweet_id_order(tweet_id):
+    """Comparable form of a decimal string tweet ID that orders numerically, without int()"""
+    return len(tweet_id), tweet_id
+
+def _tweet_id_key(tweet):
+    """Sort key ordering tweets by their IDs"""
+    return _tweet_id_order(tweet['id'])
+
+@functools.lru_cache(maxsize=4096)
+def _short_addr(address, head=10, tail=10):
+    """Shorten an address for display, e.g. 0x12345678...9abcdef012"""
+    if not tail:
+        return f"{address[:head]}..."
+    return f"{address[:head]}...{address[-tail:]}"
+
+# USD prices are shown with more decimals the smaller they are: below each
+# threshold the matching precision applies, above the last one 4 decimals
+_PRICE_THRESHOLDS = (0.000001, 0.01, 1)
+_PRICE_PRECISIONS = (12, 8, 6, 4)
+
+def _format_price_usd(price_usd):
+    """Format a USD token price, e.g. $0.00001234 or $1.2345"""
+    if not price_usd:
+        return "$0.0000"
+    precision = _PRICE_PRECISIONS[bisect.bisect_right(_PRICE_THRESHOLDS, price_usd)]
+    return f"${price_usd:.{precision}f}"
+
+# Last rendered "refreshed at" timestamp as [epoch second, string]
+_TIME_CACHE = [0, ""]
+
+def _now_str():
+    """Current local time as 'YYYY-MM-DD HH:MM:SS', formatted at most once per second"""
+    t = int(time.time())
+    cache = _TIME_CACHE
+    if cache[0] != t:
+        cache[0] = t
+        cache[1] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(t))
+    return cache[1]
+
+# Last rendered ISO timestamp as [epoch second, string]
+_ISO_TIME_CACHE = [0, ""]
+
+def _now_iso():
+    """Current local time in ISO format to the second, formatted at most once per second"""
+    t = int(time.time())
+    cache = _ISO_TIME_CACHE
+    if cache[0] != t:
+        cache[0] = t
+        cache[1] = datetime.fromtimestamp(t).isoformat()
+    return cache[1]
+
+# ==================== STATE STORES ====================
+
+class BoundedStateDict(OrderedDict):
+    """OrderedDict that keeps only the most recently written max_entries keys"""
+    
+    def __init__(self, max_entries):
+        super().__init__()
+        self.max_entries = max_entries
+    
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+class ExpiringDict:
+    """Minimal mapping whose entries expire ttl seconds after they were written"""
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._data = {}  # key -> (timestamp, value)
+    
+    def _entry(self, key):
+        entry = self._data.get(key)
+        if entry is not None and time.monotonic() - entry[0] >= self.ttl:
+            del self._data[key]
+            return None
+        return entry
+    
+    def __setitem__(self, key, value):
+        self._data[key] = (time.monotonic(), value)
+    
+    def __getitem__(self, key):
+        entry = self._entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[1]
+    
+    def __delitem__(self, key):
+        del self._data[key]
+    
+    def __contains__(self, key):
+        return self._entry(key) is not None
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def get(self, key, default=None):
+        entry = self._entry(key)
+        return default if entry is None else entry[1]
+    
+    def pop(self, key, default=None):
+        entry = self._entry(key)
+        self._data.pop(key, None)
+        return default if entry is None else entry[1]
+    
+    def purge_expired(self):
+        """Drop every expired entry; returns how many were removed"""
+        cutoff = time.monotonic() - self.ttl
+        expired = [key for key, (ts, _) in self._data.items() if ts <= cutoff]
+        for key in expired:
+            del self._data[key]
+        return len(expired)
+
+class TokenBucket:
+    """Async token bucket allowing rate acquisitions per second, bursting up to capacity"""
+    
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+# ==================== MESSAGE TEMPLATES ====================
+# Chain-specific parts are baked in once at import; only the numbers are
+# substituted per message.
+
+_CHAIN_INFO = MappingProxyType({
+    'ETH': MappingProxyType({'name': 'Ethereum Mainnet', 'symbol': 'ETH', 'dex': 'Uniswap V2', 'icon': '🔵'}),
+    'BSC': MappingProxyType({'name': 'BSC Mainnet', 'symbol': 'BNB', 'dex': 'PancakeSwap v2', 'icon': '🟡'}),
+    'SEPOLIA': MappingProxyType({'name': 'Sepolia Testnet', 'symbol': 'ETH', 'dex': 'Uniswap V2', 'icon': '🟣'}),
+})
+
+_NATIVE_SYMBOL = MappingProxyType({chain: info['symbol'] for chain, info in _CHAIN_INFO.items()})
+
+# RPC endpoints for the bot's direct balance reads
+_BALANCE_RPC_URLS = MappingProxyType({
+    'BSC': 'https://bsc-dataseed.binance.org',
+    'ETH': 'https://mainnet.infura.io/v3/7294966a87974f75ae25d7835d2eb8bb',
+})
+
+# Multicall3 is deployed at the same address on every EVM chain we support
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+_AGGREGATE3_SELECTOR = bytes.fromhex('82ad56cb')  # aggregate3((address,bool,bytes)[])
+_GET_ETH_BALANCE_SELECTOR = bytes.fromhex('4d2301cc')  # getEthBalance(address)
+_BALANCE_OF_SELECTOR = bytes.fromhex('70a08231')  # balanceOf(address)
+_DECIMALS_SELECTOR = bytes.fromhex('313ce567')  # decimals()
+
+# Block explorer transaction URL prefix per chain
+_EXPLORER_TX = MappingProxyType({
+    'ETH': 'https://etherscan.io/tx/',
+    'BSC': 'https://bscscan.com/tx/',
+    'SEPOLIA': 'https://sepolia.etherscan.io/tx/',
+})
+
+# Callback data prefixes carrying a token address
+COPY_ADDRESS_PREFIX = 'copy_address_'
+REFRESH_SCAN_PREFIX = 'refresh_scan_'
+
+# Keyboard layouts as (text, callback_data template) rows; filled in by _build_keyboard
+_SCAN_RESULT_KB_TEMPLATE = (
+    (('💰 Buy/Sell', 'select_chain_{chain}'),),
+    (('📋 Copy Address', 'copy_address_{token_address}'), ('🔄 Refresh', 'refresh_scan_{token_address}')),
+    (('🔍 Scan Another', 'scanner'), ('🔙 Back to Main', 'main_menu')),
+)
+
+def _build_keyboard(template, **fields):
+    """Materialize a keyboard template into Telegram's inline_keyboard markup"""
+    return {'inline_keyboard': [
+        [{'text': text, 'callback_data': callback.format(**fields)} for text, callback in row]
+        for row in template
+    ]}
+
+def _build_token_info_template(chain, chain_data):
+    """Build the detailed token info template for a chain"""
+    return (
+        "🪙 %(token_name)s ($%(token_symbol)s)\n"
+        "%(token_address)s\n"
+        "V2 Pool 🔗 " + chain + "\n\n"
+        "⛽ " + chain + " | 0.1 GWEI  Ξ $0.0₆1\n\n"
+        "🧢 MC $%(fdv)s | 💵 Price %(price_usd)s\n"
+        "⚖️ Taxes | 🅑 %(buy_tax).1f%% 🅢 %(sell_tax).1f%% 🅣 %(transfer_tax).1f%%\n"
+        "💧 Liquidity | $%(liquidity_usd)s (%(liquidity_percentage).2f%%)\n"
+        "🕓 Refresh | %(refreshed_at)s\n\n"
+        "💰 Balance\n"
+        " %(token_symbol)s   | " + chain_data['symbol'] + "\n"
+        " %(wallet_balance).6f | %(native_balance).6f\n\n"
+        "%(liquidity_warning)s"
+        "Enter Amount (%(amount_symbol)s):"
+    )
+
+def _build_token_fallback_templates(chain_data):
+    """Build the simple 'address valid' templates for a chain, keyed by action"""
+    header = (
+        "✅ Token Address Valid!\n\n"
+        "🔑 Token: `%(short_address)s...`\n"
+        "🌐 Network: " + chain_data['name'] + "\n"
+        "🔄 DEX: " + chain_data['dex'] + "\n\n"
+    )
+    return {
+        'buy': header + (
+            "💰 Step 2: Enter the amount of " + chain_data['symbol'] + " to spend\n\n"
+            "💡 Example: 0.1, 0.5, 1.0\n\n"
+            "🔧 Just type the amount below:"
+        ),
+        'sell': header + (
+            "💰 Step 2: Enter the amount of tokens to sell\n\n"
+            "💡 Example: 100, 1000, 5000\n\n"
+            "🔧 Just type the amount below:"
+        ),
+    }
+
+_TOKEN_INFO_TMPL = {
+    chain: _build_token_info_template(chain, chain_data)
+    for chain, chain_data in _CHAIN_INFO.items()
+}
+_TOKEN_FALLBACK_TMPL = {
+    chain: _build_token_fallback_templates(chain_data)
+    for chain, chain_data in _CHAIN_INFO.items()
+}
+
+_SCANNING_TMPL = (
+    "🔍 **Scanning Token...**\n\n"
+    "📍 **Address:** `{token_address}`\n"
+    "🌐 **Chain:** {chain}\n"
+    "⏳ **Status:** Fetching token data..."
+)
+
+_REFRESHING_TMPL = (
+    "🔄 **Refreshing Token Data...**\n\n"
+    "📍 **Address:** `{token_address}`\n"
+    "🌐 **Chain:** {chain}\n"
+    "⏳ **Status:** Fetching updated data..."
+)
+
+_SCAN_ERROR_TMPL = (
+    "❌ **Token Scan Failed**\n\n"
+    "**Error:** {error}\n\n"
+    "💡 **Possible reasons:**\n"
+    "• Token doesn't exist on {chain} chain\n"
+    "• Invalid contract address\n"
+    "• API temporarily unavailable\n\n"
+    "🔍 **Try again with a different address or chain**"
+)
+
+_REFRESH_ERROR_TMPL = (
+    "❌ **Refresh Failed**\n\n"
+    "**Error:** {error}\n\n"
+    "💡 **Possible reasons:**\n"
+    "• Token data temporarily unavailable\n"
+    "• API temporarily unavailable\n\n"
+    "🔍 **Try again later**"
+)
+
+_TECHNICAL_ERROR_TMPL = (
+    "❌ **{title}**\n\n"
+    "**Error:** {error}\n\n"
+    "🔧 **Technical Issue:** Please try again later"
+)
+
+_BUY_OVERVIEW_TMPL = (
+    "🟢 **BUY TRANSACTION OVERVIEW**\n\n"
+    "🔑 **Token:** `{addr}...`\n"
+    "🌐 Network: {chain_name}\n"
+    "🔄 **DEX:** {dex}\n\n"
+    "💰 **Transaction Details:**\n"
+    "• **{native} Amount:** {bnb_amount:.6f} {native}\n"
+    "• **Estimated Gas:** {gas:.6f} {native}\n"
+    "• **Total Cost:** {total:.6f} {native}\n\n"
+    "🪙 **Token Details:**\n"
+    "• **Tokens to Receive:** {tokens:.6f}\n"
+    "• **Price per Token:** {price:.8f} {native}\n"
+    "• **Slippage:** {slip}%\n\n"
+    "📊 **Price Impact:** Low\n"
+    "⏱️ **Estimated Time:** 30-60 seconds\n\n"
+    "⚠️ **Please review the details above.**\n"
+    "Click 'Confirm Buy' to proceed with the transaction."
+)
+
+_SELL_OVERVIEW_TMPL = (
+    "🔴 **SELL TRANSACTION OVERVIEW**\n\n"
+    "🔑 **Token:** `{addr}...`\n"
+    "🌐 Network: {chain_name}\n"
+    "🔄 **DEX:** {dex}\n\n"
+    "🪙 **Transaction Details:**\n"
+    "• **Token Amount:** {tokens:.2f}\n"
+    "• **Estimated {native}:** {estimated:.6f} {native}\n"
+    "• **Gas Fee:** {gas:.6f} {native}\n"
+    "• **Net {native}:** {net:.6f} {native}\n\n"
+    "💰 **Price Details:**\n"
+    "• **Price per Token:** {price:.8f} {native}\n"
+    "• **Slippage:** {slip}%\n\n"
+    "📊 **Price Impact:** Low\n"
+    "⏱️ **Estimated Time:** 30-60 seconds\n\n"
+    "⚠️ **Please review the details above.**\n"
+    "Click 'Confirm Sell' to proceed with the transaction."
+)
+
+# Sell overview for the quick amount buttons, which start from a native amount
+_QUICK_SELL_OVERVIEW_TMPL = (
+    "🔴 **SELL TRANSACTION OVERVIEW**\n\n"
+    "🔑 **Token:** `{addr}...`\n"
+    "🌐 Network: {chain_name}\n"
+    "🔄 **DEX:** {dex}\n\n"
+    "💰 **Transaction Details:**\n"
+    "• **{native} Amount:** {bnb_amount:.6f} {native}\n"
+    "• **Estimated Gas:** {gas:.6f} {native}\n"
+    "• **Total Cost:** {total:.6f} {native}\n\n"
+    "🪙 **Token Details:**\n"
+    "• **Token Amount:** {tokens:.2f}\n"
+    "• **Estimated {native}:** {estimated:.6f} {native}\n"
+    "• **Gas Fee:** {gas:.6f} {native}\n"
+    "• **Net {native}:** {net:.6f} {native}\n\n"
+    "💰 **Price Details:**\n"
+    "• **Price per Token:** {price:.8f} {native}\n"
+    "• **Slippage:** {slip}%\n\n"
+    "📊 **Price Impact:** Low\n"
+    "⏱️ **Estimated Time:** 30-60 seconds\n\n"
+    "⚠️ **Please review the details above.**\n"
+    "Click 'Confirm Sell' to proceed with the transaction."
+)
+
+_SELL_PERCENTAGE_OVERVIEW_TMPL = (
+    "🔴 **SELL TRANSACTION OVERVIEW**\n\n"
+    "🔑 **Token:** `{addr}...`\n"
+    "🌐 Network: {chain_name}\n"
+    "🔄 **DEX:** {dex}\n\n"
+    "💰 **Transaction Details:**\n"
+    "• **Token Amount:** {tokens:.6f}\n"
+    "• **Percentage:** {percentage}% of balance\n"
+    "• **Total Balance:** {balance:.6f}\n\n"
+    "🪙 **Token Details:**\n"
+    "• **Estimated {native}:** {estimated:.6f} {native}\n"
+    "• **Gas Fee:** {gas:.6f} {native}\n"
+    "• **Net {native}:** {net:.6f} {native}\n\n"
+    "💰 **Price Details:**\n"
+    "• **Price per Token:** 0.00280184 {native}\n"
+    "• **Slippage:** {slip}%\n\n"
+    "📊 **Price Impact:** Low\n"
+    "⏱️ **Estimated Time:** 30-60 seconds\n\n"
+    "⚠️ **Please review the details above.**\n"
+    "Click 'Confirm Sell' to proceed with the transaction."
+)
+
+_TRANSFER_CONFIRM_TMPL_NATIVE = (
+    "💰 **Native {native} Transfer Confirmation**\n\n"
+    "🌐 Network: {chain_name}\n"
+    "💸 **Amount:** {amount} {native}\n"
+    "📍 **To:** `{to_start}...{to_end}`\n"
+    "🔑 **From:** `{from_start}...{from_end}`\n\n"
+    "⚠️ **Please confirm the transfer details above.**\n"
+    "Click 'Confirm Transfer' to proceed."
+)
+
+_TRANSFER_CONFIRM_TMPL_TOKEN = (
+    "🪙 **Token Transfer Confirmation**\n\n"
+    "🌐 Network: {chain_name}\n"
+    "🪙 **Token:** {token_display}\n"
+    "💸 **Amount:** {amount} {symbol}\n"
+    "📍 **To:** `{to_start}...{to_end}`\n"
+    "🔑 **From:** `{from_start}...{from_end}`\n\n"
+    "⚠️ **Please confirm the transfer details above.**\n"
+    "Click 'Confirm Transfer' to proceed."
+)
+
+_SLIPPAGE_SET_TMPL = (
+    "✅ **Custom Slippage Set Successfully!**\n\n"
+    "📊 **New Setting:** {slippage}%\n\n"
+    "{advice}"
+    "\n💾 **Note:** This setting will be used for all future trades."
+)
+
+# (upper bound, advice) pairs checked in order; the last entry catches everything above
+_SLIPPAGE_ADVICE = (
+    (0.5, "💡 **Low Slippage:**\n"
+          "• Excellent price protection\n"
+          "• May fail on volatile tokens\n"
+          "• Best for stable tokens and small trades"),
+    (1.0, "💡 **Medium Slippage:**\n"
+          "• Good price protection\n"
+          "• Balanced success rate\n"
+          "• Recommended for most trades"),
+    (2.0, "💡 **High Slippage:**\n"
+          "• Higher success rate\n"
+          "• Moderate price protection\n"
+          "• Good for volatile tokens"),
+    (float('inf'), "💡 **Very High Slippage:**\n"
+                   "• Maximum success rate\n"
+                   "• Lower price protection\n"
+                   "• Use for very volatile tokens or urgent trades"),
+)
+
+# Reply to "@TweetFets help"
+_TWEETFETS_HELP_TEXT = (
+    "🐦 @TweetFets Bot Commands:\n\n"
+    "Buy: @TweetFets Buy 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01\n"
+    "Sell: @TweetFets Sell 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01\n"
+    "Alternative: @TweetFets Buy 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01\n"
+    "With Chain: @TweetFets Buy 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01 BSC/ETH/SEPOLIA\n"
+    "Or: @TweetFets Buy 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01 ETH\n"
+    "Scan: @TweetFets SCAN 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 BSC/ETH/SEPOLIA\n\n"
+    "Chains: BSC (default), ETH, SEPOLIA\n"
+    "⚠️ Authenticate first via Telegram bot!"
+)
+
+_EDIT_SLIPPAGE_TEXT = (
+    "⚙️ Slippage Settings\n\n"
+    "Current Slippage: {current_slippage}%\n\n"
+    "💡 Slippage tolerance allows for price movement during trade execution.\n"
+    "Higher slippage = faster execution but potentially worse price.\n\n"
+    "🔧 Enter new slippage percentage (0.1 - 50):"
+)
+
+_RESET_TWEET_ID_TEXT = (
+    "🔄 **Tweet ID Reset Successfully!**\n\n"
+    "✅ **Last processed tweet ID has been reset**\n"
+    "🆔 **Previous ID:** {old_id}\n"
+    "📱 **Next run will process all recent tweets**\n"
+    "⚠️ **Note:** This will cause the bot to process tweets from the beginning"
+)
+
+# X bot status text keyed by (configured, running)
+_X_BOT_STATUS_TMPL = MappingProxyType({
+    (True, True): (
+        "🐦 **X Bot Status:** {status}\n\n"
+        "📱 **Status:** {message}\n"
+        "🔧 **Configuration:** ✅ Configured\n"
+        "🟢 **Status:** Running and monitoring tweets\n"
+        "📊 **Monitoring:** @TweetFets mentions\n"
+        f"⏱️ **Check Interval:** {X_POLL_INTERVAL}s, backing off to {X_POLL_MAX_INTERVAL // 60} min while idle\n"
+        "🆔 **Last Processed Tweet ID:** {last_tweet_id}\n"
+        "🌐 **Reply API:** {external_api}"
+    ),
+    (True, False): (
+        "🐦 **X Bot Status:** {status}\n\n"
+        "📱 **Status:** {message}\n"
+        "🔧 **Configuration:** ✅ Configured\n"
+        "🔴 **Status:** Stopped\n"
+        "💡 **Action:** Bot will start automatically when credentials are added"
+    ),
+    (False, False): (
+        "🐦 **X Bot Status:** {status}\n\n"
+        "❌ **Configuration:** Not configured\n"
+        "💡 **To enable:** Add Twitter API credentials to .env file\n\n"
+        "**Required credentials:**\n"
+        "• X_BEARER_TOKEN\n"
+        "• X_API_KEY\n"
+        "• X_API_SECRET\n"
+        "• X_ACCESS_TOKEN\n"
+        "• X_ACCESS_TOKEN_SECRET"
+    ),
+})
+
+_CUSTOM_AMOUNT_TEXT = (
+    "💰 Enter Custom Amount\n\n"
+    "🌐 Network: {network}\n"
+    "💡 Example: 0.1, 0.5, 1.0, 2.5\n\n"
+    "🔧 Type the amount of {symbol} you want to spend:"
+)
+
+# Shown by the quick trade commands when the user has no wallet yet; the
+# keyboard is serialized once since send_message accepts pre-encoded markup
+_NO_WALLET_TEXT = (
+    "❌ **No Wallet Found**\n\n"
+    "You need to create or import a wallet first.\n"
+    "Use the Wallet menu to get started!"
+)
+_NO_WALLET_KEYBOARD_JSON = json.dumps({'inline_keyboard': [
+    [{'text': '🔐 Create Wallet', 'callback_data': 'create_wallet'}],
+    [{'text': '📥 Import Wallet', 'callback_data': 'import_wallet'}],
+    [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
+]})
+
+# Static keyboards, serialized once like the no-wallet one above
+_SLIPPAGE_KEYBOARD_JSON = json.dumps({'inline_keyboard': [
+    [
+        {'text': '0.5%', 'callback_data': 'set_slippage_0.5'},
+        {'text': '1%', 'callback_data': 'set_slippage_1'},
+        {'text': '2%', 'callback_data': 'set_slippage_2'}
+    ],
+    [
+        {'text': '5%', 'callback_data': 'set_slippage_5'},
+        {'text': '10%', 'callback_data': 'set_slippage_10'},
+        {'text': 'Custom', 'callback_data': 'set_slippage_custom'}
+    ],
+    [{'text': '🔙 Back to Trading', 'callback_data': 'buy_sell'}]
+]})
+_X_BOT_STATUS_KEYBOARD_JSON = json.dumps({'inline_keyboard': [
+    [{'text': '🔄 Reset Tweet ID', 'callback_data': 'reset_tweet_id'}],
+    [{'text': '🔙 Back to Main', 'callback_data': 'main_menu'}]
+]})
+_BACK_TO_MAIN_KEYBOARD_JSON = json.dumps({'inline_keyboard': [
+    [{'text': '🔙 Back to Main', 'callback_data': 'main_menu'}]
+]})
+_CUSTOM_AMOUNT_KEYBOARD_JSON = json.dumps({'inline_keyboard': [
+    [{'text': '🔙 Back to Amount Selection', 'callback_data': 'buy_sell'}]
+]})
+_BACK_TO_TRADING_KEYBOARD_JSON = json.dumps({'inline_keyboard': [
+    [{'text': '🔙 Back to Trading', 'callback_data': 'buy_sell'}]
+]})
+_CUSTOM_SLIPPAGE_KEYBOARD_JSON = json.dumps({'inline_keyboard': [
+    [{'text': '🔙 Back to Slippage Settings', 'callback_data': 'edit_slippage_buy'}]
+]})
+_SLIPPAGE_SET_KEYBOARD_JSON = json.dumps({'inline_keyboard': [
+    [
+        {'text': '🔙 Back to Slippage', 'callback_data': 'settings_slippage'},
+        {'text': '⚙️ Settings', 'callback_data': 'settings'}
+    ]
+]})
+
+# Trade overview keyboards keyed by action
+_CONFIRM_KEYBOARD_JSON = MappingProxyType({
+    action: json.dumps({'inline_keyboard': [[
+        {'text': f'✅ Confirm {action.title()}', 'callback_data': f'confirm_{action}'},
+        {'text': '❌ Cancel', 'callback_data': 'buy_sell'}
+    ]]})
+    for action in ('buy', 'sell')
+})
+
+# Title emoji for the quick buy/sell screens opened from a trade success message
+_QUICK_ACTION_EMOJI = MappingProxyType({'buy': '🟢', 'sell': '🔴'})
+
+def _json_bytes(obj):
+    """Encode obj as JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+@functools.lru_cache(maxsize=256)
+def _success_keyboard_json(chain, token_symbol):
+    """Serialized quick buy/sell keyboard shown under a successful trade"""
+    return json.dumps({'inline_keyboard': [
+        [
+            {'text': f'🟢 Buy {token_symbol}', 'callback_data': f'quick_buy_{chain}'},
+            {'text': f'🔴 Sell {token_symbol}', 'callback_data': f'quick_sell_{chain}'}
+        ],
+        [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
+    ]})
+
 class SimpleTelegramBot:
+    # Fixed attribute layout: no per-instance __dict__ and slot-based attribute access
+    __slots__ = (
+        'bot_token', 'base_url', 'offset', 'running', 'user_cache',
+        'x_bearer_token', 'x_api_key', 'x_api_secret', 'x_access_token', 'x_access_token_secret',
+        'firebase', 'blockchain', 'trading', 'encryption', 'token_scanner',
+        'positions_manager', 'transfer_manager', 'user_slippage',
+        'trading_state', 'last_scan_results', '_sweep_task', '_amount_handlers', '_command_handlers',
+        '_scan_cache', '_token_info_cache', '_scan_inflight',
+        '_wallet_cache', '_quick_balance_cache', '_token_balance_cache', '_private_key_cache', '_x_user_cache',
+        '_global_limiter', '_chat_limiters', '_http', '_background_tasks', '_w3', '_token_decimals',
+        '_io_pool', 'x_bot_running', 'last_processed_tweet_id', '_health_cache',
+    )
+    
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}"
@@ -42,14 +702,64 @@ class SimpleTelegramBot:
         self.initialize_components()
         
         # Simple trading state
-        self.trading_state = {}  # chat_id -> {action: 'buy'|'sell', token: 'address', amount: 'value'}
+        self.trading_state = BoundedStateDict(TRADING_STATE_MAX_ENTRIES)  # chat_id -> {action: 'buy'|'sell', token_address: 'address', amount: 'value'}
         
         # Scanner state for refresh functionality
-        self.last_scan_results = {}  # chat_id -> {result: scan_result, token_address: address, chain: chain}
+        self.last_scan_results = ExpiringDict(SCAN_RESULT_TTL)  # chat_id -> {result: scan_result, token_address: address, chain: chain}
+        self._sweep_task = None
+        
+        # Amount input handlers keyed by trading_state action; buy/sell use the default path
+        self._amount_handlers = {
+            'transfer_native': self._process_transfer_native_amount,
+            'transfer_token_amount': self._process_transfer_token_amount,
+            'set_slippage': self._process_slippage_amount
+        }
+        
+        # Slash command handlers, all called as handler(chat_id, user_id, username)
+        self._command_handlers = {
+            '/start': self.handle_start_command,
+            '/help': lambda chat_id, user_id, username: self.handle_help(chat_id),
+            '/buybsc': lambda chat_id, user_id, username: self.handle_quick_buy_command(chat_id, user_id, 'BSC'),
+            '/buyeth': lambda chat_id, user_id, username: self.handle_quick_buy_command(chat_id, user_id, 'ETH'),
+            '/sellbsc': lambda chat_id, user_id, username: self.handle_quick_sell_command(chat_id, user_id, 'BSC'),
+            '/selleth': lambda chat_id, user_id, username: self.handle_quick_sell_command(chat_id, user_id, 'ETH')
+        }
+        
+        # Short-lived memo of scanner API responses
+        self._scan_cache = OrderedDict()  # (kind, chain, address) -> (timestamp, lifetime, result)
+        self._token_info_cache = BoundedStateDict(TOKEN_INFO_CACHE_MAX_ENTRIES)  # (chain, contract) -> token_info
+        self._scan_inflight = {}  # (kind, chain, address) -> Task of the running lookup
+        
+        # Public wallet data per user; only changes through the bot's own create/import/delete
+        self._wallet_cache = BoundedStateDict(WALLET_CACHE_MAX_ENTRIES)  # user_id -> wallet
+        self._quick_balance_cache = ExpiringDict(QUICK_BALANCE_TTL)  # (chain, wallet) -> native balance
+        self._token_balance_cache = ExpiringDict(TOKEN_BALANCE_TTL)  # (chain, wallet, token) -> token balance
+        self._private_key_cache = ExpiringDict(PRIVATE_KEY_CACHE_TTL)  # user_id -> decrypted private key
+        self._x_user_cache = ExpiringDict(X_USER_CACHE_TTL)  # X user ID -> twitter_auth document
+        
+        # Outbound message rate limiting
+        self._global_limiter = TokenBucket(GLOBAL_SEND_RATE)
+        self._chat_limiters = BoundedStateDict(CHAT_LIMITER_MAX_ENTRIES)  # chat_id -> TokenBucket
+        
+        # Pooled HTTP session for Bot API messages, created lazily inside the event loop
+        self._http = None
+        
+        # Fire-and-forget tasks (e.g. trade confirmations), referenced until they finish
+        self._background_tasks = set()
+        
+        # Web3 clients for direct balance reads, one per chain with a keep-alive session
+        self._w3 = {}
+        self._token_decimals = BoundedStateDict(TOKEN_INFO_CACHE_MAX_ENTRIES)  # (chain, token) -> decimals
+        
+        # Dedicated pool for blocking RPC / database calls made from handlers
+        self._io_pool = ThreadPoolExecutor(max_workers=IO_POOL_MAX_WORKERS, thread_name_prefix='bot-io')
         
         # X Bot state
         self.x_bot_running = False
         self.last_processed_tweet_id = None
+        
+        # Last /health payload as (state key, encoded body)
+        self._health_cache = (None, b'')
     
     def initialize_components(self):
         try:
@@ -78,22 +788,337 @@ class SimpleTelegramBot:
             logger.error(f"❌ Error initializing components: {e}")
             raise
     
+    async def _get_http_session(self):
+        """Return the shared HTTP session (Bot API, Twitter and reply API), (re)creating it if needed"""
+        if self._http is None or self._http.closed:
+            self._http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75)
+            )
+        return self._http
+    
+    async def _post_chat_message(self, method, data):
+        """POST a Bot API method that writes to a chat, paced to stay under the flood limits"""
+        url = f"{self.base_url}/{method}"
+        chat_limiter = self._chat_limiters.get(data['chat_id'])
+        if chat_limiter is None:
+            chat_limiter = TokenBucket(CHAT_SEND_RATE, CHAT_SEND_BURST)
+            self._chat_limiters[data['chat_id']] = chat_limiter
+        
+        for attempt in range(2):
+            # Wait on the chat's own limit first so a burst to one chat doesn't hold global capacity
+            await chat_limiter.acquire()
+            await self._global_limiter.acquire()
+            
+            session = await self._get_http_session()
+            async with session.post(url, json=data) as response:
+                result = await response.json()
+            
+            # Flood control: Telegram says how long to back off; retry once after that
+            retry_after = result.get('parameters', {}).get('retry_after')
+            if result.get('ok') or retry_after is None or attempt:
+                return result
+            logger.warning(f"⏳ Rate limited by Telegram on {method}, retrying in {retry_after}s")
+            await asyncio.sleep(retry_after)
+    
     async def send_message(self, chat_id, text, reply_markup=None):
-        import aiohttp
+        data = {
+            'chat_id': chat_id,
+            'text': text,
+            'parse_mode': 'Markdown'
+        }
+        
+        if reply_markup:
+            # Static keyboards may already be JSON-encoded
+            data['reply_markup'] = reply_markup if isinstance(reply_markup, str) else json.dumps(reply_markup)
         
-        url = f"{self.base_url}/sendMessage"
+        return await self._post_chat_message('sendMessage', data)
+    
+    async def edit_message(self, chat_id, message_id, text, reply_markup=None):
         data = {
             'chat_id': chat_id,
+            'message_id': message_id,
             'text': text,
             'parse_mode': 'Markdown'
         }
         
         if reply_markup:
-            data['reply_markup'] = json.dumps(reply_markup)
+            data['reply_markup'] = reply_markup if isinstance(reply_markup, str) else json.dumps(reply_markup)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=data) as response:
-                return await response.json()
+        return await self._post_chat_message('editMessageText', data)
+    
+    async def delete_message(self, chat_id, message_id):
+        data = {
+            'chat_id': chat_id,
+            'message_id': message_id
+        }
+        return await self._post_chat_message('deleteMessage', data)
+    
+    @staticmethod
+    def get_message_id(response):
+        """Extract the message id from a sendMessage response, if it succeeded"""
+        if response and response.get('ok'):
+            return response.get('result', {}).get('message_id')
+        return None
+    
+    async def send_or_edit_message(self, chat_id, message_id, text, reply_markup=None):
+        """Edit message_id in place when given, otherwise (or if editing fails) send a new message"""
+        if message_id:
+            response = await self.edit_message(chat_id, message_id, text, reply_markup)
+            if response and response.get('ok'):
+                return response
+            logger.warning(f"Could not edit message {message_id} in chat {chat_id}: {response}")
+        return await self.send_message(chat_id, text, reply_markup)
+    
+    async def _run_with_placeholder(self, chat_id, coro, text, delay=PLACEHOLDER_DELAY):
+        """Await coro, posting text as a placeholder alongside it if it is slow
+        
+        Returns (result, placeholder message id or None).
+        """
+        task = asyncio.create_task(coro)
+        notify = None
+        try:
+            done, _ = await asyncio.wait({task}, timeout=delay)
+            
+            # The placeholder is sent concurrently so the work never waits on Telegram
+            notify = None if done else asyncio.create_task(self.send_message(chat_id, text))
+            result = await task
+        except asyncio.CancelledError:
+            task.cancel()
+            if notify is not None:
+                notify.cancel()
+            raise
+        except Exception:
+            # The caller reports the error, so don't leave the placeholder behind
+            if notify is not None:
+                await self._discard_placeholder(chat_id, notify)
+            raise
+        
+        message_id = None
+        if notify is not None:
+            try:
+                message_id = self.get_message_id(await notify)
+            except Exception as e:
+                logger.warning(f"Could not send placeholder message to chat {chat_id}: {e}")
+        return result, message_id
+    
+    async def _discard_placeholder(self, chat_id, notify):
+        """Wait for a placeholder send to finish and delete the message it posted"""
+        try:
+            message_id = self.get_message_id(await notify)
+            if message_id:
+                await self.delete_message(chat_id, message_id)
+        except Exception as e:
+            logger.warning(f"Could not remove placeholder message in chat {chat_id}: {e}")
+    
+    async def _run_blocking(self, fn, *args, **kwargs):
+        """Run a synchronous call in the bot's I/O pool so other chats keep being served"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_pool, functools.partial(fn, *args, **kwargs))
+    
+    def _start_background_task(self, coro):
+        """Run coro in the background, keeping a reference so it isn't garbage collected"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    async def _confirm_trade(self, chat_id, message_id, chain, tx_hash, action, details, keyboard, balance_key=None):
+        """Poll for the trade's receipt and edit the submitted message with the final outcome"""
+        deadline = time.monotonic() + TX_CONFIRM_TIMEOUT
+        status = None
+        while time.monotonic() < deadline:
+            await asyncio.sleep(TX_CONFIRM_POLL_INTERVAL)
+            status = await self._run_blocking(self.trading.get_transaction_status, chain, tx_hash)
+            if status.get('success') or not status.get('pending'):
+                break
+        
+        # A balance read while the trade was pending may have cached the pre-trade amount
+        if balance_key is not None and status and status.get('success'):
+            self._token_balance_cache.pop(balance_key)
+        
+        if status and status.get('success') and status['status'] == 'success':
+            text = f"✅ **{action} Transaction Successful!**\n\n{details}\n\n🧱 **Confirmed in block** {status['block_number']}"
+        elif status and status.get('success'):
+            text = f"❌ **{action} Transaction Reverted!**\n\n{details}\n\n💡 **The transaction was mined but failed on-chain.**"
+        else:
+            text = f"⌛ **{action} Transaction Pending**\n\n{details}\n\n💡 **Not confirmed yet, check the explorer link above.**"
+        
+        try:
+            await self.send_or_edit_message(chat_id, message_id, text, keyboard)
+        except Exception as e:
+            logger.error(f"Error updating trade confirmation for {tx_hash}: {e}")
+    
+    def _reset_trading_state(self, chat_id, **fields):
+        """Start a new flow for the chat, reusing its existing state dict when there is one"""
+        state = self.trading_state.get(chat_id)
+        if state is None:
+            self.trading_state[chat_id] = fields
+            return fields
+        state.clear()
+        state.update(fields)
+        self.trading_state.move_to_end(chat_id)
+        return state
+    
+    # ==================== WALLET LOOKUPS ====================
+    # The Firestore SDK is synchronous, so these run in a worker thread to keep
+    # the event loop free for other users.
+    
+    async def _get_user_wallet(self, user_id):
+        """Get the user's public wallet data, served from memory after the first read"""
+        wallet = self._wallet_cache.get(user_id)
+        if wallet is None:
+            wallet = await self._run_blocking(self.firebase.get_user_wallet, user_id)
+            if wallet:
+                self._wallet_cache[user_id] = wallet
+        return wallet
+    
+    async def _get_private_key(self, user_id):
+        """Fetch and decrypt the user's private key in a worker thread, reusing it briefly between trades"""
+        private_key = self._private_key_cache.get(user_id)
+        if private_key is None:
+            private_key = await self._run_blocking(self.firebase.get_private_key, user_id)
+            if private_key:
+                self._private_key_cache[user_id] = private_key
+        return private_key
+    
+    async def _get_wallet_balances(self, user_id, chain, token_address):
+        """Token and native (BNB/ETH) balances of the user's wallet, 0 when unavailable"""
+        wallet_balance = 0
+        native_balance = 0
+        try:
+            wallet = await self._get_user_wallet(user_id)
+            # Both balances come back from a single RPC round-trip
+            wallet_balance, native_balance_data = await self._run_blocking(
+                self.blockchain.batch_get_balances, chain, token_address, wallet['public_key']
+            )
+            if native_balance_data is not None:
+                native_balance = native_balance_data
+        except Exception as e:
+            logger.error(f"Error getting wallet balance: {e}")
+        return wallet_balance, native_balance
+    
+    def _invalidate_wallet_cache(self, user_id):
+        """Forget cached wallet data after it was created, imported or deleted"""
+        self._wallet_cache.pop(user_id, None)
+        self._private_key_cache.pop(user_id, None)
+    
+    # ==================== SCAN CACHE ====================
+    
+    async def _cached_scanner_call(self, kind, token_address, chain, fetch, ttl=SCAN_CACHE_TTL):
+        """Serve a scanner response from memory if it is younger than ttl seconds"""
+        key = (kind, chain.upper(), token_address.lower())
+        now = time.monotonic()
+        cached = self._scan_cache.get(key)
+        if cached and now - cached[0] < min(ttl, cached[1]):
+            self._scan_cache.move_to_end(key)
+            return cached[2]
+        
+        # Concurrent lookups of the same token share one request; shield it so a
+        # cancelled caller doesn't cancel it for the others
+        task = self._scan_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch(token_address, chain))
+            self._scan_inflight[key] = task
+            task.add_done_callback(lambda _: self._scan_inflight.pop(key, None))
+            # Mark the exception as retrieved even if every caller went away
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        result = await asyncio.shield(task)
+        
+        # Only remember successful lookups so failures are retried straight away
+        if result and 'error' not in result:
+            # Keep the entry as long as its longest-lived reader wants it (e.g. security data)
+            lifetime = max(ttl, cached[1]) if cached else ttl
+            self._scan_cache[key] = (time.monotonic(), lifetime, result)
+            self._scan_cache.move_to_end(key)
+            while len(self._scan_cache) > SCAN_CACHE_MAX_ENTRIES:
+                self._scan_cache.popitem(last=False)
+        return result
+    
+    async def _cached_scan(self, token_address, chain, ttl=SCAN_CACHE_TTL):
+        """Cached wrapper around token_scanner.scan_token"""
+        return await self._cached_scanner_call('scan', token_address, chain, self.token_scanner.scan_token, ttl)
+    
+    async def _cached_security_info(self, token_address, chain, ttl=SCAN_CACHE_TTL):
+        """Cached wrapper around token_scanner.get_token_security_info"""
+        return await self._cached_scanner_call('security', token_address, chain, self.token_scanner.get_token_security_info, ttl)
+    
+    async def _get_trade_scan(self, token_address, chain):
+        """Scan result for trade screens, refetching only market data once security data is cached"""
+        if chain.upper() not in self.token_scanner.supported_chains:
+            # Let the scanner produce its usual unsupported-chain error
+            return await self.token_scanner.scan_token(token_address, chain)
+        
+        market_data, security_data = await asyncio.gather(
+            self._cached_scanner_call('market', token_address, chain, self.token_scanner.get_market_data),
+            self._cached_security_info(token_address, chain, ttl=SCAN_META_TTL),
+            return_exceptions=True
+        )
+        return self.token_scanner.combine_scan_data(market_data, security_data)
+    
+    async def _get_trade_token_symbol(self, chat_id, token_address, chain):
+        """Token symbol for trade result buttons, preferring the one stored with the chat's trading state"""
+        state = self.trading_state.get(chat_id, {})
+        token_symbol = state.get('token_symbol')
+        if (token_symbol and token_symbol not in ('TOKEN', 'Unknown')
+                and (state.get('token_address') or '').lower() == token_address.lower()):
+            return token_symbol
+        
+        try:
+            scan_result = await self._get_trade_scan(token_address, chain)
+            if scan_result and "error" not in scan_result:
+                return scan_result.get('token_symbol', 'TOKEN')
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError) as e:
+            logger.debug(f"⚠️ Token scan for symbol failed for {token_address}: {e}")
+        return 'TOKEN'  # Default fallback
+    
+    async def _get_overview_security_info(self, chat_id, token_address, chain):
+        """Security info for an overview, reusing the chat's last scan when it covers this token"""
+        scan_data = self.last_scan_results.get(chat_id)
+        if (scan_data and scan_data['chain'] == chain
+                and scan_data['token_address'].lower() == token_address.lower()):
+            result = scan_data['result']
+            # scan_token merges the GoPlus fields in, or a placeholder when they were unavailable
+            if 'security_warning' not in result and 'buy_tax' in result:
+                return result
+        return await self._cached_security_info(token_address, chain)
+    
+    async def _get_overview(self, chat_id, chain, token_address, amount, side):
+        """Fetch the trade estimate and security info for an overview concurrently"""
+        if side == 'buy':
+            estimate_fn = self.trading.get_token_price_estimate
+        else:
+            estimate_fn = self.trading.get_token_sell_estimate
+        
+        estimate, security_info = await asyncio.gather(
+            self._run_blocking(estimate_fn, chain, token_address, amount),
+            self._get_overview_security_info(chat_id, token_address, chain),
+            return_exceptions=True
+        )
+        if isinstance(estimate, Exception):
+            logger.error(f"Error getting {side} estimate: {estimate}")
+            estimate = None
+        if isinstance(security_info, Exception):
+            logger.error(f"Error getting security info: {security_info}")
+            security_info = None
+        return estimate, security_info
+    
+    async def _get_cached_token_info(self, chain, token_contract):
+        """Memoized transfer_manager._get_token_info for a contract"""
+        key = (chain, token_contract.lower())
+        token_info = self._token_info_cache.get(key)
+        if token_info:
+            self._token_info_cache.move_to_end(key)
+            return token_info
+        
+        token_info = await self.transfer_manager._get_token_info(
+            self.transfer_manager.web3_instances[chain],
+            token_contract
+        )
+        
+        # Don't pin placeholder name/symbol or the default 18 decimals left by a failed RPC call
+        if token_info and token_info.get('resolved'):
+            self._token_info_cache[key] = token_info
+        return token_info
     
     def create_inline_keyboard(self, buttons):
         keyboard = []
@@ -140,7 +1165,7 @@ class SimpleTelegramBot:
     
     def get_user_slippage(self, user_id):
         """Get user slippage preference with default fallback"""
-        return self.user_slippage.get(user_id, TRADING_CONFIG.get('BSC', {}).get('slippage', 0.5))
+        return self.user_slippage.get(user_id, DEFAULT_SLIPPAGE)
     
     def set_user_slippage(self, user_id, slippage):
         """Set user slippage preference"""
@@ -168,7 +1193,7 @@ class SimpleTelegramBot:
     
     def _create_amount_selection_keyboard(self, native_symbol, action, user_id):
         """Create keyboard with quick amount buttons for buy/sell actions"""
-        current_slippage = self.get_user_slippage(user_id) if user_id else TRADING_CONFIG.get('BSC', {}).get('slippage', 0.5)
+        current_slippage = self.get_user_slippage(user_id) if user_id else DEFAULT_SLIPPAGE
         
         if action == 'buy':
             # Buy buttons - fixed amounts
@@ -215,9 +1240,7 @@ class SimpleTelegramBot:
     
     def _create_back_button_keyboard(self):
         """Create simple keyboard with back button"""
-        return self.create_inline_keyboard([
-            [{'text': '🔙 Back to Trading', 'callback_data': 'buy_sell'}]
-        ])
+        return _BACK_TO_TRADING_KEYBOARD_JSON
     
     def get_buy_sell_menu(self):
         buttons = [
@@ -263,18 +1286,17 @@ class SimpleTelegramBot:
             # If username is still 'User' and not in cache, try to get it from Telegram API
             if username == 'User':
                 try:
-                    import aiohttp
                     url = f"{self.base_url}/getChat"
                     data = {'chat_id': user_id}
                     
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(url, json=data) as response:
-                            result = await response.json()
-                            if result.get('ok'):
-                                user_info = result.get('result', {})
-                                username = user_info.get('first_name', 'User')
-                                # Cache it for future use
-                                self.user_cache[user_id] = username
+                    session = await self._get_http_session()
+                    async with session.post(url, json=data) as response:
+                        result = await response.json()
+                        if result.get('ok'):
+                            user_info = result.get('result', {})
+                            username = user_info.get('first_name', 'User')
+                            # Cache it for future use
+                            self.user_cache[user_id] = username
                 except Exception as e:
                     logger.error(f"Error getting user info for {user_id}: {e}")
                     username = 'User'
@@ -338,22 +1360,15 @@ class SimpleTelegramBot:
             await self.handle_scan_chain(chat_id, 'BSC')
         elif callback_data == 'scan_eth':
             await self.handle_scan_chain(chat_id, 'ETH')
-        elif callback_data.startswith('copy_address_'):
+        elif callback_data.startswith(COPY_ADDRESS_PREFIX):
             await self.handle_copy_address(chat_id, callback_data)
-        elif callback_data.startswith('refresh_scan_'):
+        elif callback_data.startswith(REFRESH_SCAN_PREFIX):
             await self.handle_refresh_scan(chat_id, callback_data)
         elif callback_data.startswith('positions_chain_'):
             chain = callback_data.replace('positions_chain_', '').upper()
             await self.handle_positions_chain_selection(chat_id, user_id, chain)
         elif callback_data.startswith('transfer_chain_'):
             chain = callback_data.replace('transfer_chain_', '').upper()
-            # Map chain names to expected format
-            chain_mapping = {
-                'ETH': 'ETH',
-                'BSC': 'BSC',
-                'SEPOLIA': 'SEPOLIA'
-            }
-            chain = chain_mapping.get(chain, chain)
             await self.handle_transfer_chain_selection(chat_id, user_id, chain)
         elif callback_data == 'positions_check_contract':
             await self.handle_positions_check_contract(chat_id, user_id)
@@ -362,23 +1377,9 @@ class SimpleTelegramBot:
             await self.handle_contract_balance_check(chat_id, user_id, self.trading_state.get(chat_id, {}).get('contract_address'), chain)
         elif callback_data.startswith('transfer_native_'):
             chain = callback_data.replace('transfer_native_', '').upper()
-            # Map chain names to expected format
-            chain_mapping = {
-                'ETH': 'ETH',
-                'BSC': 'BSC',
-                'SEPOLIA': 'SEPOLIA'
-            }
-            chain = chain_mapping.get(chain, chain)
             await self.handle_transfer_native(chat_id, user_id, chain)
         elif callback_data.startswith('transfer_token_'):
             chain = callback_data.replace('transfer_token_', '').upper()
-            # Map chain names to expected format
-            chain_mapping = {
-                'ETH': 'ETH',
-                'BSC': 'BSC',
-                'SEPOLIA': 'SEPOLIA'
-            }
-            chain = chain_mapping.get(chain, chain)
             await self.handle_transfer_token(chat_id, user_id, chain)
         elif callback_data == 'confirm_transfer_native':
             await self.execute_transfer(chat_id, user_id, 'native')
@@ -428,7 +1429,7 @@ class SimpleTelegramBot:
     
     async def handle_buy_tokens(self, chat_id, user_id):
         
-        if not self.firebase.user_has_wallet(user_id):
+        if not await self._get_user_wallet(user_id):
             text = "❌ You need a wallet first! Please create one."
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔐 Create Wallet', 'callback_data': 'wallet'},
@@ -452,7 +1453,7 @@ class SimpleTelegramBot:
     
     async def handle_sell_tokens(self, chat_id, user_id):
         
-        if not self.firebase.user_has_wallet(user_id):
+        if not await self._get_user_wallet(user_id):
             text = "❌ You need a wallet first! Please create one."
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔐 Create Wallet', 'callback_data': 'wallet'}
@@ -476,26 +1477,6 @@ class SimpleTelegramBot:
     
     def get_buy_sell_for_chain_menu(self, chain):
         """Get buy/sell menu for a specific chain"""
-        chain_info = {
-            'ETH': {
-                'name': 'Ethereum Mainnet',
-                'symbol': 'ETH',
-                'icon': '🔵'
-            },
-            'BSC': {
-                'name': 'BSC Mainnet',
-                'symbol': 'BNB',
-                'icon': '🟡'
-            },
-            'SEPOLIA': {
-                'name': 'Sepolia Testnet',
-                'symbol': 'ETH',
-                'icon': '🟣'
-            }
-        }
-        
-        chain_data = chain_info[chain]
-        
         buttons = [
             [
                 {'text': '🟢 Buy Tokens', 'callback_data': f'buy_{chain.lower().replace("-", "_")}'},
@@ -510,11 +1491,11 @@ class SimpleTelegramBot:
     async def handle_chain_selection(self, chat_id, user_id, chain):
         """Handle chain selection and show buy/sell options"""
         # Store the selected chain in trading state
-        self.trading_state[chat_id] = {'chain': chain}
+        self._reset_trading_state(chat_id, chain=chain)
         
         # Check if there's a scanned token available for this chain
-        if chat_id in self.last_scan_results:
-            scan_data = self.last_scan_results[chat_id]
+        scan_data = self.last_scan_results.get(chat_id)
+        if scan_data is not None:
             if scan_data['chain'] == chain:
                 # Store the scanned token information in trading state
                 self.trading_state[chat_id]['token_address'] = scan_data['token_address']
@@ -523,28 +1504,7 @@ class SimpleTelegramBot:
         
         logger.info(f"Chain selected for chat {chat_id}: {chain}, trading state: {self.trading_state[chat_id]}")
         
-        chain_info = {
-            'ETH': {
-                'name': 'Ethereum Mainnet',
-                'symbol': 'ETH',
-                'icon': '🔵',
-                'rpc': 'https://mainnet.infura.io/v3/YOUR_INFURA_KEY'
-            },
-            'BSC': {
-                'name': 'BSC Mainnet',
-                'symbol': 'BNB',
-                'icon': '🟡',
-                'rpc': 'https://bsc-dataseed.binance.org/'
-            },
-            'SEPOLIA': {
-                'name': 'Sepolia Testnet',
-                'symbol': 'ETH',
-                'icon': '🟣',
-                'rpc': 'https://sepolia.infura.io/v3/YOUR_INFURA_KEY'
-            }
-        }
-        
-        chain_data = chain_info[chain]
+        chain_data = _CHAIN_INFO[chain]
         
         text = f"{chain_data['icon']} Selected Network: {chain_data['name']}\n\n"
         text += f"📋 Step 2: Select your trading action\n\n"
@@ -557,7 +1517,7 @@ class SimpleTelegramBot:
     
     async def handle_buy_tokens_with_chain(self, chat_id, user_id, chain):
         """Handle buy tokens with a pre-selected chain"""
-        if not self.firebase.user_has_wallet(user_id):
+        if not await self._get_user_wallet(user_id):
             text = "❌ You need a wallet first! Please create one."
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔐 Create Wallet', 'callback_data': 'wallet'}
@@ -569,7 +1529,7 @@ class SimpleTelegramBot:
             return
         
         # Set trading state with action and chain
-        self.trading_state[chat_id] = {'action': 'buy', 'chain': chain}
+        self._reset_trading_state(chat_id, action='buy', chain=chain)
         
         # Check if coming from scanner with pre-selected token
         if chat_id in self.trading_state and self.trading_state[chat_id].get('from_scanner'):
@@ -582,25 +1542,7 @@ class SimpleTelegramBot:
         
         logger.info(f"Buy action set for chat {chat_id}: action=buy, chain={chain}, trading state: {self.trading_state[chat_id]}")
         
-        chain_info = {
-            'ETH': {
-                'name': 'Ethereum Mainnet',
-                'symbol': 'ETH',
-                'icon': '🔵'
-            },
-            'BSC': {
-                'name': 'BSC Mainnet',
-                'symbol': 'BNB',
-                'icon': '🟡'
-            },
-            'SEPOLIA': {
-                'name': 'Sepolia Testnet',
-                'symbol': 'ETH',
-                'icon': '🟣'
-            }
-        }
-        
-        chain_data = chain_info[chain]
+        chain_data = _CHAIN_INFO[chain]
         
         text = f"{chain_data['icon']} Buy Tokens on {chain_data['name']}\n\n"
         text += f"📋 Step 3: Enter the token contract address\n\n"
@@ -620,7 +1562,7 @@ class SimpleTelegramBot:
     
     async def handle_sell_tokens_with_chain(self, chat_id, user_id, chain):
         """Handle sell tokens with a pre-selected chain"""
-        if not self.firebase.user_has_wallet(user_id):
+        if not await self._get_user_wallet(user_id):
             text = "❌ You need a wallet first! Please create one."
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔐 Create Wallet', 'callback_data': 'wallet'}
@@ -632,7 +1574,7 @@ class SimpleTelegramBot:
             return
         
         # Set trading state with action and chain
-        self.trading_state[chat_id] = {'action': 'sell', 'chain': chain}
+        self._reset_trading_state(chat_id, action='sell', chain=chain)
         
         # Check if coming from scanner with pre-selected token
         if chat_id in self.trading_state and self.trading_state[chat_id].get('from_scanner'):
@@ -645,25 +1587,7 @@ class SimpleTelegramBot:
         
         logger.info(f"Sell action set for chat {chat_id}: action=sell, chain={chain}, trading state: {self.trading_state[chat_id]}")
         
-        chain_info = {
-            'ETH': {
-                'name': 'Ethereum Mainnet',
-                'symbol': 'ETH',
-                'icon': '🔵'
-            },
-            'BSC': {
-                'name': 'BSC Mainnet',
-                'symbol': 'BNB',
-                'icon': '🟡'
-            },
-            'SEPOLIA': {
-                'name': 'Sepolia Testnet',
-                'symbol': 'ETH',
-                'icon': '🟣'
-            }
-        }
-        
-        chain_data = chain_info[chain]
+        chain_data = _CHAIN_INFO[chain]
         
         text = f"{chain_data['icon']} Sell Tokens on {chain_data['name']}\n\n"
         text += f"📋 Step 3: Enter the token contract address\n\n"
@@ -687,104 +1611,63 @@ class SimpleTelegramBot:
             # Update trading state
             self.trading_state[chat_id]['token_address'] = token_address
             
-            # Get detailed token information using scanner
-            scan_result = await self.token_scanner.scan_token(token_address, chain)
+            # Get detailed token information using scanner, with the wallet balances alongside
+            scan_result, (wallet_balance, native_balance) = await asyncio.gather(
+                self._get_trade_scan(token_address, chain),
+                self._get_wallet_balances(user_id, chain, token_address)
+            )
             
             if scan_result and "error" not in scan_result:
                 # Format token information
                 token_name = scan_result.get('token_name', 'Unknown')
                 token_symbol = scan_result.get('token_symbol', 'Unknown')
                 price_usd = scan_result.get('price_usd', 0) or 0
-                price_change_24h = scan_result.get('price_change_24h', 0) or 0
                 liquidity_usd = scan_result.get('liquidity_usd', 0) or 0
-                volume_24h = scan_result.get('volume_24h', 0) or 0
                 fdv = scan_result.get('fdv', 0) or 0
-                transactions_24h = scan_result.get('transactions_24h', {'buys': 0, 'sells': 0})
                 
                 # Get tax information
                 buy_tax = scan_result.get('buy_tax', 0)
                 sell_tax = scan_result.get('sell_tax', 0)
                 transfer_tax = scan_result.get('transfer_tax', 0)
                 
-                # Format price change
-                if price_change_24h is not None:
-                    if abs(price_change_24h) > 1:
-                        if price_change_24h > 0:
-                            price_change_str = f"📈 +{price_change_24h:.2f}%"
-                        else:
-                            price_change_str = f"📉 {price_change_24h:.2f}%"
-                    else:
-                        if price_change_24h > 0:
-                            price_change_str = f"📈 +{price_change_24h:.2%}"
-                        else:
-                            price_change_str = f"📉 {price_change_24h:.2%}"
-                else:
-                    price_change_str = "➡️ 0.00%"
-                
-                # Format prices
-                if price_usd and price_usd < 0.000001:
-                    price_usd_str = f"${price_usd:.12f}"
-                elif price_usd and price_usd < 0.01:
-                    price_usd_str = f"${price_usd:.8f}"
-                elif price_usd and price_usd < 1:
-                    price_usd_str = f"${price_usd:.6f}"
-                elif price_usd:
-                    price_usd_str = f"${price_usd:.4f}"
-                else:
-                    price_usd_str = "$0.0000"
-                
-                # Get wallet balance
-                wallet = self.firebase.get_user_wallet(user_id)
-                wallet_balance = 0
-                native_balance = 0
-                
-                try:
-                    wallet_address = wallet['public_key']
-                    
-                    # Get token balance
-                    wallet_balance = self.trading._get_token_balance(chain, token_address, wallet_address)
-                    
-                    # Get native balance (BNB/ETH)
-                    native_balance_data = self.blockchain.get_balance(chain, wallet_address)
-                    if native_balance_data is not None:
-                        native_balance = native_balance_data
-                except Exception as e:
-                    logger.error(f"Error getting wallet balance: {e}")
+                # Format price
+                price_usd_str = _format_price_usd(price_usd)
                 
                 # Build detailed token information
-                text = f"🪙 {token_name} (${token_symbol})\n"
-                text += f"{token_address}\n"
-                text += f"V2 Pool 🔗 {chain}\n\n"
-                
-                text += f"⛽ {chain} | 0.1 GWEI  Ξ $0.0₆1\n\n"
-                
-                text += f"🧢 MC ${fdv:,.0f} | 💵 Price {price_usd_str}\n"
-                text += f"⚖️ Taxes | 🅑 {buy_tax:.1f}% 🅢 {sell_tax:.1f}% 🅣 {transfer_tax:.1f}%\n"
                 liquidity_percentage = (liquidity_usd/fdv*100) if fdv and fdv > 0 else 0
-                text += f"💧 Liquidity | ${liquidity_usd:,.0f} ({liquidity_percentage:.2f}%)\n"
-                text += f"🕓 Refresh | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                
-                text += f"💰 Balance\n"
-                text += f" {token_symbol}   | {chain}\n"
-                text += f" {wallet_balance:.6f} | {native_balance:.6f}\n\n"
+                parts = [
+                    f"🪙 {token_name} (${token_symbol})\n",
+                    f"{token_address}\n",
+                    f"V2 Pool 🔗 {chain}\n\n",
+                    f"⛽ {chain} | 0.1 GWEI  Ξ $0.0₆1\n\n",
+                    f"🧢 MC ${fdv:,.0f} | 💵 Price {price_usd_str}\n",
+                    f"⚖️ Taxes | 🅑 {buy_tax:.1f}% 🅢 {sell_tax:.1f}% 🅣 {transfer_tax:.1f}%\n",
+                    f"💧 Liquidity | ${liquidity_usd:,.0f} ({liquidity_percentage:.2f}%)\n",
+                    f"🕓 Refresh | {_now_str()}\n\n",
+                    f"💰 Balance\n",
+                    f" {token_symbol}   | {chain}\n",
+                    f" {wallet_balance:.6f} | {native_balance:.6f}\n\n"
+                ]
                 
                 if fdv and fdv > 0 and liquidity_usd/fdv < 0.01:
-                    text += f"🚨 Liquidity / Total Supply < 1%\n\n"
+                    parts.append(f"🚨 Liquidity / Total Supply < 1%\n\n")
                 
                 if action == 'buy':
-                    text += f"Enter Amount ({chain}):"
+                    parts.append(f"Enter Amount ({chain}):")
                     keyboard = self.get_amount_selection_keyboard(chain, action, user_id)
                 else:  # sell
-                    text += f"Enter Amount ({token_symbol}):"
+                    parts.append(f"Enter Amount ({token_symbol}):")
                     keyboard = self.get_amount_selection_keyboard(chain, action, user_id)
                     
-                await self.send_message(chat_id, text, keyboard)
+                await self.send_message(chat_id, "".join(parts), keyboard)
                 
             else:
                 # Fallback to simple format if scanning fails
-                text = f"✅ Token Address Valid!\n\n"
-                text += f"🔑 Token: `{token_address[:20]}...`\n"
-                text += f"🌐 Network: {chain}\n\n"
+                text = (
+                    f"✅ Token Address Valid!\n\n"
+                    f"🔑 Token: `{_short_addr(token_address, 20, 0)}`\n"
+                    f"🌐 Network: {chain}\n\n"
+                )
                 
                 if action == 'buy':
                     text += f"💰 Enter the amount of {chain} to spend\n\n"
@@ -805,18 +1688,8 @@ class SimpleTelegramBot:
     
     async def handle_wallet_menu(self, chat_id, user_id):
         
-        if self.firebase.user_has_wallet(user_id):
-            wallet = self.firebase.get_user_wallet(user_id)
-            
-            # Add null check for wallet
-            if wallet is None:
-                text = "❌ Error retrieving wallet information. Please try again or contact support."
-                keyboard = self.create_inline_keyboard([[
-                    {'text': '🔙 Back to Main', 'callback_data': 'main_menu'}
-                ]])
-                await self.send_message(chat_id, text, keyboard)
-                return
-            
+        wallet = await self._get_user_wallet(user_id)
+        if wallet:
             text = f"🔐 Wallet Management\n\n"
             text += f"✅ You have a wallet!\n\n"
             text += f"🔑 Public Address: `{wallet['public_key']}`\n"
@@ -851,7 +1724,8 @@ class SimpleTelegramBot:
     
     async def handle_check_balance(self, chat_id, user_id):
         
-        if not self.firebase.user_has_wallet(user_id):
+        wallet = await self._get_user_wallet(user_id)
+        if not wallet:
             text = "❌ You don't have a wallet yet. Please create one first!"
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔐 Create Wallet', 'callback_data': 'create_wallet'}
@@ -861,17 +1735,6 @@ class SimpleTelegramBot:
             await self.send_message(chat_id, text, keyboard)
             return
         
-        wallet = self.firebase.get_user_wallet(user_id)
-        
-        # Add null check for wallet
-        if wallet is None:
-            text = "❌ Error retrieving wallet information. Please try again or contact support."
-            keyboard = self.create_inline_keyboard([[
-                {'text': '🔙 Back to Main', 'callback_data': 'main_menu'}
-            ]])
-            await self.send_message(chat_id, text, keyboard)
-            return
-        
         text = f"💳 Wallet Balance\n\n"
         text += f"🔑 Address: `{wallet['public_key'][:20]}...`\n\n"
         
@@ -881,8 +1744,7 @@ class SimpleTelegramBot:
             try:
                 balance = self.blockchain.get_balance(chain, wallet['public_key'])
                 if balance is not None:
-                    symbol = 'BNB' if chain == 'BSC' else 'ETH'
-                    text += f"{chain}: {balance:.6f} {symbol}\n"
+                    text += f"{chain}: {balance:.6f} {_NATIVE_SYMBOL[chain]}\n"
                 else:
                     text += f"{chain}: Connection failed\n"
             except Exception as e:
@@ -934,13 +1796,9 @@ class SimpleTelegramBot:
         """Handle chain selection for positions"""
         try:
             # Check if user has a wallet
-            if not self.firebase.user_has_wallet(user_id):
-                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
-                return
-            
-            wallet = self.firebase.get_user_wallet(user_id)
+            wallet = await self._get_user_wallet(user_id)
             if not wallet:
-                await self.send_message(chat_id, "❌ Could not retrieve wallet information.")
+                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
                 return
             
             # Show loading message
@@ -985,9 +1843,7 @@ class SimpleTelegramBot:
         text += "🔧 Just type the contract address below:"
         
         # Store state for contract checking
-        if chat_id not in self.trading_state:
-            self.trading_state[chat_id] = {}
-        self.trading_state[chat_id]['action'] = 'check_contract'
+        self.trading_state.setdefault(chat_id, {})['action'] = 'check_contract'
         
         keyboard = self.create_inline_keyboard([
             [
@@ -1001,13 +1857,9 @@ class SimpleTelegramBot:
         """Handle checking balance of a specific contract"""
         try:
             # Check if user has a wallet
-            if not self.firebase.user_has_wallet(user_id):
-                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
-                return
-            
-            wallet = self.firebase.get_user_wallet(user_id)
+            wallet = await self._get_user_wallet(user_id)
             if not wallet:
-                await self.send_message(chat_id, "❌ Could not retrieve wallet information.")
+                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
                 return
             
             if not contract_address:
@@ -1045,8 +1897,7 @@ class SimpleTelegramBot:
             await self.send_message(chat_id, formatted_message, keyboard)
             
             # Clear the trading state
-            if chat_id in self.trading_state:
-                del self.trading_state[chat_id]
+            self.trading_state.pop(chat_id, None)
             
         except Exception as e:
             logger.error(f"Error checking contract balance: {e}")
@@ -1068,13 +1919,9 @@ class SimpleTelegramBot:
         """Handle chain selection for transfer"""
         try:
             # Check if user has a wallet
-            if not self.firebase.user_has_wallet(user_id):
-                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
-                return
-            
-            wallet = self.firebase.get_user_wallet(user_id)
+            wallet = await self._get_user_wallet(user_id)
             if not wallet:
-                await self.send_message(chat_id, "❌ Could not retrieve wallet information.")
+                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
                 return
             
             # Show transfer type selection
@@ -1094,20 +1941,13 @@ class SimpleTelegramBot:
         """Handle native token transfer"""
         try:
             # Check if user has a wallet
-            if not self.firebase.user_has_wallet(user_id):
-                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
-                return
-            
-            wallet = self.firebase.get_user_wallet(user_id)
+            wallet = await self._get_user_wallet(user_id)
             if not wallet:
-                await self.send_message(chat_id, "❌ Could not retrieve wallet information.")
+                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
                 return
             
             # Store transfer state
-            if chat_id not in self.trading_state:
-                self.trading_state[chat_id] = {}
-            
-            self.trading_state[chat_id].update({
+            self.trading_state.setdefault(chat_id, {}).update({
                 'action': 'transfer_native',
                 'chain': chain,
                 'transfer_type': 'native'
@@ -1139,20 +1979,13 @@ class SimpleTelegramBot:
         """Handle ERC-20 token transfer"""
         try:
             # Check if user has a wallet
-            if not self.firebase.user_has_wallet(user_id):
-                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
-                return
-            
-            wallet = self.firebase.get_user_wallet(user_id)
+            wallet = await self._get_user_wallet(user_id)
             if not wallet:
-                await self.send_message(chat_id, "❌ Could not retrieve wallet information.")
+                await self.send_message(chat_id, "❌ You don't have a wallet. Please create one first.")
                 return
             
             # Store transfer state
-            if chat_id not in self.trading_state:
-                self.trading_state[chat_id] = {}
-            
-            self.trading_state[chat_id].update({
+            self.trading_state.setdefault(chat_id, {}).update({
                 'action': 'transfer_token',
                 'chain': chain,
                 'transfer_type': 'token'
@@ -1204,7 +2037,7 @@ class SimpleTelegramBot:
         text += "💡 Example: `0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5`"
         
         # Store the selected chain for this chat
-        self.trading_state[chat_id] = {'action': 'scan_token', 'chain': chain}
+        self._reset_trading_state(chat_id, action='scan_token', chain=chain)
         
         keyboard = self.create_inline_keyboard([[
             {'text': '🔙 Back to Scanner', 'callback_data': 'scanner'}
@@ -1242,9 +2075,7 @@ class SimpleTelegramBot:
         text += "🔧 Just type the number below:"
         
         # Store state for slippage input
-        if chat_id not in self.trading_state:
-            self.trading_state[chat_id] = {}
-        self.trading_state[chat_id]['action'] = 'set_slippage'
+        self.trading_state.setdefault(chat_id, {})['action'] = 'set_slippage'
         
         keyboard = self.create_inline_keyboard([
             [
@@ -1338,7 +2169,10 @@ class SimpleTelegramBot:
         """Handle removing Twitter authentication"""
         try:
             # Remove Twitter auth data from Firebase
-            success = self.firebase.remove_twitter_auth(user_id)
+            twitter_info = await self._run_blocking(self.firebase.get_twitter_user_info, user_id)
+            success = await self._run_blocking(self.firebase.remove_twitter_auth, user_id)
+            if twitter_info and twitter_info.get('twitterId'):
+                self._x_user_cache.pop(str(twitter_info['twitterId']), None)
             
             if success:
                 text = "🗑️ **Twitter Authentication Removed**\n\n"
@@ -1424,6 +2258,8 @@ class SimpleTelegramBot:
                 
                 # Save to Firebase
                 success = self.firebase.save_twitter_auth(user_id, auth_data)
+                # The X account may have been linked to another Telegram user before
+                self._x_user_cache.pop(twitter_id, None)
                 
                 if success:
                     text = f"✅ **Twitter Authentication Successfully!**\n\n"
@@ -1463,8 +2299,8 @@ class SimpleTelegramBot:
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔙 Back to Twitter Auth', 'callback_data': 'twitter_auth'}
             ]])
-        await self.send_message(chat_id, text, keyboard)
-    
+            await self.send_message(chat_id, text, keyboard)
+
     async def handle_create_wallet(self, chat_id, user_id):
         """Handle wallet creation"""
         try:
@@ -1479,6 +2315,7 @@ class SimpleTelegramBot:
                 user_id, username, wallet_data['public_key'], 
                 wallet_data['private_key'], "created"
             )
+            self._invalidate_wallet_cache(user_id)
             
             if success:
                 text = f"✅ Generated new wallet:\n\n"
@@ -1538,6 +2375,7 @@ class SimpleTelegramBot:
             success = self.firebase.save_user_wallet(
                 user_id, username, public_key, private_key, "imported"
             )
+            self._invalidate_wallet_cache(user_id)
             
             if success:
                 text = f"✅ Wallet imported successfully:\n\n"
@@ -1560,12 +2398,12 @@ class SimpleTelegramBot:
     async def handle_show_private_key(self, chat_id, user_id):
         """Handle showing private key"""
         
-        if not self.firebase.user_has_wallet(user_id):
+        if not await self._get_user_wallet(user_id):
             await self.send_message(chat_id, "❌ You don't have a wallet.")
             return
         
         # Get private key
-        private_key = self.firebase.get_private_key(user_id)
+        private_key = await self._get_private_key(user_id)
         if private_key:
             text = f"🔑 **PRIVATE KEY**\n\n"
             text += f"⚠️ **SECURITY WARNING:**\n"
@@ -1586,12 +2424,13 @@ class SimpleTelegramBot:
     async def handle_delete_wallet(self, chat_id, user_id):
         """Handle wallet deletion"""
         
-        if not self.firebase.user_has_wallet(user_id):
+        if not await self._get_user_wallet(user_id):
             await self.send_message(chat_id, "❌ You don't have a wallet.")
             return
         
         # Delete wallet
         success = self.firebase.delete_user_wallet(user_id)
+        self._invalidate_wallet_cache(user_id)
         if success:
             text = "✅ **Wallet Deleted Successfully!**\n\n"
             text += f"🗑️ Your wallet has been removed from the database.\n\n"
@@ -1660,7 +2499,7 @@ class SimpleTelegramBot:
             text = f"💸 Transfer {native_symbol}\n\n"
             text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
             text += f"💰 **Token:** {native_symbol}\n"
-            text += f"📍 **To:** `{token_address[:10]}...{token_address[-10:]}`\n\n"
+            text += f"📍 **To:** `{_short_addr(token_address)}`\n\n"
             text += f"💸 **Enter the amount to transfer:**\n\n"
             text += f"💡 **Example:** 0.1, 0.5, 1.0\n\n"
             text += f"🔧 **Just type the amount below:**"
@@ -1692,7 +2531,7 @@ class SimpleTelegramBot:
                 
                 text = f"🪙 Transfer Token\n\n"
                 text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
-                text += f"🪙 **Contract:** `{token_address[:10]}...{token_address[-10:]}`\n\n"
+                text += f"🪙 **Contract:** `{_short_addr(token_address)}`\n\n"
                 text += f"📝 **Enter the recipient address:**\n\n"
                 text += f"💡 Format: 0x followed by 40 characters\n"
                 text += f"Example: 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5\n\n"
@@ -1725,8 +2564,8 @@ class SimpleTelegramBot:
                 
                 text = f"🪙 Transfer Token\n\n"
                 text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
-                text += f"🪙 **Contract:** `{token_contract[:10]}...{token_contract[-10:]}`\n"
-                text += f"📍 **To:** `{token_address[:10]}...{token_address[-10:]}`\n\n"
+                text += f"🪙 **Contract:** `{_short_addr(token_contract)}`\n"
+                text += f"📍 **To:** `{_short_addr(token_address)}`\n\n"
                 text += f"💸 **Enter the amount to transfer:**\n\n"
                 text += f"💡 **Example:** 100, 1000, 5000\n\n"
                 text += f"🔧 **Just type the amount below:**"
@@ -1750,7 +2589,7 @@ class SimpleTelegramBot:
             logger.error(f"Trading state incomplete for chat {chat_id}: {self.trading_state[chat_id]}")
             await self.send_message(chat_id, "❌ Trading state incomplete. Please restart the trading process.")
             # Clear the incomplete state
-            del self.trading_state[chat_id]
+            self.trading_state.pop(chat_id, None)
             return
         
         # Validate token address
@@ -1760,83 +2599,35 @@ class SimpleTelegramBot:
             return
         
         # Store token address and user_id
-        self.trading_state[chat_id]['token'] = token_address
+        self.trading_state[chat_id]['token_address'] = token_address
         self.trading_state[chat_id]['user_id'] = user_id
         
         action = self.trading_state[chat_id]['action']
         
         # Get chain info
-        chain_info = {
-            'ETH': {
-                'name': 'Ethereum Mainnet',
-                'symbol': 'ETH',
-                'dex': 'Uniswap V2'
-            },
-            'BSC': {
-                'name': 'BSC Mainnet',
-                'symbol': 'BNB',
-                'dex': 'PancakeSwap v2'
-            },
-            'SEPOLIA': {
-                'name': 'Sepolia Testnet',
-                'symbol': 'ETH',
-                'dex': 'Uniswap V2'
-            }
-        }
-        
-        chain_data = chain_info.get(chain, chain_info['BSC'])
+        chain_data = _CHAIN_INFO.get(chain, _CHAIN_INFO['BSC'])
+        keyboard = None
         
         # Get detailed token information using scanner
         try:
             # Scan the token to get detailed information
-            scan_result = await self.token_scanner.scan_token(token_address, chain)
+            scan_result = await self._cached_scan(token_address, chain)
             
             if scan_result and "error" not in scan_result:
                 # Format token information similar to the example you provided
                 token_name = scan_result.get('token_name', 'Unknown')
                 token_symbol = scan_result.get('token_symbol', 'Unknown')
                 price_usd = scan_result.get('price_usd', 0) or 0
-                price_change_24h = scan_result.get('price_change_24h', 0) or 0
                 liquidity_usd = scan_result.get('liquidity_usd', 0) or 0
-                volume_24h = scan_result.get('volume_24h', 0) or 0
                 fdv = scan_result.get('fdv', 0) or 0
-                transactions_24h = scan_result.get('transactions_24h', {'buys': 0, 'sells': 0})
                 
                 # Get tax information
                 buy_tax = scan_result.get('buy_tax', 0)
                 sell_tax = scan_result.get('sell_tax', 0)
                 transfer_tax = scan_result.get('transfer_tax', 0)
                 
-                # Format price change - handle both percentage and decimal formats
-                if price_change_24h is not None:
-                    # Check if the value is already a percentage (e.g., 5.5 for 5.5%)
-                    # or a decimal (e.g., 0.055 for 5.5%)
-                    if abs(price_change_24h) > 1:
-                        # Already a percentage, format directly
-                        if price_change_24h > 0:
-                            price_change_str = f"📈 +{price_change_24h:.2f}%"
-                        else:
-                            price_change_str = f"📉 {price_change_24h:.2f}%"
-                    else:
-                        # It's a decimal, convert to percentage
-                        if price_change_24h > 0:
-                            price_change_str = f"📈 +{price_change_24h:.2%}"
-                        else:
-                            price_change_str = f"📉 {price_change_24h:.2%}"
-                else:
-                    price_change_str = "➡️ 0.00%"
-                
-                # Format prices
-                if price_usd and price_usd < 0.000001:
-                    price_usd_str = f"${price_usd:.12f}"
-                elif price_usd and price_usd < 0.01:
-                    price_usd_str = f"${price_usd:.8f}"
-                elif price_usd and price_usd < 1:
-                    price_usd_str = f"${price_usd:.6f}"
-                elif price_usd:
-                    price_usd_str = f"${price_usd:.4f}"
-                else:
-                    price_usd_str = "$0.0000"
+                # Format price
+                price_usd_str = _format_price_usd(price_usd)
                 
                 # Get actual wallet balance
                 user_id = self.trading_state[chat_id].get('user_id')
@@ -1846,20 +2637,16 @@ class SimpleTelegramBot:
                 if user_id:
                     try:
                         # Get wallet address
-                        wallet_data = self.firebase.get_user_wallet(user_id)
+                        wallet_data = await self._get_user_wallet(user_id)
                         logger.info(f"Wallet data for user {user_id}: {wallet_data}")
                         
                         if wallet_data:
                             wallet_address = wallet_data['public_key']
                             logger.info(f"Getting balance for wallet: {wallet_address}")
                             
-                            # Get token balance using direct contract call
-                            wallet_balance = await self._get_token_balance_contract_call(chain, wallet_address, token_address)
-                            logger.info(f"Token balance (contract call): {wallet_balance}")
-                            
-                            # Get native balance using direct Web3 call
-                            native_balance = await self._get_native_balance_contract_call(chain, wallet_address)
-                            logger.info(f"Native balance (contract call): {native_balance}")
+                            # Get token and native balances in one contract call
+                            wallet_balance, native_balance = await self._get_contract_balances(chain, wallet_address, token_address)
+                            logger.info(f"Balances (contract call): token={wallet_balance}, native={native_balance}")
                         else:
                             logger.warning(f"No wallet data found for user {user_id}")
                             # Try to get balance using blockchain manager as fallback
@@ -1879,97 +2666,62 @@ class SimpleTelegramBot:
                     native_balance = 0
                 
                 # Build detailed token information
-                text = f"🪙 {token_name} (${token_symbol})\n"
-                text += f"{token_address}\n"
-                text += f"V2 Pool 🔗 {chain}\n\n"
-                
-                text += f"⛽ {chain} | 0.1 GWEI  Ξ $0.0₆1\n\n"
-                
-                text += f"🧢 MC ${fdv:,.0f} | 💵 Price {price_usd_str}\n"
-                text += f"⚖️ Taxes | 🅑 {buy_tax:.1f}% 🅢 {sell_tax:.1f}% 🅣 {transfer_tax:.1f}%\n"
                 liquidity_percentage = (liquidity_usd/fdv*100) if fdv and fdv > 0 else 0
-                text += f"💧 Liquidity | ${liquidity_usd:,.0f} ({liquidity_percentage:.2f}%)\n"
-                text += f"🕓 Refresh | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                
-                text += f"💰 Balance\n"
-                text += f" {token_symbol}   | {chain_data['symbol']}\n"
-                text += f" {wallet_balance:.6f} | {native_balance:.6f}\n\n"
-                
-                if fdv and fdv > 0 and liquidity_usd/fdv < 0.01:
-                    text += f"🚨 Liquidity / Total Supply < 1%\n\n"
-                
-                if action == 'buy':
-                    text += f"Enter Amount ({chain_data['symbol']}):"
-                    
-                    # Create quick amount buttons for buy action
-                    keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
-                else:  # sell
-                    text += f"Enter Amount ({token_symbol}):"
-                    keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
+                template = _TOKEN_INFO_TMPL.get(chain) or _build_token_info_template(chain, chain_data)
+                text = template % {
+                    'token_name': token_name,
+                    'token_symbol': token_symbol,
+                    'token_address': token_address,
+                    'fdv': f"{fdv:,.0f}",
+                    'price_usd': price_usd_str,
+                    'buy_tax': buy_tax,
+                    'sell_tax': sell_tax,
+                    'transfer_tax': transfer_tax,
+                    'liquidity_usd': f"{liquidity_usd:,.0f}",
+                    'liquidity_percentage': liquidity_percentage,
+                    'refreshed_at': _now_str(),
+                    'wallet_balance': wallet_balance,
+                    'native_balance': native_balance,
+                    'liquidity_warning': "🚨 Liquidity / Total Supply < 1%\n\n" if fdv and fdv > 0 and liquidity_usd/fdv < 0.01 else "",
+                    'amount_symbol': chain_data['symbol'] if action == 'buy' else token_symbol,
+                }
+                keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
                     
             else:
                 # Fallback to simple format if scanning fails
-                text = f"✅ Token Address Valid!\n\n"
-                text += f"🔑 Token: `{token_address[:20]}...`\n"
-                text += f"🌐 Network: {chain_data['name']}\n"
-                text += f"🔄 DEX: {chain_data['dex']}\n\n"
-                
-                if action == 'buy':
-                    text += f"💰 Step 2: Enter the amount of {chain_data['symbol']} to spend\n\n"
-                    text += f"💡 Example: 0.1, 0.5, 1.0\n\n"
-                    text += f"🔧 Just type the amount below:"
-                    
-                    # Create quick amount buttons for buy action (fallback)
-                    keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
-                else:  # sell
-                    text += f"💰 Step 2: Enter the amount of tokens to sell\n\n"
-                    text += f"💡 Example: 100, 1000, 5000\n\n"
-                    text += f"🔧 Just type the amount below:"
-                    keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
+                text = self._format_token_fallback_text(chain, chain_data, action, token_address)
+                keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
                     
         except Exception as e:
             logger.error(f"Error scanning token: {e}")
             # Fallback to simple format
-            text = f"✅ Token Address Valid!\n\n"
-            text += f"🔑 Token: `{token_address[:20]}...`\n"
-            text += f"🌐 Network: {chain_data['name']}\n"
-            text += f"🔄 DEX: {chain_data['dex']}\n\n"
-            
-            if action == 'buy':
-                text += f"💰 Step 2: Enter the amount of {chain_data['symbol']} to spend\n\n"
-                text += f"💡 Example: 0.1, 0.5, 1.0\n\n"
-                text += f"🔧 Just type the amount below:"
-                
-                # Create quick amount buttons for buy action (exception fallback)
-                keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
-            else:  # sell
-                text += f"💰 Step 2: Enter the amount of tokens to sell\n\n"
-                text += f"💡 Example: 100, 1000, 5000\n\n"
-                text += f"🔧 Just type the amount below:"
-                keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
+            text = self._format_token_fallback_text(chain, chain_data, action, token_address)
+            keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
         
         # Use the keyboard created above, or fallback to back button
-        if 'keyboard' not in locals():
+        if keyboard is None:
             keyboard = self._create_back_button_keyboard()
         
         await self.send_message(chat_id, text, keyboard)
     
+    def _format_token_fallback_text(self, chain, chain_data, action, token_address):
+        """Render the simple token prompt used when scanning is unavailable"""
+        templates = _TOKEN_FALLBACK_TMPL.get(chain) or _build_token_fallback_templates(chain_data)
+        template = templates['buy' if action == 'buy' else 'sell']
+        return template % {'short_address': token_address[:20]}
+    
     async def scan_token_address(self, chat_id, token_address):
         """Scan a token address using DexView API"""
+        message_id = None
         try:
             # Get the selected chain from trading state
             chain = self.trading_state[chat_id].get('chain', 'BSC')
             
-            # Show scanning message
-            scanning_text = f"🔍 **Scanning Token...**\n\n"
-            scanning_text += f"📍 **Address:** `{token_address}`\n"
-            scanning_text += f"🌐 **Chain:** {chain}\n"
-            scanning_text += f"⏳ **Status:** Fetching token data..."
-            
-            await self.send_message(chat_id, scanning_text)
-            
-            # Scan the token
-            result = await self.token_scanner.scan_token(token_address, chain)
+            # Scan the token, showing a scanning message only if it takes a while
+            scanning_text = _SCANNING_TMPL.format(token_address=token_address, chain=chain)
+            result, message_id = await self._run_with_placeholder(
+                chat_id, self._cached_scan(token_address, chain), scanning_text
+            )
             
             if result and "error" not in result:
                 # Format and display the result
@@ -1982,38 +2734,16 @@ class SimpleTelegramBot:
                     'chain': chain
                 }
                 
-                keyboard = self.create_inline_keyboard([
-                    [
-                        {'text': '💰 Buy/Sell', 'callback_data': f'select_chain_{chain.lower()}'}
-                    ],
-                   
-                    [
-                        {'text': '📋 Copy Address', 'callback_data': f'copy_address_{token_address}'},
-                        {'text': '🔄 Refresh', 'callback_data': f'refresh_scan_{token_address}'}
-                    ],
-                    [
-                        {'text': '🔍 Scan Another', 'callback_data': 'scanner'},
-                        {'text': '🔙 Back to Main', 'callback_data': 'main_menu'}
-                    ]
-                ])
+                keyboard = _build_keyboard(_SCAN_RESULT_KB_TEMPLATE, chain=chain.lower(), token_address=token_address)
                 
-                await self.send_message(chat_id, formatted_result, keyboard)
+                await self.send_or_edit_message(chat_id, message_id, formatted_result, keyboard)
                 
                 # Clear the trading state for this chat
-                if chat_id in self.trading_state:
-                    del self.trading_state[chat_id]
+                self.trading_state.pop(chat_id, None)
                     
             else:
-                error_text = f"❌ **Token Scan Failed**\n\n"
-                if result and "error" in result:
-                    error_text += f"**Error:** {result['error']}\n\n"
-                else:
-                    error_text += f"**Error:** Failed to scan token\n\n"
-                error_text += f"💡 **Possible reasons:**\n"
-                error_text += f"• Token doesn't exist on {chain} chain\n"
-                error_text += f"• Invalid contract address\n"
-                error_text += f"• API temporarily unavailable\n\n"
-                error_text += f"🔍 **Try again with a different address or chain**"
+                error = result['error'] if result and "error" in result else "Failed to scan token"
+                error_text = _SCAN_ERROR_TMPL.format(error=error, chain=chain)
                 
                 keyboard = self.create_inline_keyboard([
                     [
@@ -2022,32 +2752,31 @@ class SimpleTelegramBot:
                     ]
                 ])
                 
-                await self.send_message(chat_id, error_text, keyboard)
+                await self.send_or_edit_message(chat_id, message_id, error_text, keyboard)
                 
                 # Clear the trading state for this chat
-                if chat_id in self.trading_state:
-                    del self.trading_state[chat_id]
+                self.trading_state.pop(chat_id, None)
                     
         except Exception as e:
-            error_text = f"❌ **Token Scan Error**\n\n"
-            error_text += f"**Error:** {str(e)}\n\n"
-            error_text += f"🔧 **Technical Issue:** Please try again later"
+            error_text = _TECHNICAL_ERROR_TMPL.format(title="Token Scan Error", error=e)
             
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔙 Back to Main', 'callback_data': 'main_menu'}
             ]])
             
-            await self.send_message(chat_id, error_text, keyboard)
+            await self.send_or_edit_message(chat_id, message_id, error_text, keyboard)
             
             # Clear the trading state for this chat
-            if chat_id in self.trading_state:
-                del self.trading_state[chat_id]
+            self.trading_state.pop(chat_id, None)
     
     async def handle_copy_address(self, chat_id, callback_data):
         """Handle copy address button click"""
         try:
             # Extract token address from callback data
-            token_address = callback_data.replace('copy_address_', '')
+            if callback_data.startswith(COPY_ADDRESS_PREFIX):
+                token_address = callback_data[len(COPY_ADDRESS_PREFIX):]
+            else:
+                token_address = ''
             
             if token_address:
                 # Show the address in a message for easy copying
@@ -2068,28 +2797,26 @@ class SimpleTelegramBot:
     
     async def handle_refresh_scan(self, chat_id, callback_data):
         """Handle refresh scan button click"""
+        message_id = None
         try:
             # Extract token address from callback data
-            token_address = callback_data.replace('refresh_scan_', '')
+            if not callback_data.startswith(REFRESH_SCAN_PREFIX):
+                return
+            token_address = callback_data[len(REFRESH_SCAN_PREFIX):]
             
-            # Get stored scan data
-            if chat_id not in self.last_scan_results:
+            # Get stored scan data with a single lookup, since the entry can expire at any time
+            scan_data = self.last_scan_results.get(chat_id)
+            if scan_data is None:
                 await self.send_message(chat_id, "❌ No previous scan found to refresh. Please scan a token first.")
                 return
             
-            scan_data = self.last_scan_results[chat_id]
             chain = scan_data['chain']
             
-            # Show refreshing message
-            refreshing_text = f"🔄 **Refreshing Token Data...**\n\n"
-            refreshing_text += f"📍 **Address:** `{token_address}`\n"
-            refreshing_text += f"🌐 **Chain:** {chain}\n"
-            refreshing_text += f"⏳ **Status:** Fetching updated data..."
-            
-            await self.send_message(chat_id, refreshing_text)
-            
-            # Perform fresh token scan
-            result = await self.token_scanner.scan_token(token_address, chain)
+            # Perform fresh token scan, showing a refreshing message only if it takes a while
+            refreshing_text = _REFRESHING_TMPL.format(token_address=token_address, chain=chain)
+            result, message_id = await self._run_with_placeholder(
+                chat_id, self._cached_scan(token_address, chain), refreshing_text
+            )
             
             if result and "error" not in result:
                 # Update stored scan result
@@ -2102,33 +2829,13 @@ class SimpleTelegramBot:
                 # Format and display refreshed result
                 formatted_result = self.token_scanner.format_scan_result(result)
                 
-                keyboard = self.create_inline_keyboard([
-                    [
-                        {'text': '💰 Buy/Sell', 'callback_data': f'select_chain_{chain.lower()}'}
-                    ],
-                    [
-                        {'text': '📋 Copy Address', 'callback_data': f'copy_address_{token_address}'},
-                        {'text': '🔄 Refresh', 'callback_data': f'refresh_scan_{token_address}'}
-                    ],
-                    [
-                        {'text': '🔍 Scan Another', 'callback_data': 'scanner'},
-                        {'text': '🔙 Back to Main', 'callback_data': 'main_menu'}
-                    ]
-                    
-                ])
+                keyboard = _build_keyboard(_SCAN_RESULT_KB_TEMPLATE, chain=chain.lower(), token_address=token_address)
                 
-                await self.send_message(chat_id, formatted_result, keyboard)
+                await self.send_or_edit_message(chat_id, message_id, formatted_result, keyboard)
                 
             else:
-                error_text = f"❌ **Refresh Failed**\n\n"
-                if result and "error" in result:
-                    error_text += f"**Error:** {result['error']}\n\n"
-                else:
-                    error_text += f"**Error:** Failed to refresh token data\n\n"
-                error_text += f"💡 **Possible reasons:**\n"
-                error_text += f"• Token data temporarily unavailable\n"
-                error_text += f"• API temporarily unavailable\n\n"
-                error_text += f"🔍 **Try again later**"
+                error = result['error'] if result and "error" in result else "Failed to refresh token data"
+                error_text = _REFRESH_ERROR_TMPL.format(error=error)
                 
                 keyboard = self.create_inline_keyboard([
                     [
@@ -2137,169 +2844,129 @@ class SimpleTelegramBot:
                     ]
                 ])
                 
-                await self.send_message(chat_id, error_text, keyboard)
+                await self.send_or_edit_message(chat_id, message_id, error_text, keyboard)
                 
         except Exception as e:
-            error_text = f"❌ **Refresh Error**\n\n"
-            error_text += f"**Error:** {str(e)}\n\n"
-            error_text += f"🔧 **Technical Issue:** Please try again later"
+            error_text = _TECHNICAL_ERROR_TMPL.format(title="Refresh Error", error=e)
             
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔙 Back to Main', 'callback_data': 'main_menu'}
             ]])
             
-            await self.send_message(chat_id, error_text, keyboard)
+            await self.send_or_edit_message(chat_id, message_id, error_text, keyboard)
     
     async def process_amount(self, chat_id, user_id, amount_text):
         """Process amount input"""
-        if chat_id not in self.trading_state:
+        state = self.trading_state.get(chat_id)
+        if state is None:
             await self.send_message(chat_id, "❌ Please select Buy or Sell first.")
             return
         
-        # Check if this is for transfer
-        if chat_id in self.trading_state and self.trading_state[chat_id].get('action') == 'transfer_native':
-            # Handle native token transfer amount
-            try:
-                amount = float(amount_text)
-                if amount <= 0:
-                    await self.send_message(chat_id, "❌ Amount must be greater than 0.")
-                    return
-            except ValueError:
-                await self.send_message(chat_id, "❌ Invalid amount. Please enter a number.")
-                return
-            
-            # Store amount
-            self.trading_state[chat_id]['amount'] = amount
-            
-            # Show transfer confirmation
-            await self.show_transfer_confirmation(chat_id, user_id, 'native', amount)
+        # Transfers and slippage input have their own handlers
+        handler = self._amount_handlers.get(state.get('action'))
+        if handler:
+            await handler(chat_id, user_id, amount_text, state)
             return
         
-        # Check if this is for token transfer (amount input)
-        if chat_id in self.trading_state and self.trading_state[chat_id].get('action') == 'transfer_token_amount':
-            # Handle token transfer amount
-            try:
-                amount = float(amount_text)
-                if amount <= 0:
-                    await self.send_message(chat_id, "❌ Amount must be greater than 0.")
-                    return
-            except ValueError:
-                await self.send_message(chat_id, "❌ Invalid amount. Please enter a number.")
-                return
-            
-            # Store amount
-            self.trading_state[chat_id]['amount'] = amount
-            
-            # Show transfer confirmation
-            await self.show_transfer_confirmation(chat_id, user_id, 'token', amount)
-            return
-        
-        # Check if this is for setting slippage
-        if chat_id in self.trading_state and self.trading_state[chat_id].get('action') == 'set_slippage':
-            # Handle slippage input
-            try:
-                slippage_value = float(amount_text)
-                if slippage_value < 0.1 or slippage_value > 50.0:
-                    await self.send_message(chat_id, "❌ Slippage must be between 0.1% and 50.0%. Please enter a valid value.")
-                    return
-            except ValueError:
-                await self.send_message(chat_id, "❌ Invalid slippage value. Please enter a number (e.g., 0.5, 1.0, 2.0).")
-                return
-            
-            # Store slippage setting for this user
-            self.set_user_slippage(chat_id, slippage_value)
-            
-            # Store slippage setting (you can extend this to save to database)
-            # For now, we'll just show confirmation
-            
-            text = f"✅ **Custom Slippage Set Successfully!**\n\n"
-            text += f"📊 **New Setting:** {slippage_value}%\n\n"
-            
-            if slippage_value <= 0.5:
-                text += "💡 **Low Slippage:**\n"
-                text += "• Excellent price protection\n"
-                text += "• May fail on volatile tokens\n"
-                text += "• Best for stable tokens and small trades"
-            elif slippage_value <= 1.0:
-                text += "💡 **Medium Slippage:**\n"
-                text += "• Good price protection\n"
-                text += "• Balanced success rate\n"
-                text += "• Recommended for most trades"
-            elif slippage_value <= 2.0:
-                text += "💡 **High Slippage:**\n"
-                text += "• Higher success rate\n"
-                text += "• Moderate price protection\n"
-                text += "• Good for volatile tokens"
-            else:
-                text += "💡 **Very High Slippage:**\n"
-                text += "• Maximum success rate\n"
-                text += "• Lower price protection\n"
-                text += "• Use for very volatile tokens or urgent trades"
-            
-            text += f"\n💾 **Note:** This setting will be used for all future trades."
-            
-            keyboard = self.create_inline_keyboard([
-                [
-                    {'text': '🔙 Back to Slippage', 'callback_data': 'settings_slippage'},
-                    {'text': '⚙️ Settings', 'callback_data': 'settings'}
-                ]
-            ])
-            
-            # Clear the trading state
-            if chat_id in self.trading_state:
-                del self.trading_state[chat_id]
-            
-            await self.send_message(chat_id, text, keyboard)
-            return
-        
-        if 'token' not in self.trading_state[chat_id] and 'token_address' not in self.trading_state[chat_id]:
+        if 'token_address' not in state:
             await self.send_message(chat_id, "❌ Please enter token address first.")
             return
         
-        try:
-            amount = float(amount_text)
-            if amount <= 0:
-                await self.send_message(chat_id, "❌ Amount must be greater than 0.")
-                return
-        except ValueError:
+        amount = _parse_amount(amount_text)
+        if amount is None:
             await self.send_message(chat_id, "❌ Invalid amount. Please enter a number.")
             return
+        if amount <= 0:
+            await self.send_message(chat_id, "❌ Amount must be greater than 0.")
+            return
         
         # Store amount
-        self.trading_state[chat_id]['amount'] = amount
+        state['amount'] = amount
         
         # Show transaction overview instead of immediately executing
-        action = self.trading_state[chat_id]['action']
-        token_address = self.trading_state[chat_id].get('token') or self.trading_state[chat_id].get('token_address')
+        action = state['action']
+        token_address = state.get('token_address')
         
         if action == 'buy':
             await self.show_buy_overview(chat_id, user_id, token_address, amount)
         else:  # sell
             await self.show_sell_overview(chat_id, user_id, token_address, amount)
     
+    async def _process_transfer_native_amount(self, chat_id, user_id, amount_text, state):
+        """Handle the amount step of a native token transfer"""
+        amount = _parse_amount(amount_text)
+        if amount is None:
+            await self.send_message(chat_id, "❌ Invalid amount. Please enter a number.")
+            return
+        if amount <= 0:
+            await self.send_message(chat_id, "❌ Amount must be greater than 0.")
+            return
+        
+        # Store amount
+        state['amount'] = amount
+        
+        # Show transfer confirmation
+        await self.show_transfer_confirmation(chat_id, user_id, 'native', amount)
+    
+    async def _process_transfer_token_amount(self, chat_id, user_id, amount_text, state):
+        """Handle the amount step of an ERC-20 token transfer"""
+        amount = _parse_amount(amount_text)
+        if amount is None:
+            await self.send_message(chat_id, "❌ Invalid amount. Please enter a number.")
+            return
+        if amount <= 0:
+            await self.send_message(chat_id, "❌ Amount must be greater than 0.")
+            return
+        
+        # Store amount
+        state['amount'] = amount
+        
+        # Show transfer confirmation
+        await self.show_transfer_confirmation(chat_id, user_id, 'token', amount)
+    
+    async def _process_slippage_amount(self, chat_id, user_id, amount_text, state):
+        """Handle custom slippage input"""
+        slippage_value = _parse_amount(amount_text)
+        if slippage_value is None:
+            await self.send_message(chat_id, "❌ Invalid slippage value. Please enter a number (e.g., 0.5, 1.0, 2.0).")
+            return
+        if slippage_value < 0.1 or slippage_value > 50.0:
+            await self.send_message(chat_id, "❌ Slippage must be between 0.1% and 50.0%. Please enter a valid value.")
+            return
+        
+        # Store slippage setting for this user
+        self.set_user_slippage(chat_id, slippage_value)
+        
+        advice = next(advice for limit, advice in _SLIPPAGE_ADVICE if slippage_value <= limit)
+        text = _SLIPPAGE_SET_TMPL.format(slippage=slippage_value, advice=advice)
+        
+        # Clear the trading state
+        self.trading_state.pop(chat_id, None)
+        
+        await self.send_message(chat_id, text, _SLIPPAGE_SET_KEYBOARD_JSON)
+    
     async def show_buy_overview(self, chat_id, user_id, token_address, bnb_amount):
         """Show buy transaction overview with calculations"""
         
-        if not self.firebase.user_has_wallet(user_id):
+        wallet = await self._get_user_wallet(user_id)
+        if not wallet:
             await self.send_message(chat_id, "❌ You don't have a wallet.")
             return
         
-        wallet = self.firebase.get_user_wallet(user_id)
+        state = self.trading_state[chat_id]
+        chain = state.get('chain', 'BSC')
+        chain_data = _CHAIN_INFO.get(chain, _CHAIN_INFO['BSC'])
+        native_symbol = chain_data['symbol']
+        slippage = self.get_user_slippage(chat_id)
         
-        # Get price estimate and security info
-        chain = self.trading_state[chat_id].get('chain', 'BSC')
-        price_estimate = self.trading.get_token_price_estimate(
-            chain, 
-            token_address, 
-            bnb_amount
-        )
+        # Get price estimate and security info concurrently
+        price_estimate, security_info = await self._get_overview(chat_id, chain, token_address, bnb_amount, 'buy')
         
         if not price_estimate:
             await self.send_message(chat_id, "❌ Could not get price estimate.")
             return
         
         # Get tax information from token scanner
-        security_info = await self.token_scanner.get_token_security_info(token_address, chain)
         buy_tax = security_info.get('buy_tax', 0) if security_info and 'error' not in security_info else 0
         sell_tax = security_info.get('sell_tax', 0) if security_info and 'error' not in security_info else 0
         transfer_tax = security_info.get('transfer_tax', 0) if security_info and 'error' not in security_info else 0
@@ -2312,75 +2979,44 @@ class SimpleTelegramBot:
         # Calculate price per token
         price_per_token = bnb_amount / token_amount if token_amount > 0 else 0
         
-        # Get chain info for display
-        chain_info = {
-            'ETH': {
-                'name': 'Ethereum Mainnet',
-                'symbol': 'ETH',
-                'dex': 'Uniswap V2'
-            },
-            'BSC': {
-                'name': 'BSC Mainnet',
-                'symbol': 'BNB',
-                'dex': 'PancakeSwap v2'
-            },
-            'SEPOLIA': {
-                'name': 'Sepolia Testnet',
-                'symbol': 'ETH',
-                'dex': 'Uniswap V2'
-            }
-        }
-        chain_data = chain_info.get(chain, chain_info['BSC'])
-        
-        text = f"🟢 **BUY TRANSACTION OVERVIEW**\n\n"
-        text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-        text += f"🌐 Network: {chain_data['name']}\n"
-        text += f"🔄 **DEX:** {chain_data['dex']}\n\n"
-        text += f"💰 **Transaction Details:**\n"
-        native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
-
-        text += f"• **{native_symbol} Amount:** {bnb_amount:.6f} {native_symbol}\n"
-        text += f"• **Estimated Gas:** {gas_estimate:.6f} {native_symbol}\n"
-        text += f"• **Total Cost:** {total_bnb:.6f} {native_symbol}\n\n"
-        text += f"🪙 **Token Details:**\n"
-        text += f"• **Tokens to Receive:** {token_amount:.6f}\n"
-        text += f"• **Price per Token:** {price_per_token:.8f} {native_symbol}\n"
-        text += f"• **Slippage:** {self.get_user_slippage(chat_id)}%\n\n"
-        text += f"📊 **Price Impact:** Low\n"
-        text += f"⏱️ **Estimated Time:** 30-60 seconds\n\n"
-        text += f"⚠️ **Please review the details above.**\n"
-        text += f"Click 'Confirm Buy' to proceed with the transaction."
+        text = _BUY_OVERVIEW_TMPL.format(
+            addr=token_address[:20],
+            chain_name=chain_data['name'],
+            dex=chain_data['dex'],
+            native=native_symbol,
+            bnb_amount=bnb_amount,
+            gas=gas_estimate,
+            total=total_bnb,
+            tokens=token_amount,
+            price=price_per_token,
+            slip=slippage
+        )
         
         # Store transaction data for confirmation
-        self.trading_state[chat_id]['price_estimate'] = price_estimate
-        self.trading_state[chat_id]['gas_estimate'] = gas_estimate
-        
-        keyboard = self.create_inline_keyboard([
-            [
-                {'text': '✅ Confirm Buy', 'callback_data': 'confirm_buy'},
-                {'text': '❌ Cancel', 'callback_data': 'buy_sell'}
-            ]
-        ])
+        state['price_estimate'] = price_estimate
+        state['gas_estimate'] = gas_estimate
         
-        await self.send_message(chat_id, text, keyboard)
+        await self.send_message(chat_id, text, _CONFIRM_KEYBOARD_JSON['buy'])
     
     async def show_sell_overview(self, chat_id, user_id, token_address, token_amount):
         """Show sell transaction overview with calculations"""
         
-        if not self.firebase.user_has_wallet(user_id):
+        wallet = await self._get_user_wallet(user_id)
+        if not wallet:
             await self.send_message(chat_id, "❌ You don't have a wallet.")
             return
         
-        wallet = self.firebase.get_user_wallet(user_id)
+        state = self.trading_state[chat_id]
+        chain = state.get('chain', 'BSC')
+        chain_data = _CHAIN_INFO.get(chain, _CHAIN_INFO['BSC'])
+        native_symbol = chain_data['symbol']
+        slippage = self.get_user_slippage(chat_id)
         
-        # Determine native symbol and get price estimate for selling via router
-        chain = self.trading_state[chat_id].get('chain', 'BSC')
-        native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
-        sell_estimate = self.trading.get_token_sell_estimate(chain, token_address, token_amount)
+        # Get price estimate for selling via router and security info concurrently
+        sell_estimate, security_info = await self._get_overview(chat_id, chain, token_address, token_amount, 'sell')
         estimated_bnb = sell_estimate['native_out'] if sell_estimate else 0.0
         
         # Get tax information from token scanner
-        security_info = await self.token_scanner.get_token_security_info(token_address, chain)
         buy_tax = security_info.get('buy_tax', 0) if security_info and 'error' not in security_info else 0
         sell_tax = security_info.get('sell_tax', 0) if security_info and 'error' not in security_info else 0
         transfer_tax = security_info.get('transfer_tax', 0) if security_info and 'error' not in security_info else 0
@@ -2392,56 +3028,24 @@ class SimpleTelegramBot:
         # Calculate price per token
         price_per_token = (estimated_bnb / token_amount) if token_amount > 0 else 0
         
-        # Get chain info for display
-        chain_info = {
-            'ETH': {
-                'name': 'Ethereum Mainnet',
-                'symbol': 'ETH',
-                'dex': 'Uniswap V2'
-            },
-            'BSC': {
-                'name': 'BSC Mainnet',
-                'symbol': 'BNB',
-                'dex': 'PancakeSwap v2'
-            },
-            'SEPOLIA': {
-                'name': 'Sepolia Testnet',
-                'symbol': 'ETH',
-                'dex': 'Uniswap V2'
-            }
-        }
-        chain_data = chain_info.get(chain, chain_info['BSC'])
-        
-        text = f"🔴 **SELL TRANSACTION OVERVIEW**\n\n"
-        text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-        text += f"🌐 Network: {chain_data['name']}\n"
-        text += f"🔄 **DEX:** {chain_data['dex']}\n\n"
-        text += f"🪙 **Transaction Details:**\n"
-        text += f"• **Token Amount:** {token_amount:.2f}\n"
-        native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
-        text += f"• **Estimated {native_symbol}:** {estimated_bnb:.6f} {native_symbol}\n"
-        text += f"• **Gas Fee:** {gas_estimate:.6f} {native_symbol}\n"
-        text += f"• **Net {native_symbol}:** {net_bnb:.6f} {native_symbol}\n\n"
-        text += f"💰 **Price Details:**\n"
-        text += f"• **Price per Token:** {price_per_token:.8f} {native_symbol}\n"
-        text += f"• **Slippage:** {self.get_user_slippage(chat_id)}%\n\n"
-        text += f"📊 **Price Impact:** Low\n"
-        text += f"⏱️ **Estimated Time:** 30-60 seconds\n\n"
-        text += f"⚠️ **Please review the details above.**\n"
-        text += f"Click 'Confirm Sell' to proceed with the transaction."
+        text = _SELL_OVERVIEW_TMPL.format(
+            addr=token_address[:20],
+            chain_name=chain_data['name'],
+            dex=chain_data['dex'],
+            native=native_symbol,
+            tokens=token_amount,
+            estimated=estimated_bnb,
+            gas=gas_estimate,
+            net=net_bnb,
+            price=price_per_token,
+            slip=slippage
+        )
         
         # Store transaction data for confirmation
-        self.trading_state[chat_id]['estimated_bnb'] = estimated_bnb
-        self.trading_state[chat_id]['gas_estimate'] = gas_estimate
-        
-        keyboard = self.create_inline_keyboard([
-            [
-                {'text': '✅ Confirm Sell', 'callback_data': 'confirm_sell'},
-                {'text': '❌ Cancel', 'callback_data': 'buy_sell'}
-            ]
-        ])
+        state['estimated_bnb'] = estimated_bnb
+        state['gas_estimate'] = gas_estimate
         
-        await self.send_message(chat_id, text, keyboard)
+        await self.send_message(chat_id, text, _CONFIRM_KEYBOARD_JSON['sell'])
     
     async def handle_confirm_buy(self, chat_id, user_id):
         """Handle buy confirmation"""
@@ -2450,7 +3054,7 @@ class SimpleTelegramBot:
             return
         
         tx_data = self.trading_state[chat_id]
-        token_address = tx_data.get('token') or tx_data.get('token_address')
+        token_address = tx_data.get('token_address')
         if 'amount' not in tx_data or not token_address:
             await self.send_message(chat_id, "❌ Incomplete transaction data.")
             return
@@ -2465,7 +3069,7 @@ class SimpleTelegramBot:
             return
         
         tx_data = self.trading_state[chat_id]
-        token_address = tx_data.get('token') or tx_data.get('token_address')
+        token_address = tx_data.get('token_address')
         if 'amount' not in tx_data or not token_address:
             await self.send_message(chat_id, "❌ Incomplete transaction data.")
             return
@@ -2476,25 +3080,28 @@ class SimpleTelegramBot:
     async def show_transfer_confirmation(self, chat_id, user_id, transfer_type, amount):
         """Show transfer confirmation"""
         try:
-            if not self.firebase.user_has_wallet(user_id):
+            wallet = await self._get_user_wallet(user_id)
+            if not wallet:
                 await self.send_message(chat_id, "❌ You don't have a wallet.")
                 return
             
-            wallet = self.firebase.get_user_wallet(user_id)
             chain = self.trading_state[chat_id]['chain']
+            chain_name = self.transfer_manager.get_chain_display_name(chain)
             
             if transfer_type == 'native':
                 # Native token transfer confirmation
                 native_symbol = self.transfer_manager.get_native_symbol(chain)
                 recipient_address = self.trading_state[chat_id]['recipient_address']
                 
-                text = f"💰 **Native {native_symbol} Transfer Confirmation**\n\n"
-                text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
-                text += f"💸 **Amount:** {amount} {native_symbol}\n"
-                text += f"📍 **To:** `{recipient_address[:10]}...{recipient_address[-10:]}`\n"
-                text += f"🔑 **From:** `{wallet['public_key'][:10]}...{wallet['public_key'][-10:]}`\n\n"
-                text += f"⚠️ **Please confirm the transfer details above.**\n"
-                text += f"Click 'Confirm Transfer' to proceed."
+                text = _TRANSFER_CONFIRM_TMPL_NATIVE.format(
+                    native=native_symbol,
+                    chain_name=chain_name,
+                    amount=amount,
+                    to_start=recipient_address[:10],
+                    to_end=recipient_address[-10:],
+                    from_start=wallet['public_key'][:10],
+                    from_end=wallet['public_key'][-10:]
+                )
                 
                 keyboard = self.create_inline_keyboard([
                     [
@@ -2509,10 +3116,7 @@ class SimpleTelegramBot:
                 recipient_address = self.trading_state[chat_id]['recipient_address']
                 
                 # Get token info
-                token_info = await self.transfer_manager._get_token_info(
-                    self.transfer_manager.web3_instances[chain], 
-                    token_contract
-                )
+                token_info = await self._get_cached_token_info(chain, token_contract)
                 
                 if not token_info:
                     await self.send_message(chat_id, "❌ Could not get token information.")
@@ -2523,14 +3127,16 @@ class SimpleTelegramBot:
                 if token_info['name'] and token_info['name'] != "Unknown Token":
                     token_display += f" ({token_info['name']})"
                 
-                text = f"🪙 **Token Transfer Confirmation**\n\n"
-                text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
-                text += f"🪙 **Token:** {token_display}\n"
-                text += f"💸 **Amount:** {amount} {token_info['symbol']}\n"
-                text += f"📍 **To:** `{recipient_address[:10]}...{recipient_address[-10:]}`\n"
-                text += f"🔑 **From:** `{wallet['public_key'][:10]}...{wallet['public_key'][-10:]}`\n\n"
-                text += f"⚠️ **Please confirm the transfer details above.**\n"
-                text += f"Click 'Confirm Transfer' to proceed."
+                text = _TRANSFER_CONFIRM_TMPL_TOKEN.format(
+                    chain_name=chain_name,
+                    token_display=token_display,
+                    amount=amount,
+                    symbol=token_info['symbol'],
+                    to_start=recipient_address[:10],
+                    to_end=recipient_address[-10:],
+                    from_start=wallet['public_key'][:10],
+                    from_end=wallet['public_key'][-10:]
+                )
                 
                 keyboard = self.create_inline_keyboard([
                     [
@@ -2548,12 +3154,12 @@ class SimpleTelegramBot:
     async def execute_transfer(self, chat_id, user_id, transfer_type):
         """Execute the transfer transaction"""
         try:
-            if not self.firebase.user_has_wallet(user_id):
+            wallet = await self._get_user_wallet(user_id)
+            if not wallet:
                 await self.send_message(chat_id, "❌ You don't have a wallet.")
                 return
             
-            wallet = self.firebase.get_user_wallet(user_id)
-            private_key = self.firebase.get_private_key(user_id)
+            private_key = await self._get_private_key(user_id)
             
             if not private_key:
                 await self.send_message(chat_id, "❌ Could not retrieve private key.")
@@ -2561,10 +3167,13 @@ class SimpleTelegramBot:
             
             chain = self.trading_state[chat_id]['chain']
             amount = self.trading_state[chat_id]['amount']
+            chain_name = self.transfer_manager.get_chain_display_name(chain)
+            native_symbol = self.transfer_manager.get_native_symbol(chain)
             
             if transfer_type == 'native':
                 # Execute native token transfer
                 recipient_address = self.trading_state[chat_id]['recipient_address']
+                recipient_short = _short_addr(recipient_address)
                 
                 result = await self.transfer_manager.transfer_native_tokens(
                     wallet['public_key'],
@@ -2575,24 +3184,28 @@ class SimpleTelegramBot:
                 )
                 
                 if result['success']:
-                    text = f"✅ **Native Transfer Successful!**\n\n"
-                    text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
-                    text += f"💸 **Amount:** {amount} {self.transfer_manager.get_native_symbol(chain)}\n"
-                    text += f"📍 **To:** `{recipient_address[:10]}...{recipient_address[-10:]}`\n"
-                    text += f"📊 **Transaction Hash:** `0x{result['tx_hash']}`\n"
-                    text += f"⛽ **Gas Used:** {result['gas_used']}\n\n"
-                    text += f"🔍 **View on Explorer:** {result['explorer_url']}"
+                    text = (
+                        f"✅ **Native Transfer Successful!**\n\n"
+                        f"🌐 Network: {chain_name}\n"
+                        f"💸 **Amount:** {amount} {native_symbol}\n"
+                        f"📍 **To:** `{recipient_short}`\n"
+                        f"📊 **Transaction Hash:** `0x{result['tx_hash']}`\n"
+                        f"⛽ **Gas Used:** {result['gas_used']}\n\n"
+                        f"🔍 **View on Explorer:** {result['explorer_url']}"
+                    )
                     
                     keyboard = self.create_inline_keyboard([[
                         {'text': '🔙 Back to Transfer', 'callback_data': 'transfer'}
                     ]])
                 else:
-                    text = f"❌ **Native Transfer Failed!**\n\n"
-                    text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
-                    text += f"💸 **Amount:** {amount} {self.transfer_manager.get_native_symbol(chain)}\n"
-                    text += f"📍 **To:** `{recipient_address[:10]}...{recipient_address[-10:]}`\n"
-                    text += f"❌ **Error:** {result['error']}\n\n"
-                    text += f"💡 **Please try again or check your balance.**"
+                    text = (
+                        f"❌ **Native Transfer Failed!**\n\n"
+                        f"🌐 Network: {chain_name}\n"
+                        f"💸 **Amount:** {amount} {native_symbol}\n"
+                        f"📍 **To:** `{recipient_short}`\n"
+                        f"❌ **Error:** {result['error']}\n\n"
+                        f"💡 **Please try again or check your balance.**"
+                    )
                     
                     keyboard = self.create_inline_keyboard([[
                         {'text': '🔄 Try Again', 'callback_data': 'transfer'},
@@ -2603,6 +3216,7 @@ class SimpleTelegramBot:
                 # Execute token transfer
                 token_contract = self.trading_state[chat_id]['token_contract']
                 recipient_address = self.trading_state[chat_id]['recipient_address']
+                recipient_short = _short_addr(recipient_address)
                 
                 result = await self.transfer_manager.transfer_erc20_tokens(
                     wallet['public_key'],
@@ -2614,26 +3228,30 @@ class SimpleTelegramBot:
                 )
                 
                 if result['success']:
-                    text = f"✅ **Token Transfer Successful!**\n\n"
-                    text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
-                    text += f"🪙 **Token:** {result['token_symbol']}\n"
-                    text += f"💸 **Amount:** {amount} {result['token_symbol']}\n"
-                    text += f"📍 **To:** `{recipient_address[:10]}...{recipient_address[-10:]}`\n"
-                    text += f"📊 **Transaction Hash:** `0x{result['tx_hash']}`\n"
-                    text += f"⛽ **Gas Used:** {result['gas_used']}\n\n"
-                    text += f"🔍 **View on Explorer:** {result['explorer_url']}"
+                    text = (
+                        f"✅ **Token Transfer Successful!**\n\n"
+                        f"🌐 Network: {chain_name}\n"
+                        f"🪙 **Token:** {result['token_symbol']}\n"
+                        f"💸 **Amount:** {amount} {result['token_symbol']}\n"
+                        f"📍 **To:** `{recipient_short}`\n"
+                        f"📊 **Transaction Hash:** `0x{result['tx_hash']}`\n"
+                        f"⛽ **Gas Used:** {result['gas_used']}\n\n"
+                        f"🔍 **View on Explorer:** {result['explorer_url']}"
+                    )
                     
                     keyboard = self.create_inline_keyboard([[
                         {'text': '🔙 Back to Transfer', 'callback_data': 'transfer'}
                     ]])
                 else:
-                    text = f"❌ **Token Transfer Failed!**\n\n"
-                    text += f"🌐 Network: {self.transfer_manager.get_chain_display_name(chain)}\n"
-                    text += f"🪙 **Token:** {token_contract[:10]}...\n"
-                    text += f"💸 **Amount:** {amount}\n"
-                    text += f"📍 **To:** `{recipient_address[:10]}...{recipient_address[-10:]}`\n"
-                    text += f"❌ **Error:** {result['error']}\n\n"
-                    text += f"💡 **Please try again or check your balance.**"
+                    text = (
+                        f"❌ **Token Transfer Failed!**\n\n"
+                        f"🌐 Network: {chain_name}\n"
+                        f"🪙 **Token:** {_short_addr(token_contract, 10, 0)}\n"
+                        f"💸 **Amount:** {amount}\n"
+                        f"📍 **To:** `{recipient_short}`\n"
+                        f"❌ **Error:** {result['error']}\n\n"
+                        f"💡 **Please try again or check your balance.**"
+                    )
                     
                     keyboard = self.create_inline_keyboard([[
                         {'text': '🔄 Try Again', 'callback_data': 'transfer'},
@@ -2641,8 +3259,7 @@ class SimpleTelegramBot:
                     ]])
             
             # Clear trading state
-            if chat_id in self.trading_state:
-                del self.trading_state[chat_id]
+            self.trading_state.pop(chat_id, None)
             
             await self.send_message(chat_id, text, keyboard)
             
@@ -2653,20 +3270,22 @@ class SimpleTelegramBot:
     async def execute_buy(self, chat_id, user_id, token_address, bnb_amount):
         """Execute buy transaction"""
         
-        if not self.firebase.user_has_wallet(user_id):
+        wallet, private_key = await asyncio.gather(
+            self._get_user_wallet(user_id),
+            self._get_private_key(user_id)
+        )
+        if not wallet:
             await self.send_message(chat_id, "❌ You don't have a wallet.")
             return
         
-        wallet = self.firebase.get_user_wallet(user_id)
-        private_key = self.firebase.get_private_key(user_id)
-        
         if not private_key:
             await self.send_message(chat_id, "❌ Could not retrieve private key.")
             return
         
         # Get price estimate
         chain = self.trading_state[chat_id].get('chain', 'BSC')
-        price_estimate = self.trading.get_token_price_estimate(
+        price_estimate = await self._run_blocking(
+            self.trading.get_token_price_estimate,
             chain, 
             token_address, 
             bnb_amount
@@ -2676,68 +3295,67 @@ class SimpleTelegramBot:
             await self.send_message(chat_id, "❌ Could not get price estimate.")
             return
             
-        # Execute the buy transaction
-        result = self.trading.buy_tokens(
-            chain,
-            token_address,
-            bnb_amount,
-            wallet['public_key'],
-            private_key,
-            slippage=self.get_user_slippage(chat_id)
+        # Execute the buy transaction, acknowledging right away if broadcasting is slow
+        result, message_id = await self._run_with_placeholder(
+            chat_id,
+            self._run_blocking(
+                self.trading.buy_tokens,
+                chain,
+                token_address,
+                bnb_amount,
+                wallet['public_key'],
+                private_key,
+                slippage=self.get_user_slippage(chat_id),
+                price_estimate=price_estimate
+            ),
+            "⏳ **Submitting buy transaction...**"
         )
         
         # Determine native symbol for the selected chain
-        native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
+        native_symbol = _NATIVE_SYMBOL.get(chain, 'BNB')
 
         if result['success']:
+            self._token_balance_cache.pop((chain, wallet['public_key'], token_address))
+            
             # Get token symbol for button text
-            token_symbol = 'TOKEN'  # Default fallback
-            try:
-                scan_result = await self.token_scanner.scan_token(token_address, chain)
-                if scan_result and "error" not in scan_result:
-                    token_symbol = scan_result.get('token_symbol', 'TOKEN')
-            except:
-                pass  # Use default if scanning fails
+            token_symbol = await self._get_trade_token_symbol(chat_id, token_address, chain)
             
             # Store token address and chain for quick actions
-            self.trading_state[chat_id] = {
-                'chain': chain,
-                'token_address': token_address,
-                'token_symbol': token_symbol,
-                'last_successful_action': 'buy'
-            }
+            self._reset_trading_state(
+                chat_id,
+                chain=chain,
+                token_address=token_address,
+                token_symbol=token_symbol,
+                last_successful_action='buy'
+            )
             logger.info(f"DEBUG: Stored token address for chat {chat_id}: {token_address}")
             logger.info(f"DEBUG: Trading state after buy success: {self.trading_state[chat_id]}")
             
-            text = f"✅ **Buy Transaction Successful!**\n\n"
-            
-            text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-            text += f"💰 **{native_symbol} Spent:** {bnb_amount} {native_symbol}\n"
-            text += f"🪙 **Tokens Received:** {price_estimate['token_amount']:.6f}\n"
-            text += f"📊 **Transaction Hash:** `0x{result['tx_hash']}`\n"
-            text += f"⛽ **Gas Used:** {result['gas_estimate']}\n\n"
             # Get blockchain explorer URL based on chain
-            explorer_url = "https://bscscan.com/tx/" if chain == 'BSC' else "https://etherscan.io/tx/"
+            explorer_url = _EXPLORER_TX.get(chain, _EXPLORER_TX['ETH'])
             tx_hash = result['tx_hash']
             if not tx_hash.startswith('0x'):
                 tx_hash = '0x' + tx_hash
-            text += f"🔍 **View on Explorer:** {explorer_url}{tx_hash}"
             
-            keyboard = self.create_inline_keyboard([
-                [
-                    {'text': f'🟢 Buy {token_symbol}', 'callback_data': f'quick_buy_{chain}'},
-                    {'text': f'🔴 Sell {token_symbol}', 'callback_data': f'quick_sell_{chain}'}
-                ],
-                [
-                    {'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}
-                ]
-            ])
+            details = (
+                f"🔑 **Token:** `{_short_addr(token_address, 20, 0)}`\n"
+                f"💰 **{native_symbol} Spent:** {bnb_amount} {native_symbol}\n"
+                f"🪙 **Tokens Received:** {price_estimate['token_amount']:.6f}\n"
+                f"📊 **Transaction Hash:** `0x{result['tx_hash']}`\n"
+                f"⛽ **Gas Used:** {result['gas_estimate']}\n\n"
+                f"🔍 **View on Explorer:** {explorer_url}{tx_hash}"
+            )
+            text = f"📤 **Buy Transaction Submitted!**\n\n{details}\n\n⏳ Awaiting confirmation..."
+            
+            keyboard = _success_keyboard_json(chain, token_symbol)
         else:
-            text = f"❌ **Buy Transaction Failed!**\n\n"
-            text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-            text += f"💰 **{native_symbol} Amount:** {bnb_amount} {native_symbol}\n"
-            text += f"❌ **Error:** {result['error']}\n\n"
-            text += f"💡 **Try again or check your balance.**"
+            text = (
+                f"❌ **Buy Transaction Failed!**\n\n"
+                f"🔑 **Token:** `{_short_addr(token_address, 20, 0)}`\n"
+                f"💰 **{native_symbol} Amount:** {bnb_amount} {native_symbol}\n"
+                f"❌ **Error:** {result['error']}\n\n"
+                f"💡 **Try again or check your balance.**"
+            )
             
             keyboard = self.create_inline_keyboard([[
                 {'text': '🔄 Try Again', 'callback_data': 'buy'},
@@ -2745,329 +3363,162 @@ class SimpleTelegramBot:
             ]])
             
             # Clear trading state only for failed transactions
-            if chat_id in self.trading_state:
-                del self.trading_state[chat_id]
+            self.trading_state.pop(chat_id, None)
         
-        await self.send_message(chat_id, text, keyboard)
+        response = await self.send_or_edit_message(chat_id, message_id, text, keyboard)
+        
+        if result['success']:
+            self._start_background_task(self._confirm_trade(
+                chat_id, self.get_message_id(response), chain, tx_hash, 'Buy', details, keyboard,
+                balance_key=(chain, wallet['public_key'], token_address)
+            ))
     
     async def execute_sell(self, chat_id, user_id, token_address, token_amount):
         """Execute sell transaction"""
         
-        if not self.firebase.user_has_wallet(user_id):
+        wallet, private_key = await asyncio.gather(
+            self._get_user_wallet(user_id),
+            self._get_private_key(user_id)
+        )
+        if not wallet:
             await self.send_message(chat_id, "❌ You don't have a wallet.")
             return
-            
-        wallet = self.firebase.get_user_wallet(user_id)
-        private_key = self.firebase.get_private_key(user_id)
         
         if not private_key:
-            await self.send_message(chat_id, "❌ Could not retrieve private key.")
-            return
-        
-        # Execute the sell transaction
-        chain = self.trading_state[chat_id].get('chain', 'BSC')
-        native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
-        result = self.trading.sell_tokens(
-            chain,
-            token_address,
-            token_amount,
-            wallet['public_key'],
-            private_key,
-            slippage=self.get_user_slippage(chat_id)
-        )
-        
-        if result['success']:
-            # Get token symbol for button text
-            token_symbol = 'TOKEN'  # Default fallback
-            try:
-                scan_result = await self.token_scanner.scan_token(token_address, chain)
-                if scan_result and "error" not in scan_result:
-                    token_symbol = scan_result.get('token_symbol', 'TOKEN')
-            except:
-                pass  # Use default if scanning fails
-            
-            # Store token address and chain for quick actions
-            self.trading_state[chat_id] = {
-                'chain': chain,
-                'token_address': token_address,
-                'token_symbol': token_symbol,
-                'last_successful_action': 'sell'
-            }
-            logger.info(f"DEBUG: Stored token address for chat {chat_id}: {token_address}")
-            logger.info(f"DEBUG: Trading state after sell success: {self.trading_state[chat_id]}")
-            
-            text = f"✅ **Sell Transaction Successful!**\n\n"
-            text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-            text += f"🪙 **Tokens Sold:** {token_amount}\n"
-            # text += f"💰 **{native_symbol} Received:** Calculating...\n"
-            text += f"📊 **Transaction Hash:** `0x{result['tx_hash']}`\n"
-            text += f"⛽ **Gas Used:** {result['gas_estimate']}\n\n"
-            # Get blockchain explorer URL based on chain
-            explorer_url = "https://bscscan.com/tx/" if chain == 'BSC' else "https://etherscan.io/tx/"
-            tx_hash = result['tx_hash']
-            if not tx_hash.startswith('0x'):
-                tx_hash = '0x' + tx_hash
-            text += f"🔍 **View on Explorer:** {explorer_url}{tx_hash}"
-        
-            keyboard = self.create_inline_keyboard([
-                [
-                    {'text': f'🟢 Buy {token_symbol}', 'callback_data': f'quick_buy_{chain}'},
-                    {'text': f'🔴 Sell {token_symbol}', 'callback_data': f'quick_sell_{chain}'}
-                ],
-                [
-                    {'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}
-                ]
-            ])
-        else:
-            text = f"❌ **Sell Transaction Failed!**\n\n"
-            text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-            text += f"🪙 **Token Amount:** {token_amount}\n"
-            text += f"❌ **Error:** {result['error']}\n\n"
-            text += f"💡 **Try again or check your token balance.**"
-            
-            keyboard = self.create_inline_keyboard([[
-                {'text': '🔄 Try Again', 'callback_data': 'sell'},
-                {'text': '🔙 Back to Trading', 'callback_data': 'buy_sell'}
-            ]])
-            
-            # Clear trading state only for failed transactions
-            if chat_id in self.trading_state:
-                del self.trading_state[chat_id]
-        
-        await self.send_message(chat_id, text, keyboard)
-    
-    # ==================== QUICK TRADING COMMANDS ====================
-    
-    async def handle_quick_buy_command(self, chat_id, user_id, chain):
-        """Handle quick buy commands like /buybsc, /buyeth"""
-        try:
-            # Check if user has wallet
-            if not self.firebase.user_has_wallet(user_id):
-                text = "❌ **No Wallet Found**\n\n"
-                text += "You need to create or import a wallet first.\n"
-                text += "Use the Wallet menu to get started!"
-                
-                keyboard = self.create_inline_keyboard([
-                    [{'text': '🔐 Create Wallet', 'callback_data': 'create_wallet'}],
-                    [{'text': '📥 Import Wallet', 'callback_data': 'import_wallet'}],
-                    [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
-                ])
-                await self.send_message(chat_id, text, keyboard)
-                return
-            
-            # Set up trading state for the quick command
-            self.trading_state[chat_id] = {
-                'chain': chain,
-                'action': 'buy',
-                'from_quick_command': True
-            }
-            
-            # Get wallet info
-            wallet = self.firebase.get_user_wallet(user_id)
-            balance = self.blockchain.get_balance(chain, wallet['public_key'])
-            
-            if balance is None:
-                balance = 0.0
-            
-            native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
-            
-            text = f"🚀 **Quick Buy - {chain}**\n\n"
-            text += f"🔗 **Chain:** {chain}\n"
-            text += f"💰 **Your Balance:** {balance:.6f} {native_symbol}\n"
-            text += f"📊 **Slippage:** {self.get_user_slippage(chat_id)}%\n\n"
-            text += f"🔧 **Enter the token contract address you want to buy:**"
-            
-            keyboard = self.create_inline_keyboard([
-                [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
-            ])
-            
-            await self.send_message(chat_id, text, keyboard)
-            
-        except Exception as e:
-            logger.error(f"Error in handle_quick_buy_command: {e}")
-            await self.send_message(chat_id, "❌ An error occurred. Please try again.")
-    
-    async def handle_quick_sell_command(self, chat_id, user_id, chain):
-        """Handle quick sell commands like /sellbsc, /selleth"""
-        try:
-            # Check if user has wallet
-            if not self.firebase.user_has_wallet(user_id):
-                text = "❌ **No Wallet Found**\n\n"
-                text += "You need to create or import a wallet first.\n"
-                text += "Use the Wallet menu to get started!"
-                
-                keyboard = self.create_inline_keyboard([
-                    [{'text': '🔐 Create Wallet', 'callback_data': 'create_wallet'}],
-                    [{'text': '📥 Import Wallet', 'callback_data': 'import_wallet'}],
-                    [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
-                ])
-                await self.send_message(chat_id, text, keyboard)
-                return
-            
-            # Set up trading state for the quick command
-            self.trading_state[chat_id] = {
-                'chain': chain,
-                'action': 'sell',
-                'from_quick_command': True
-            }
-            
-            # Get wallet info
-            wallet = self.firebase.get_user_wallet(user_id)
-            balance = self.blockchain.get_balance(chain, wallet['public_key'])
-            
-            if balance is None:
-                balance = 0.0
-            
-            native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
-            
-            text = f"🚀 **Quick Sell - {chain}**\n\n"
-            text += f"🔗 **Chain:** {chain}\n"
-            text += f"💰 **Your Balance:** {balance:.6f} {native_symbol}\n"
-            text += f"📊 **Slippage:** {self.get_user_slippage(chat_id)}%\n\n"
-            text += f"🔧 **Enter the token contract address you want to sell:**"
-            
-            keyboard = self.create_inline_keyboard([
-                [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
-            ])
-            
-            await self.send_message(chat_id, text, keyboard)
-            
-        except Exception as e:
-            logger.error(f"Error in handle_quick_sell_command: {e}")
-            await self.send_message(chat_id, "❌ An error occurred. Please try again.")
-
-    async def handle_quick_buy_from_success(self, chat_id, user_id, chain):
-        """Handle quick buy from success message - auto-select chain and operation"""
-        try:
-            # Check if user has wallet
-            if not self.firebase.user_has_wallet(user_id):
-                text = "❌ **No Wallet Found**\n\n"
-                text += "You need to create or import a wallet first.\n"
-                text += "Use the Wallet menu to get started!"
-                
-                keyboard = self.create_inline_keyboard([
-                    [{'text': '🔐 Create Wallet', 'callback_data': 'create_wallet'}],
-                    [{'text': '📥 Import Wallet', 'callback_data': 'import_wallet'}],
-                    [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
-                ])
-                await self.send_message(chat_id, text, keyboard)
-                return
-            
-            # Check if we have a stored token address from previous successful transaction
-            stored_token_address = None
-            if chat_id in self.trading_state:
-                stored_token_address = self.trading_state[chat_id].get('token_address')
-                logger.info(f"DEBUG: Found stored token address: {stored_token_address}")
-                logger.info(f"DEBUG: Current trading state: {self.trading_state[chat_id]}")
-            else:
-                logger.info(f"DEBUG: No trading state found for chat {chat_id}")
-            
-            # If we have a stored token address, use it directly
-            if stored_token_address:
-                logger.info(f"DEBUG: Using stored token address: {stored_token_address}")
-                # Set up trading state with chain, action, and token address pre-selected
-                self.trading_state[chat_id] = {
-                    'chain': chain,
-                    'action': 'buy',
-                    'token_address': stored_token_address,
-                    'from_quick_command': True
-                }
-                # Go directly to amount selection
-                await self.go_directly_to_amount_selection(chat_id, user_id, stored_token_address, chain, 'buy')
-                return
-            
-            # Set up trading state with chain and action pre-selected (no stored token address)
-            self.trading_state[chat_id] = {
-                'chain': chain,
-                'action': 'buy',
-                'from_quick_command': True
-            }
-            
-            # Get wallet info
-            wallet = self.firebase.get_user_wallet(user_id)
-            balance = self.blockchain.get_balance(chain, wallet['public_key'])
+            await self.send_message(chat_id, "❌ Could not retrieve private key.")
+            return
+        
+        # Execute the sell transaction
+        chain = self.trading_state[chat_id].get('chain', 'BSC')
+        native_symbol = _NATIVE_SYMBOL.get(chain, 'BNB')
+        result, message_id = await self._run_with_placeholder(
+            chat_id,
+            self._run_blocking(
+                self.trading.sell_tokens,
+                chain,
+                token_address,
+                token_amount,
+                wallet['public_key'],
+                private_key,
+                slippage=self.get_user_slippage(chat_id)
+            ),
+            "⏳ **Submitting sell transaction...**"
+        )
+        
+        if result['success']:
+            self._token_balance_cache.pop((chain, wallet['public_key'], token_address))
             
-            if balance is None:
-                balance = 0.0
+            # Get token symbol for button text
+            token_symbol = await self._get_trade_token_symbol(chat_id, token_address, chain)
             
-            native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
+            # Store token address and chain for quick actions
+            self._reset_trading_state(
+                chat_id,
+                chain=chain,
+                token_address=token_address,
+                token_symbol=token_symbol,
+                last_successful_action='sell'
+            )
+            logger.info(f"DEBUG: Stored token address for chat {chat_id}: {token_address}")
+            logger.info(f"DEBUG: Trading state after sell success: {self.trading_state[chat_id]}")
             
-            text = f"🟢 **Quick Buy - {chain}**\n\n"
-            text += f"🔗 **Chain:** {chain}\n"
-            text += f"💰 **Your Balance:** {balance:.6f} {native_symbol}\n"
-            text += f"📊 **Slippage:** {self.get_user_slippage(chat_id)}%\n\n"
-            text += f"🔧 **Enter the token contract address you want to buy:**"
+            # Get blockchain explorer URL based on chain
+            explorer_url = _EXPLORER_TX.get(chain, _EXPLORER_TX['ETH'])
+            tx_hash = result['tx_hash']
+            if not tx_hash.startswith('0x'):
+                tx_hash = '0x' + tx_hash
             
-            keyboard = self.create_inline_keyboard([
-                [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
-            ])
+            details = (
+                f"🔑 **Token:** `{_short_addr(token_address, 20, 0)}`\n"
+                f"🪙 **Tokens Sold:** {token_amount}\n"
+                # f"💰 **{native_symbol} Received:** Calculating...\n"
+                f"📊 **Transaction Hash:** `0x{result['tx_hash']}`\n"
+                f"⛽ **Gas Used:** {result['gas_estimate']}\n\n"
+                f"🔍 **View on Explorer:** {explorer_url}{tx_hash}"
+            )
+            text = f"📤 **Sell Transaction Submitted!**\n\n{details}\n\n⏳ Awaiting confirmation..."
+        
+            keyboard = _success_keyboard_json(chain, token_symbol)
+        else:
+            text = (
+                f"❌ **Sell Transaction Failed!**\n\n"
+                f"🔑 **Token:** `{_short_addr(token_address, 20, 0)}`\n"
+                f"🪙 **Token Amount:** {token_amount}\n"
+                f"❌ **Error:** {result['error']}\n\n"
+                f"💡 **Try again or check your token balance.**"
+            )
             
-            await self.send_message(chat_id, text, keyboard)
+            keyboard = self.create_inline_keyboard([[
+                {'text': '🔄 Try Again', 'callback_data': 'sell'},
+                {'text': '🔙 Back to Trading', 'callback_data': 'buy_sell'}
+            ]])
             
-        except Exception as e:
-            logger.error(f"Error in handle_quick_buy_from_success: {e}")
-            await self.send_message(chat_id, "❌ An error occurred. Please try again.")
-
-    async def handle_quick_sell_from_success(self, chat_id, user_id, chain):
-        """Handle quick sell from success message - auto-select chain and operation"""
+            # Clear trading state only for failed transactions
+            self.trading_state.pop(chat_id, None)
+        
+        response = await self.send_or_edit_message(chat_id, message_id, text, keyboard)
+        
+        if result['success']:
+            self._start_background_task(self._confirm_trade(
+                chat_id, self.get_message_id(response), chain, tx_hash, 'Sell', details, keyboard,
+                balance_key=(chain, wallet['public_key'], token_address)
+            ))
+    
+    # ==================== QUICK TRADING COMMANDS ====================
+    
+    async def _handle_quick_action(self, chat_id, user_id, chain, action, from_success=False):
+        """Shared flow for the quick buy/sell commands and the buttons on trade success messages"""
         try:
             # Check if user has wallet
-            if not self.firebase.user_has_wallet(user_id):
-                text = "❌ **No Wallet Found**\n\n"
-                text += "You need to create or import a wallet first.\n"
-                text += "Use the Wallet menu to get started!"
-                
-                keyboard = self.create_inline_keyboard([
-                    [{'text': '🔐 Create Wallet', 'callback_data': 'create_wallet'}],
-                    [{'text': '📥 Import Wallet', 'callback_data': 'import_wallet'}],
-                    [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
-                ])
-                await self.send_message(chat_id, text, keyboard)
-                return
-            
-            # Check if we have a stored token address from previous successful transaction
-            stored_token_address = None
-            if chat_id in self.trading_state:
-                stored_token_address = self.trading_state[chat_id].get('token_address')
-                logger.info(f"DEBUG: Found stored token address: {stored_token_address}")
-                logger.info(f"DEBUG: Current trading state: {self.trading_state[chat_id]}")
-            else:
-                logger.info(f"DEBUG: No trading state found for chat {chat_id}")
-            
-            # If we have a stored token address, use it directly
-            if stored_token_address:
-                # Set up trading state with chain, action, and token address pre-selected
-                self.trading_state[chat_id] = {
-                    'chain': chain,
-                    'action': 'sell',
-                    'token_address': stored_token_address,
-                    'from_quick_command': True
-                }
-                # Go directly to amount selection
-                await self.go_directly_to_amount_selection(chat_id, user_id, stored_token_address, chain, 'sell')
+            wallet = await self._get_user_wallet(user_id)
+            if not wallet:
+                await self.send_message(chat_id, _NO_WALLET_TEXT, _NO_WALLET_KEYBOARD_JSON)
                 return
             
-            # Set up trading state with chain and action pre-selected (no stored token address)
-            self.trading_state[chat_id] = {
-                'chain': chain,
-                'action': 'sell',
-                'from_quick_command': True
-            }
-            
-            # Get wallet info
-            wallet = self.firebase.get_user_wallet(user_id)
-            balance = self.blockchain.get_balance(chain, wallet['public_key'])
+            if from_success:
+                # Check if we have a stored token address from previous successful transaction
+                state = self.trading_state.get(chat_id)
+                stored_token_address = state.get('token_address') if state else None
+                if state:
+                    logger.info(f"DEBUG: Found stored token address: {stored_token_address}")
+                    logger.info(f"DEBUG: Current trading state: {state}")
+                else:
+                    logger.info(f"DEBUG: No trading state found for chat {chat_id}")
+                
+                # If we have a stored token address, use it directly
+                if stored_token_address:
+                    logger.info(f"DEBUG: Using stored token address: {stored_token_address}")
+                    # Set up trading state with chain, action, and token address pre-selected
+                    self._reset_trading_state(
+                        chat_id,
+                        chain=chain,
+                        action=action,
+                        token_address=stored_token_address,
+                        from_quick_command=True
+                    )
+                    # Go directly to amount selection
+                    await self.go_directly_to_amount_selection(chat_id, user_id, stored_token_address, chain, action)
+                    return
             
-            if balance is None:
-                balance = 0.0
+            # Set up trading state with chain and action pre-selected
+            self._reset_trading_state(
+                chat_id,
+                chain=chain,
+                action=action,
+                from_quick_command=True
+            )
             
-            native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
+            balance = await self._get_quick_balance(chain, wallet['public_key'])
+            native_symbol = _NATIVE_SYMBOL.get(chain, 'BNB')
+            emoji = _QUICK_ACTION_EMOJI[action] if from_success else '🚀'
             
-            text = f"🔴 **Quick Sell - {chain}**\n\n"
-            text += f"🔗 **Chain:** {chain}\n"
-            text += f"💰 **Your Balance:** {balance:.6f} {native_symbol}\n"
-            text += f"📊 **Slippage:** {self.get_user_slippage(chat_id)}%\n\n"
-            text += f"🔧 **Enter the token contract address you want to sell:**"
+            text = (
+                f"{emoji} **Quick {action.capitalize()} - {chain}**\n\n"
+                f"🔗 **Chain:** {chain}\n"
+                f"💰 **Your Balance:** {balance:.6f} {native_symbol}\n"
+                f"📊 **Slippage:** {self.get_user_slippage(chat_id)}%\n\n"
+                f"🔧 **Enter the token contract address you want to {action}:**"
+            )
             
             keyboard = self.create_inline_keyboard([
                 [{'text': '🔙 Back to Main Menu', 'callback_data': 'main_menu'}]
@@ -3076,134 +3527,113 @@ class SimpleTelegramBot:
             await self.send_message(chat_id, text, keyboard)
             
         except Exception as e:
-            logger.error(f"Error in handle_quick_sell_from_success: {e}")
+            source = 'from_success' if from_success else 'command'
+            logger.error(f"Error in handle_quick_{action}_{source}: {e}")
             await self.send_message(chat_id, "❌ An error occurred. Please try again.")
+    
+    async def _get_quick_balance(self, chain, address):
+        """Native balance for the quick trade screens, reused for a few seconds between presses"""
+        key = (chain, address)
+        balance = self._quick_balance_cache.get(key)
+        if balance is None:
+            balance = await self._run_blocking(self.blockchain.get_balance, chain, address)
+            if balance is None:
+                return 0.0
+            self._quick_balance_cache[key] = balance
+        return balance
+    
+    async def handle_quick_buy_command(self, chat_id, user_id, chain):
+        """Handle quick buy commands like /buybsc, /buyeth"""
+        await self._handle_quick_action(chat_id, user_id, chain, 'buy')
+    
+    async def handle_quick_sell_command(self, chat_id, user_id, chain):
+        """Handle quick sell commands like /sellbsc, /selleth"""
+        await self._handle_quick_action(chat_id, user_id, chain, 'sell')
+
+    async def handle_quick_buy_from_success(self, chat_id, user_id, chain):
+        """Handle quick buy from success message - auto-select chain and operation"""
+        await self._handle_quick_action(chat_id, user_id, chain, 'buy', from_success=True)
+
+    async def handle_quick_sell_from_success(self, chat_id, user_id, chain):
+        """Handle quick sell from success message - auto-select chain and operation"""
+        await self._handle_quick_action(chat_id, user_id, chain, 'sell', from_success=True)
 
     async def go_directly_to_amount_selection(self, chat_id, user_id, token_address, chain, action):
         """Go directly to amount selection with full token overview"""
         try:
             logger.info(f"DEBUG: go_directly_to_amount_selection called for {action} on {chain}")
-            # Get detailed token information using scanner
-            scan_result = await self.token_scanner.scan_token(token_address, chain)
+            # Get detailed token information using scanner, with the wallet balances alongside
+            scan_result, (wallet_balance, native_balance) = await asyncio.gather(
+                self._get_trade_scan(token_address, chain),
+                self._get_wallet_balances(user_id, chain, token_address)
+            )
             
             if scan_result and "error" not in scan_result:
                 # Format token information
                 token_name = scan_result.get('token_name', 'Unknown')
                 token_symbol = scan_result.get('token_symbol', 'Unknown')
                 price_usd = scan_result.get('price_usd', 0) or 0
-                price_change_24h = scan_result.get('price_change_24h', 0) or 0
                 liquidity_usd = scan_result.get('liquidity_usd', 0) or 0
-                volume_24h = scan_result.get('volume_24h', 0) or 0
                 fdv = scan_result.get('fdv', 0) or 0
-                transactions_24h = scan_result.get('transactions_24h', {'buys': 0, 'sells': 0})
                 
                 # Get tax information
                 buy_tax = scan_result.get('buy_tax', 0)
                 sell_tax = scan_result.get('sell_tax', 0)
                 transfer_tax = scan_result.get('transfer_tax', 0)
                 
-                # Format price change
-                if price_change_24h is not None:
-                    if abs(price_change_24h) > 1:
-                        if price_change_24h > 0:
-                            price_change_str = f"📈 +{price_change_24h:.2f}%"
-                        else:
-                            price_change_str = f"📉 {price_change_24h:.2f}%"
-                    else:
-                        if price_change_24h > 0:
-                            price_change_str = f"📈 +{price_change_24h:.2%}"
-                        else:
-                            price_change_str = f"📉 {price_change_24h:.2%}"
-                else:
-                    price_change_str = "➡️ 0.00%"
-                
-                # Format prices
-                if price_usd and price_usd < 0.000001:
-                    price_usd_str = f"${price_usd:.12f}"
-                elif price_usd and price_usd < 0.01:
-                    price_usd_str = f"${price_usd:.8f}"
-                elif price_usd and price_usd < 1:
-                    price_usd_str = f"${price_usd:.6f}"
-                elif price_usd:
-                    price_usd_str = f"${price_usd:.4f}"
-                else:
-                    price_usd_str = "$0.0000"
-                
-                # Get wallet balance
-                wallet = self.firebase.get_user_wallet(user_id)
-                wallet_balance = 0
-                native_balance = 0
-                
-                try:
-                    wallet_address = wallet['public_key']
-                    
-                    # Get token balance
-                    wallet_balance = self.trading._get_token_balance(chain, token_address, wallet_address)
-                    
-                    # Get native balance (BNB/ETH)
-                    native_balance_data = self.blockchain.get_balance(chain, wallet_address)
-                    if native_balance_data is not None:
-                        native_balance = native_balance_data
-                except Exception as e:
-                    logger.error(f"Error getting wallet balance: {e}")
+                # Format price
+                price_usd_str = _format_price_usd(price_usd)
                 
                 # Build detailed token information
-                text = f"🪙 {token_name} (${token_symbol})\n"
-                text += f"{token_address}\n"
-                text += f"V2 Pool 🔗 {chain}\n\n"
-                
-                text += f"⛽ {chain} | 0.1 GWEI  Ξ $0.0₆1\n\n"
-                
-                text += f"🧢 MC ${fdv:,.0f} | 💵 Price {price_usd_str}\n"
-                text += f"⚖️ Taxes | 🅑 {buy_tax:.1f}% 🅢 {sell_tax:.1f}% 🅣 {transfer_tax:.1f}%\n"
                 liquidity_percentage = (liquidity_usd/fdv*100) if fdv and fdv > 0 else 0
-                text += f"💧 Liquidity | ${liquidity_usd:,.0f} ({liquidity_percentage:.2f}%)\n"
-                text += f"🕓 Refresh | {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                
-                text += f"💰 Balance\n"
-                text += f" {token_symbol}   | {chain}\n"
-                text += f" {wallet_balance:.6f} | {native_balance:.6f}\n\n"
+                parts = [
+                    f"🪙 {token_name} (${token_symbol})\n",
+                    f"{token_address}\n",
+                    f"V2 Pool 🔗 {chain}\n\n",
+                    f"⛽ {chain} | 0.1 GWEI  Ξ $0.0₆1\n\n",
+                    f"🧢 MC ${fdv:,.0f} | 💵 Price {price_usd_str}\n",
+                    f"⚖️ Taxes | 🅑 {buy_tax:.1f}% 🅢 {sell_tax:.1f}% 🅣 {transfer_tax:.1f}%\n",
+                    f"💧 Liquidity | ${liquidity_usd:,.0f} ({liquidity_percentage:.2f}%)\n",
+                    f"🕓 Refresh | {_now_str()}\n\n",
+                    f"💰 Balance\n",
+                    f" {token_symbol}   | {chain}\n",
+                    f" {wallet_balance:.6f} | {native_balance:.6f}\n\n"
+                ]
                 
                 logger.info(f"DEBUG: Balance display - Token: {wallet_balance}, Native: {native_balance}")
                 
                 if fdv and fdv > 0 and liquidity_usd/fdv < 0.01:
-                    text += f"🚨 Liquidity / Total Supply < 1%\n\n"
+                    parts.append(f"🚨 Liquidity / Total Supply < 1%\n\n")
                 
                 # Get chain info for display
-                chain_info = {
-                    'ETH': {'symbol': 'ETH'},
-                    'BSC': {'symbol': 'BNB'},
-                    'SEPOLIA': {'symbol': 'ETH'}
-                }
-                chain_data = chain_info.get(chain, chain_info['BSC'])
+                chain_data = _CHAIN_INFO.get(chain, _CHAIN_INFO['BSC'])
                 
                 if action == 'buy':
-                    text += f"Enter Amount ({chain_data['symbol']}):"
+                    parts.append(f"Enter Amount ({chain_data['symbol']}):")
                     keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
                 else:  # sell
-                    text += f"Enter Amount ({token_symbol}):"
+                    parts.append(f"Enter Amount ({token_symbol}):")
                     keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
                     
-                await self.send_message(chat_id, text, keyboard)
+                await self.send_message(chat_id, "".join(parts), keyboard)
                 
             else:
                 # Fallback to simple format if scanning fails
-                chain_info = {
-                    'ETH': {'symbol': 'ETH'},
-                    'BSC': {'symbol': 'BNB'},
-                    'SEPOLIA': {'symbol': 'ETH'}
-                }
-                chain_data = chain_info.get(chain, chain_info['BSC'])
+                chain_data = _CHAIN_INFO.get(chain, _CHAIN_INFO['BSC'])
                 
                 if action == 'buy':
-                    text = f"🟢 **Quick Buy - {chain}**\n\n"
-                    text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-                    text += f"💰 **Enter Amount ({chain_data['symbol']}):**"
+                    text = (
+                        f"🟢 **Quick Buy - {chain}**\n\n"
+                        f"🔑 **Token:** `{_short_addr(token_address, 20, 0)}`\n"
+                        f"💰 **Enter Amount ({chain_data['symbol']}):**"
+                    )
                     keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
                 else:  # sell
-                    text = f"🔴 **Quick Sell - {chain}**\n\n"
-                    text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-                    text += f"💰 **Enter Amount (TOKEN):**"
+                    text = (
+                        f"🔴 **Quick Sell - {chain}**\n\n"
+                        f"🔑 **Token:** `{_short_addr(token_address, 20, 0)}`\n"
+                        f"💰 **Enter Amount (TOKEN):**"
+                    )
                     keyboard = self._create_amount_selection_keyboard(chain_data['symbol'], action, user_id)
                 
                 await self.send_message(chat_id, text, keyboard)
@@ -3213,20 +3643,52 @@ class SimpleTelegramBot:
             await self.send_message(chat_id, "❌ An error occurred. Please try again.")
     
     async def get_updates(self):
-        import aiohttp
-        
         url = f"{self.base_url}/getUpdates"
-        params = {'offset': self.offset, 'timeout': 30}
+        params = {'offset': self.offset, 'timeout': UPDATES_POLL_TIMEOUT}
+        timeout = aiohttp.ClientTimeout(total=UPDATES_TOTAL_TIMEOUT, sock_read=UPDATES_SOCK_READ_TIMEOUT)
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                return await response.json()
+        session = await self._get_http_session()
+        async with session.get(url, params=params, timeout=timeout) as response:
+            return await response.json()
     
     async def process_updates(self, updates):
-        for update in updates.get('result', []):
+        """Handle a batch of updates, running different chats concurrently"""
+        result = updates.get('result', [])
+        if not result:
+            return
+        
+        # Acknowledge the whole batch up front so a failing update isn't redelivered
+        self.offset = max(update['update_id'] for update in result) + 1
+        
+        # Updates from one chat stay in order since each can change that chat's state
+        by_chat = {}
+        for update in result:
+            by_chat.setdefault(self._update_chat_id(update), []).append(update)
+        
+        outcomes = await asyncio.gather(
+            *(self._process_chat_updates(chat_updates) for chat_updates in by_chat.values()),
+            return_exceptions=True
+        )
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Error processing updates: {outcome}")
+    
+    @staticmethod
+    def _update_chat_id(update):
+        """Chat an update belongs to, or None when it can't be told"""
+        try:
+            if 'message' in update:
+                return update['message']['chat']['id']
+            if 'callback_query' in update:
+                return update['callback_query']['message']['chat']['id']
+        except (KeyError, TypeError):
+            pass
+        return None
+    
+    async def _process_chat_updates(self, chat_updates):
+        """Handle one chat's updates sequentially"""
+        for update in chat_updates:
             try:
-                self.offset = update['update_id'] + 1
-                
                 # Handle messages
                 if 'message' in update:
                     await self._handle_message(update['message'])
@@ -3254,25 +3716,15 @@ class SimpleTelegramBot:
                 text = message['text']
                 logger.info(f"Received message from {username} ({user_id}): {text[:50]}...")
                 
-                if text == '/start':
-                    await self.handle_start_command(chat_id, user_id, username)
-                elif text == '/help':
-                    await self.handle_help(chat_id)
-                elif text == '/buybsc':
-                    await self.handle_quick_buy_command(chat_id, user_id, 'BSC')
-                elif text == '/buyeth':
-                    await self.handle_quick_buy_command(chat_id, user_id, 'ETH')
-                elif text == '/sellbsc':
-                    await self.handle_quick_sell_command(chat_id, user_id, 'BSC')
-                elif text == '/selleth':
-                    await self.handle_quick_sell_command(chat_id, user_id, 'ETH')
-                elif len(text) == 64 and text.startswith('0x'):
-                    # Handle private key input (remove 0x prefix)
-                    await self.handle_private_key_input(chat_id, user_id, text[2:])
-                elif len(text) == 64:
-                    # Handle private key input (64 characters)
-                    await self.handle_private_key_input(chat_id, user_id, text)
-                elif len(text) == 42 and text.startswith('0x'):
+                command_handler = self._command_handlers.get(text)
+                text_len = len(text)
+                key_match = _PRIVATE_KEY_RE.fullmatch(text) if text_len in (64, 66) else None
+                if command_handler:
+                    await command_handler(chat_id, user_id, username)
+                elif key_match:
+                    # Handle private key input (64 hex characters, 0x prefix removed)
+                    await self.handle_private_key_input(chat_id, user_id, key_match.group(1))
+                elif text_len == 42 and text.startswith('0x'):
                     # Handle token address input
                     await self.process_token_address(chat_id, text, user_id)
                 elif self._is_numeric_amount(text):
@@ -3316,130 +3768,94 @@ class SimpleTelegramBot:
     
     def _is_numeric_amount(self, text):
         """Check if text represents a numeric amount"""
-        try:
-            amount = float(text)
-            return 0.000001 <= amount <= 1000000
-        except ValueError:
-            return False
+        amount = _parse_amount(text)
+        return amount is not None and 0.000001 <= amount <= 1000000
     
-    async def health_check(self, request):
-        """Health check endpoint for monitoring"""
-        try:
-            from datetime import datetime
-            return web.json_response({
-                'status': 'healthy',
-                'bot_running': self.running,
-                'x_bot_running': self.x_bot_running,
-                'active_users': len(self.user_cache),
-                'trading_sessions': len(self.trading_state),
-                'timestamp': datetime.now().isoformat()
-            })
-        except Exception as e:
-            from datetime import datetime
-            return web.json_response({
-                'status': 'unhealthy',
-                'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }, status=500)
+    def _web3(self, chain):
+        """Shared Web3 client for chain, or None if the chain has no balance RPC"""
+        web3 = self._w3.get(chain)
+        if web3 is None:
+            url = _BALANCE_RPC_URLS.get(chain)
+            if url is None:
+                return None
+            web3 = Web3(Web3.HTTPProvider(url, request_kwargs={'timeout': 10}, session=requests.Session()))
+            self._w3[chain] = web3
+        return web3
     
-    async def _get_token_balance_contract_call(self, chain, wallet_address, token_address):
-        """Get ERC-20 token balance using direct contract call"""
-        try:
-            from web3 import Web3
-            from decimal import Decimal
-            
-            # Get Web3 instance for the chain
-            if chain == 'BSC':
-                web3 = Web3(Web3.HTTPProvider('https://bsc-dataseed.binance.org'))
-            elif chain == 'ETH':
-                web3 = Web3(Web3.HTTPProvider('https://mainnet.infura.io/v3/7294966a87974f75ae25d7835d2eb8bb'))
+    def _multicall_balances(self, chain, wallet_address, token_address):
+        """Raw token balance, decimals and native balance of a wallet in a single Multicall3 eth_call"""
+        web3 = self._web3(chain)
+        token = Web3.to_checksum_address(token_address)
+        wallet_arg = bytes(12) + bytes.fromhex(wallet_address[2:])  # address left-padded to 32 bytes
+        
+        # Decimals never change, so they are only requested the first time a token is seen
+        decimals_key = (chain, token)
+        decimals = self._token_decimals.get(decimals_key)
+        calls = [
+            (token, True, _BALANCE_OF_SELECTOR + wallet_arg),
+            (MULTICALL3_ADDRESS, True, _GET_ETH_BALANCE_SELECTOR + wallet_arg),
+        ]
+        if decimals is None:
+            calls.append((token, True, _DECIMALS_SELECTOR))
+        
+        data = _AGGREGATE3_SELECTOR + abi_encode(['(address,bool,bytes)[]'], [calls])
+        (results,) = abi_decode(['(bool,bytes)[]'], web3.eth.call({'to': MULTICALL3_ADDRESS, 'data': data}))
+        values = [int.from_bytes(ret, 'big') if success and ret else None for success, ret in results]
+        
+        if decimals is None:
+            decimals = values[2]
+            if decimals is None:
+                logger.warning(f"Could not get decimals for {token}, using default 18")
+                decimals = 18  # Default for most tokens
             else:
-                logger.error(f"Unsupported chain: {chain}")
-                return 0
-            
-            if not web3.is_connected():
-                logger.error(f"Failed to connect to {chain} network")
-                return 0
-            
-            # ERC-20 balanceOf function signature
-            balance_of_signature = "0x70a08231"  # balanceOf(address)
-            
-            # Encode the function call - pad wallet address to 32 bytes
-            wallet_address_padded = wallet_address[2:].lower().zfill(64)  # Remove 0x and pad to 64 chars
-            encoded_data = balance_of_signature + wallet_address_padded
-            
-            logger.info(f"Making contract call to {token_address} with data: {encoded_data}")
-            
-            # Make the contract call
-            result = web3.eth.call({
-                'to': token_address,
-                'data': encoded_data
-            })
-            
-            if result:
-                # Decode the result (32 bytes = 256 bits)
-                balance = int.from_bytes(result, byteorder='big')
-                logger.info(f"Raw balance from contract: {balance}")
-                
-                # Get token decimals (try to get from contract, fallback to 18)
-                try:
-                    decimals_signature = "0x313ce567"  # decimals()
-                    decimals_result = web3.eth.call({
-                        'to': token_address,
-                        'data': decimals_signature
-                    })
-                    decimals = int.from_bytes(decimals_result, byteorder='big')
-                    logger.info(f"Token decimals: {decimals}")
-                except Exception as e:
-                    logger.warning(f"Could not get decimals, using default 18: {e}")
-                    decimals = 18  # Default for most tokens
-                
-                # Convert to decimal with proper decimals
-                balance_decimal = Decimal(balance) / Decimal(10 ** decimals)
-                final_balance = float(balance_decimal)
-                logger.info(f"Final token balance: {final_balance}")
-                return final_balance
-            
-            return 0
-            
-        except Exception as e:
-            logger.error(f"Error getting token balance via contract call: {e}")
-            return 0
+                self._token_decimals[decimals_key] = decimals
+        return values[0] or 0, decimals, values[1] or 0
     
-    async def _get_native_balance_contract_call(self, chain, wallet_address):
-        """Get native balance using direct Web3 call"""
+    async def _get_contract_balances(self, chain, wallet_address, token_address):
+        """Get (token balance, native balance) of a wallet using one batched contract call"""
         try:
-            from web3 import Web3
-            from decimal import Decimal
-            
-            # Get Web3 instance for the chain
-            if chain == 'BSC':
-                web3 = Web3(Web3.HTTPProvider('https://bsc-dataseed.binance.org'))
-            elif chain == 'ETH':
-                web3 = Web3(Web3.HTTPProvider('https://mainnet.infura.io/v3/7294966a87974f75ae25d7835d2eb8bb'))
-            else:
+            if self._web3(chain) is None:
                 logger.error(f"Unsupported chain: {chain}")
-                return 0
-            
-            if not web3.is_connected():
-                logger.error(f"Failed to connect to {chain} network")
-                return 0
+                return 0, 0
             
-            logger.info(f"Getting native balance for {wallet_address} on {chain}")
-            
-            # Get native balance in wei
-            balance_wei = web3.eth.get_balance(wallet_address)
-            logger.info(f"Raw native balance (wei): {balance_wei}")
+            try:
+                balance, decimals, balance_wei = await self._run_blocking(
+                    self._multicall_balances, chain, wallet_address, token_address
+                )
+            except Exception as e:
+                # No usable Multicall3 on this RPC; fall back to a plain JSON-RPC batch
+                logger.warning(f"Multicall balance read failed on {chain}, using JSON-RPC batch: {e}")
+                token_balance, native_balance = await self._run_blocking(
+                    self.blockchain.batch_get_balances, chain, token_address, wallet_address
+                )
+                return token_balance, native_balance or 0
+            logger.info(f"Raw balances for {wallet_address} on {chain}: token={balance} (decimals {decimals}), native={balance_wei}")
             
-            # Convert to decimal (18 decimals for both ETH and BNB)
-            balance_decimal = Decimal(balance_wei) / Decimal(10 ** 18)
-            final_balance = float(balance_decimal)
-            logger.info(f"Final native balance: {final_balance}")
-            return final_balance
+            # Scale by the token decimals (18 for both ETH and BNB); int / int true division
+            # is correctly rounded to the nearest float, so Decimal isn't needed
+            token_balance = balance / 10 ** decimals
+            native_balance = balance_wei / 10 ** 18
+            return token_balance, native_balance
             
         except Exception as e:
-            logger.error(f"Error getting native balance via contract call: {e}")
-            return 0
+            logger.error(f"Error getting balances via contract call: {e}")
+            return 0, 0
+    
+    async def _get_token_balance_contract_call(self, chain, wallet_address, token_address):
+        """Get ERC-20 token balance using direct contract call"""
+        token_balance, _ = await self._get_contract_balances(chain, wallet_address, token_address)
+        return token_balance
+    
+    async def _get_cached_token_balance(self, chain, wallet_address, token_address):
+        """Token balance for the sell percentage buttons, reused for a few seconds between presses"""
+        key = (chain, wallet_address, token_address)
+        token_balance = self._token_balance_cache.get(key)
+        if token_balance is None:
+            token_balance = await self._get_token_balance_contract_call(chain, wallet_address, token_address)
+            # Zero may be a failed lookup, so only real balances are kept
+            if token_balance > 0:
+                self._token_balance_cache[key] = token_balance
+        return token_balance
     
     async def run_bot(self):
         if not self.bot_token:
@@ -3457,6 +3873,7 @@ class SimpleTelegramBot:
             logger.warning("⚠️ X Bot credentials not configured - X bot will not start")
         
         self.running = True
+        self._sweep_task = asyncio.create_task(self._sweep_expired_state())
         
         while self.running:
             try:
@@ -3469,8 +3886,6 @@ class SimpleTelegramBot:
                     # If API error, wait longer before retrying
                     await asyncio.sleep(10)
                 
-                await asyncio.sleep(1)
-                
             except KeyboardInterrupt:
                 logger.info("Bot stopped by user")
                 self.running = False
@@ -3481,6 +3896,44 @@ class SimpleTelegramBot:
                 logger.info("Bot will continue running after error...")
                 await asyncio.sleep(5)
     
+    async def _sweep_expired_state(self):
+        """Periodically drop expired scan results and scan cache entries"""
+        while self.running:
+            await asyncio.sleep(STATE_SWEEP_INTERVAL)
+            try:
+                removed = self.last_scan_results.purge_expired()
+                self._quick_balance_cache.purge_expired()
+                self._token_balance_cache.purge_expired()
+                self._private_key_cache.purge_expired()
+                self._x_user_cache.purge_expired()
+                # Entries have different lifetimes, so the LRU order says nothing about expiry
+                now = time.monotonic()
+                expired = [key for key, (ts, lifetime, _) in self._scan_cache.items() if now - ts >= lifetime]
+                for key in expired:
+                    del self._scan_cache[key]
+                if removed:
+                    logger.info(f"🧹 Dropped {removed} expired scan results")
+            except Exception as e:
+                logger.error(f"Error sweeping expired state: {e}")
+    
+    async def close(self):
+        """Release pooled HTTP connections and worker threads held by the bot"""
+        if self._sweep_task and not self._sweep_task.done():
+            self._sweep_task.cancel()
+        for task in list(self._background_tasks):
+            task.cancel()
+        try:
+            await self.token_scanner.close()
+        except Exception as e:
+            logger.error(f"Error closing token scanner session: {e}")
+        try:
+            await self.positions_manager.close()
+        except Exception as e:
+            logger.error(f"Error closing positions manager session: {e}")
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._io_pool.shutdown(wait=False)
+    
     # X Bot Methods
     async def start_x_bot(self):
         """Start the X bot to monitor tweets"""
@@ -3528,6 +3981,7 @@ class SimpleTelegramBot:
     async def monitor_x_tweets(self):
         """Monitor tweets mentioning @TweetFets"""
         logger.info("🔍 Monitoring tweets for @TweetFets mentions...")
+        empty_polls = 0
         
         while self.x_bot_running:
             try:
@@ -3536,13 +3990,18 @@ class SimpleTelegramBot:
                 
                 if tweets:
                     logger.info(f"📱 Found {len(tweets)} tweets mentioning @TweetFets")
-                    for tweet in tweets:
+                    empty_polls = 0
+                    # Oldest first: each processed tweet advances last_processed_tweet_id,
+                    # which would otherwise make the older ones in the batch look processed
+                    for tweet in sorted(tweets, key=_tweet_id_key):
                         if await self.should_process_tweet(tweet):
                             await self.process_tweetfets_tweet(tweet)
                 else:
                     logger.debug("🔍 No tweets found mentioning @TweetFets")
+                    empty_polls += 1
                 
-                await asyncio.sleep(30)  # Check every 30 seconds
+                # Check every 30 seconds, doubling the wait after each empty poll up to 5 minutes
+                await asyncio.sleep(min(X_POLL_INTERVAL * 2 ** min(empty_polls, 4), X_POLL_MAX_INTERVAL))
                 
             except Exception as e:
                 logger.error(f"Error monitoring X tweets: {e}")
@@ -3558,7 +4017,7 @@ class SimpleTelegramBot:
             
             if tweets:
                 # Get the most recent tweet ID (highest ID number)
-                latest_tweet = max(tweets, key=lambda x: int(x['id']))
+                latest_tweet = max(tweets, key=_tweet_id_key)
                 self.last_processed_tweet_id = latest_tweet['id']
                 logger.info(f"✅ Initialized last tweet ID: {self.last_processed_tweet_id}")
                 logger.info(f"📱 Bot will now only process tweets newer than this ID")
@@ -3573,8 +4032,6 @@ class SimpleTelegramBot:
     async def get_tweets_mentioning_tweetfets(self):
         """Get recent tweets mentioning @TweetFets"""
         try:
-            import aiohttp
-            
             # Twitter API v2 endpoint for recent tweets
             url = "https://api.twitter.com/2/tweets/search/recent"
             headers = {
@@ -3583,7 +4040,7 @@ class SimpleTelegramBot:
             }
             params = {
                 'query': '@TweetFets',
-                'max_results': 10,
+                'max_results': 100,  # API maximum, so one poll covers a whole backed-off interval
                 'tweet.fields': 'author_id,created_at,text'
             }
             
@@ -3594,46 +4051,49 @@ class SimpleTelegramBot:
             else:
                 logger.info(f"🔍 Fetching recent tweets (first run)")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('data', [])
-                    else:
-                        logger.error(f"Twitter API error: {response.status}")
-                        return []
+            session = await self._get_http_session()
+            async with session.get(url, headers=headers, params=params) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data.get('data', [])
+                else:
+                    logger.error(f"Twitter API error: {response.status}")
+                    return []
                         
         except Exception as e:
             logger.error(f"Error getting tweets: {e}")
             return []
     
     async def should_process_tweet(self, tweet):
-        """Check if tweet should be processed"""
+        """Check if tweet should be processed; returns its parsed command, or None to skip it"""
         tweet_id = tweet.get('id')
         
         # Skip if already processed
-        if self.last_processed_tweet_id and tweet_id <= self.last_processed_tweet_id:
+        if self.last_processed_tweet_id and _tweet_id_order(tweet_id) <= _tweet_id_order(self.last_processed_tweet_id):
             logger.debug(f"⏭️ Skipping old tweet {tweet_id} (last processed: {self.last_processed_tweet_id})")
-            return False
+            return None
         
         # Check if tweet mentions @TweetFets and has command format
         text = tweet.get('text', '')
-        if '@TweetFets' in text and self.parse_tweetfets_command(text):
-            logger.info(f"✅ New tweet {tweet_id} ready for processing")
-            return True
+        if '@TweetFets' in text:
+            command = self.parse_tweetfets_command(text)
+            if command['valid']:
+                logger.info(f"✅ New tweet {tweet_id} ready for processing")
+                # Kept on the tweet so process_tweetfets_tweet doesn't parse it again
+                tweet['_cmd'] = command
+                return command
         
         logger.debug(f"⏭️ Skipping tweet {tweet_id} (no @TweetFets mention or invalid command)")
-        return False
+        return None
     
     def parse_tweetfets_command(self, tweet_text):
         """Parse @TweetFets command from tweet text"""
         # Check for help command first
-        if re.search(r'@TweetFets\s+help', tweet_text, re.IGNORECASE):
+        if _TWEET_HELP_RE.search(tweet_text):
             return {'action': 'help', 'valid': True}
         
         # Check for scan command: @TweetFets SCAN contract_address BSC/ETH/SEPOLIA
-        scan_pattern = r'@TweetFets\s+SCAN\s+(0x[a-fA-F0-9]{40})\s+(BSC|ETH|SEPOLIA)'
-        scan_match = re.search(scan_pattern, tweet_text, re.IGNORECASE)
+        scan_match = _TWEET_SCAN_RE.search(tweet_text)
         
         if scan_match:
             contract_address = scan_match.group(1)
@@ -3652,8 +4112,7 @@ class SimpleTelegramBot:
         # or: @TweetFets Buy/Sell contract_address amount BSC/ETH/SEPOLIA (alternative format)
         
         # Pattern 1: amount first, then contract_address (original format)
-        pattern1 = r'@TweetFets\s+(Buy|Sell)\s+([0-9.]+)\s+(0x[a-fA-F0-9]{40})(?:\s+([A-Z-]+))?'
-        match1 = re.search(pattern1, tweet_text)
+        match1 = _TWEET_AMOUNT_FIRST_RE.search(tweet_text)
         
         if match1:
             action = match1.group(1).lower()  # buy or sell
@@ -3674,8 +4133,7 @@ class SimpleTelegramBot:
             }
         
         # Pattern 2: contract_address first, then amount (alternative format)
-        pattern2 = r'@TweetFets\s+(Buy|Sell)\s+(0x[a-fA-F0-9]{40})\s+([0-9.]+)(?:\s+([A-Z-]+))?'
-        match2 = re.search(pattern2, tweet_text)
+        match2 = _TWEET_ADDRESS_FIRST_RE.search(tweet_text)
         
         if match2:
             action = match2.group(1).lower()  # buy or sell
@@ -3703,8 +4161,8 @@ class SimpleTelegramBot:
             text = tweet.get('text', '')
             author_id = tweet.get('author_id')
             
-            # Parse command
-            command = self.parse_tweetfets_command(text)
+            # Parse command, unless should_process_tweet already did
+            command = tweet.get('_cmd') or self.parse_tweetfets_command(text)
             if not command['valid']:
                 logger.info(f"Invalid @TweetFets command: {text}")
                 return
@@ -3731,24 +4189,15 @@ class SimpleTelegramBot:
             tx_result = await self.execute_tweetfets_transaction(user_data, command)
             
             if tx_result['success']:
-                # Reply with success and transaction hash
-                reply_text = f"✅ Transaction executed successfully!\n\n"
-                # Get the correct token symbol based on chain
-                if command['chain'] == 'ETH':
-                    token_symbol = 'ETH'
-                elif command['chain'] == 'BSC':
-                    token_symbol = 'BNB'
-                
-                reply_text += f"💰 **Amount:** {command['amount']} {token_symbol}\n"
-                reply_text += f"⛓️ **Chain:** {command['chain']}\n"
-                reply_text += f"📊 **Status:** {tx_result['status']}\n"
-                # Get the correct blockchain explorer URL based on chain
-                if command['chain'] == 'ETH':
-                    explorer_url = f"https://etherscan.io/tx/{tx_result['tx_hash']}"
-                elif command['chain'] == 'BSC':
-                    explorer_url = f"https://bscscan.com/tx/{tx_result['tx_hash']}"
-                
-                reply_text += f"🔗 **TX Hash:** {explorer_url}"
+                # Reply with success and transaction hash, using the chain's native symbol and explorer
+                chain = command['chain']
+                reply_text = (
+                    f"✅ Transaction executed successfully!\n\n"
+                    f"💰 **Amount:** {command['amount']} {_NATIVE_SYMBOL[chain]}\n"
+                    f"⛓️ **Chain:** {chain}\n"
+                    f"📊 **Status:** {tx_result['status']}\n"
+                    f"🔗 **TX Hash:** {_EXPLORER_TX[chain]}{tx_result['tx_hash']}"
+                )
                 
                 await self.reply_to_tweet(tweet['id'], reply_text)
             else:
@@ -3756,9 +4205,7 @@ class SimpleTelegramBot:
                 await self.reply_to_tweet(tweet['id'], f"❌ Transaction failed: {tx_result['error']}")
             
             # Update last processed tweet ID
-            old_id = self.last_processed_tweet_id
-            self.last_processed_tweet_id = tweet['id']
-            logger.info(f"✅ Updated last processed tweet ID: {old_id} → {self.last_processed_tweet_id}")
+            self._advance_last_tweet(tweet['id'])
             
         except Exception as e:
             logger.error(f"Error processing @TweetFets tweet: {e}")
@@ -3767,29 +4214,26 @@ class SimpleTelegramBot:
     async def get_user_by_x_id(self, x_user_id):
         """Get user data from database using X user ID"""
         try:
-            # Query Firestore for user with matching X ID
-            # We need to search through the twitter_auth collection to find users
-            # who have authenticated with this X account
-            
-            # Get all documents from twitter_auth collection
-            twitter_auth_refs = self.firebase.db.collection('twitter_auth').stream()
-            
-            for doc in twitter_auth_refs:
-                auth_data = doc.to_dict()
-                # Check if this auth data has the matching X user ID
-                if auth_data.get('twitterId') == str(x_user_id):
-                    # Found matching user
-                    user_id = int(auth_data.get('userId'))
-                    
-                    # Get user's wallet and other data
-                    wallet = self.firebase.get_user_wallet(user_id)
-                    if wallet:
-                        return {
-                            'user_id': user_id,
-                            'twitter_id': x_user_id,
-                            'twitter_username': auth_data.get('twitterUsername'),
-                            'wallet': wallet
-                        }
+            # Find the twitter_auth document linked to this X account
+            key = str(x_user_id)
+            auth_data = self._x_user_cache.get(key)
+            if auth_data is None:
+                auth_data = await self._run_blocking(self.firebase.get_twitter_auth_by_twitter_id, key)
+                if auth_data:
+                    self._x_user_cache[key] = auth_data
+            
+            if auth_data:
+                user_id = int(auth_data.get('userId'))
+                
+                # Get user's wallet and other data
+                wallet = await self._get_user_wallet(user_id)
+                if wallet:
+                    return {
+                        'user_id': user_id,
+                        'twitter_id': x_user_id,
+                        'twitter_username': auth_data.get('twitterUsername'),
+                        'wallet': wallet
+                    }
             
             logger.info(f"No user found with X ID: {x_user_id}")
             return None
@@ -3807,12 +4251,12 @@ class SimpleTelegramBot:
             contract_address = command['contract_address']
             
             # Get user's wallet
-            wallet = self.firebase.get_user_wallet(user_id)
+            wallet = await self._get_user_wallet(user_id)
             if not wallet:
                 return {'success': False, 'error': 'No wallet found'}
             
             # Get private key
-            private_key = self.firebase.get_private_key(user_id)
+            private_key = await self._get_private_key(user_id)
             if not private_key:
                 return {'success': False, 'error': 'Private key not accessible'}
             
@@ -3855,8 +4299,6 @@ class SimpleTelegramBot:
     async def reply_to_tweet(self, tweet_id, text):
         """Reply to a tweet using the external API with fallback"""
         try:
-            import aiohttp
-            
             # Use the external API endpoint for replying
             url = "https://x-reply-bot.vercel.app/api/tweets/reply"
             
@@ -3872,22 +4314,23 @@ class SimpleTelegramBot:
             
             logger.info(f"📝 Attempting to reply to tweet {tweet_id}: {text}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        response_data = await response.json()
-                        logger.info(f"✅ Successfully replied to tweet {tweet_id}")
-                        logger.info(f"📝 Reply response: {response_data}")
-                        return True
-                    else:
-                        response_text = await response.text()
-                        logger.error(f"❌ External API reply failed: {response.status}")
-                        logger.error(f"Response: {response_text}")
-                        
-                        # Fallback: Log the reply locally
-                        logger.info(f"📝 FALLBACK: Would reply to tweet {tweet_id}: {text}")
-                        logger.info(f"💡 External API failed, but transaction was processed successfully")
-                        return True  # Return True to continue processing
+            session = await self._get_http_session()
+            timeout = aiohttp.ClientTimeout(total=TWEET_REPLY_TIMEOUT)
+            async with session.post(url, headers=headers, json=payload, timeout=timeout) as response:
+                if response.status == 200:
+                    response_data = await response.json()
+                    logger.info(f"✅ Successfully replied to tweet {tweet_id}")
+                    logger.info(f"📝 Reply response: {response_data}")
+                    return True
+                else:
+                    response_text = await response.text()
+                    logger.error(f"❌ External API reply failed: {response.status}")
+                    logger.error(f"Response: {response_text}")
+                    
+                    # Fallback: Log the reply locally
+                    logger.info(f"📝 FALLBACK: Would reply to tweet {tweet_id}: {text}")
+                    logger.info(f"💡 External API failed, but transaction was processed successfully")
+                    return True  # Return True to continue processing
                         
         except Exception as e:
             logger.error(f"Error replying to tweet: {e}")
@@ -3898,66 +4341,47 @@ class SimpleTelegramBot:
     async def handle_tweetfets_help(self, tweet):
         """Handle @TweetFets help command"""
         try:
-            help_text = "🐦 @TweetFets Bot Commands:\n\n"
-            help_text += "Buy: @TweetFets Buy 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01\n"
-            help_text += "Sell: @TweetFets Sell 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01\n"
-            help_text += "Alternative: @TweetFets Buy 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01\n"
-            help_text += "With Chain: @TweetFets Buy 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01 BSC/ETH/SEPOLIA\n"
-            help_text += "Or: @TweetFets Buy 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 0.01 ETH\n"
-            help_text += "Scan: @TweetFets SCAN 0xf4A509313437dfC64E2EFeD14e2b607B1AED30c5 BSC/ETH/SEPOLIA\n\n"
-            help_text += "Chains: BSC (default), ETH, SEPOLIA\n"
-            help_text += "⚠️ Authenticate first via Telegram bot!"
-            
-            await self.reply_to_tweet(tweet['id'], help_text)
+            await self.reply_to_tweet(tweet['id'], _TWEETFETS_HELP_TEXT)
             
         except Exception as e:
             logger.error(f"Error handling help command: {e}")
     
+    def _advance_last_tweet(self, new_id, note=""):
+        """Record new_id as the last processed tweet"""
+        old_id = self.last_processed_tweet_id
+        self.last_processed_tweet_id = new_id
+        logger.info("✅ Updated last processed tweet ID%s: %s → %s", note, old_id, new_id)
+    
     async def handle_tweetfets_scan(self, tweet, command):
         """Handle @TweetFets scan command"""
+        note = ""
         try:
             contract_address = command['contract_address']
+            # Chain names from the tweet parser already match the token scanner's
             chain = command['chain']
             
-            # Map chain names for token scanner compatibility
-            chain_mapping = {
-                'BSC': 'BSC',
-                'ETH': 'ETH'
-            }
-            
-            mapped_chain = chain_mapping.get(chain, chain)
-            
             # Scan the token directly without showing scanning status
-            result = await self.token_scanner.scan_token(contract_address, mapped_chain)
+            result = await self.token_scanner.scan_token(contract_address, chain)
             
             if result and "error" not in result:
                 # Format and display the result using compact format for Twitter
-                formatted_result = self.token_scanner.format_scan_result(result, compact=True)
-                
-                await self.reply_to_tweet(tweet['id'], formatted_result)
-                
+                reply_text = self.token_scanner.format_scan_result(result, compact=True)
             else:
-                error_text = f"❌ **Token Scan Failed**\n\n"
+                reply_text = f"❌ **Token Scan Failed**\n\n"
                 if result and "error" in result:
-                    error_text += f"**Error:** {result['error']}"
+                    reply_text += f"**Error:** {result['error']}"
                 else:
-                    error_text += f"**Error:** Failed to scan token"
-                
-                await self.reply_to_tweet(tweet['id'], error_text)
-            
-            # Update last processed tweet ID after successful scan
-            old_id = self.last_processed_tweet_id
-            self.last_processed_tweet_id = tweet['id']
-            logger.info(f"✅ Updated last processed tweet ID: {old_id} → {self.last_processed_tweet_id}")
+                    reply_text += f"**Error:** Failed to scan token"
                 
         except Exception as e:
             logger.error(f"Error handling scan command: {e}")
-            await self.reply_to_tweet(tweet['id'], f"❌ Error scanning token: {str(e)}")
-            
-            # Update last processed tweet ID even on error to avoid reprocessing
-            old_id = self.last_processed_tweet_id
-            self.last_processed_tweet_id = tweet['id']
-            logger.info(f"✅ Updated last processed tweet ID (error case): {old_id} → {self.last_processed_tweet_id}")
+            reply_text = f"❌ Error scanning token: {str(e)}"
+            note = " (error case)"
+        
+        # reply_to_tweet never raises, so both outcomes share one reply and one
+        # update of the last processed tweet ID (also on error, to avoid reprocessing)
+        await self.reply_to_tweet(tweet['id'], reply_text)
+        self._advance_last_tweet(tweet['id'], note)
     
     async def check_user_balance(self, user_data, chain):
         """Check user's balance for the specified chain"""
@@ -3974,41 +4398,15 @@ class SimpleTelegramBot:
         try:
             status = self.get_x_bot_status()
             
-            if status['configured']:
-                text = f"🐦 **X Bot Status:** {status['status']}\n\n"
-                text += f"📱 **Status:** {status['message']}\n"
-                text += f"🔧 **Configuration:** ✅ Configured\n"
-                
-                if status['running']:
-                    text += f"🟢 **Status:** Running and monitoring tweets\n"
-                    text += f"📊 **Monitoring:** @TweetFets mentions\n"
-                    text += f"⏱️ **Check Interval:** Every 30 seconds\n"
-                    text += f"🆔 **Last Processed Tweet ID:** {self.last_processed_tweet_id or 'None'}\n"
-                    text += f"🌐 **Reply API:** {status.get('external_api', 'Unknown')}"
-                else:
-                    text += f"🔴 **Status:** Stopped\n"
-                    text += f"💡 **Action:** Bot will start automatically when credentials are added"
-            else:
-                text = f"🐦 **X Bot Status:** {status['status']}\n\n"
-                text += f"❌ **Configuration:** Not configured\n"
-                text += f"💡 **To enable:** Add Twitter API credentials to .env file\n\n"
-                text += f"**Required credentials:**\n"
-                text += f"• X_BEARER_TOKEN\n"
-                text += f"• X_API_KEY\n"
-                text += f"• X_API_SECRET\n"
-                text += f"• X_ACCESS_TOKEN\n"
-                text += f"• X_ACCESS_TOKEN_SECRET"
-            
-            keyboard = self.create_inline_keyboard([
-                [
-                    {'text': '🔄 Reset Tweet ID', 'callback_data': 'reset_tweet_id'}
-                ],
-                [
-                    {'text': '🔙 Back to Main', 'callback_data': 'main_menu'}
-                ]
-            ])
+            template = _X_BOT_STATUS_TMPL[(status['configured'], status['configured'] and status['running'])]
+            text = template.format(
+                status=status['status'],
+                message=status['message'],
+                last_tweet_id=self.last_processed_tweet_id or 'None',
+                external_api=status.get('external_api', 'Unknown')
+            )
             
-            await self.send_message(chat_id, text, keyboard)
+            await self.send_message(chat_id, text, _X_BOT_STATUS_KEYBOARD_JSON)
             
         except Exception as e:
             logger.error(f"Error showing X bot status: {e}")
@@ -4020,17 +4418,9 @@ class SimpleTelegramBot:
             old_id = self.last_processed_tweet_id
             self.last_processed_tweet_id = None
             
-            text = "🔄 **Tweet ID Reset Successfully!**\n\n"
-            text += f"✅ **Last processed tweet ID has been reset**\n"
-            text += f"🆔 **Previous ID:** {old_id or 'None'}\n"
-            text += f"📱 **Next run will process all recent tweets**\n"
-            text += f"⚠️ **Note:** This will cause the bot to process tweets from the beginning"
-            
-            keyboard = self.create_inline_keyboard([[
-                {'text': '🔙 Back to Main', 'callback_data': 'main_menu'}
-            ]])
+            text = _RESET_TWEET_ID_TEXT.format(old_id=old_id or 'None')
             
-            await self.send_message(chat_id, text, keyboard)
+            await self.send_message(chat_id, text, _BACK_TO_MAIN_KEYBOARD_JSON)
             
         except Exception as e:
             logger.error(f"Error resetting tweet ID: {e}")
@@ -4039,30 +4429,35 @@ class SimpleTelegramBot:
     async def health_check(self, request):
         """Health check endpoint for Fly.io"""
         try:
-            from datetime import datetime
-            status = {
-                'status': 'healthy',
-                'timestamp': datetime.now().isoformat(),
-                'bot_running': self.running,
-                'x_bot_running': self.x_bot_running,
-                'components_initialized': hasattr(self, 'firebase') and hasattr(self, 'trading'),
-                'last_tweet_id': self.last_processed_tweet_id
-            }
-            return web.json_response(status)
+            # Probes within the same second and state reuse the encoded body
+            components_initialized = hasattr(self, 'firebase') and hasattr(self, 'trading')
+            key = (int(time.time()), self.running, self.x_bot_running,
+                   components_initialized, self.last_processed_tweet_id)
+            cached_key, body = self._health_cache
+            if cached_key != key:
+                body = _json_bytes({
+                    'status': 'healthy',
+                    'timestamp': _now_iso(),
+                    'bot_running': self.running,
+                    'x_bot_running': self.x_bot_running,
+                    'components_initialized': components_initialized,
+                    'last_tweet_id': self.last_processed_tweet_id
+                })
+                self._health_cache = (key, body)
+            return web.Response(body=body, content_type='application/json')
         except Exception as e:
-            from datetime import datetime
-            return web.json_response({
+            body = _json_bytes({
                 'status': 'unhealthy',
                 'error': str(e),
-                'timestamp': datetime.now().isoformat()
-            }, status=500)
+                'timestamp': _now_iso()
+            })
+            return web.Response(body=body, status=500, content_type='application/json')
 
     async def handle_quick_amount_selection(self, chat_id, user_id, amount):
         """Handle quick amount button selection"""
         try:
             # Store the selected amount in trading state
-            if chat_id not in self.trading_state:
-                self.trading_state[chat_id] = {}
+            state = self.trading_state.setdefault(chat_id, {})
             
             # Convert amount to float with error handling
             try:
@@ -4071,13 +4466,13 @@ class SimpleTelegramBot:
                 await self.send_message(chat_id, f"❌ Invalid amount format: {amount}")
                 return
             
-            self.trading_state[chat_id]['amount'] = amount_float
-            self.trading_state[chat_id]['user_id'] = user_id
+            state['amount'] = amount_float
+            state['user_id'] = user_id
             
             # Get current trading state
-            action = self.trading_state[chat_id].get('action', 'buy')
-            token_address = self.trading_state[chat_id].get('token') or self.trading_state[chat_id].get('token_address')
-            chain = self.trading_state[chat_id].get('chain', 'BSC')
+            action = state.get('action', 'buy')
+            token_address = state.get('token_address')
+            chain = state.get('chain', 'BSC')
             
             if not token_address:
                 await self.send_message(chat_id, "❌ No token address found. Please start over.")
@@ -4096,51 +4491,24 @@ class SimpleTelegramBot:
             price_per_token = bnb_amount / token_amount if token_amount > 0 else 0
             
             # Show detailed transaction overview (matching custom amount format)
-            if action == 'buy':
-                text = f"🟢 **BUY TRANSACTION OVERVIEW**\n\n"
-            else:
-                text = f"🔴 **SELL TRANSACTION OVERVIEW**\n\n"
-            
-            text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-            text += f"🌐 Network: {chain_data['name']}\n"
-            text += f"🔄 **DEX:** {chain_data['dex']}\n\n"
-            
-            text += f"💰 **Transaction Details:**\n"
-            native_symbol = 'ETH' if chain == 'ETH' else 'BNB'
-            text += f"• **{native_symbol} Amount:** {bnb_amount:.6f} {native_symbol}\n"
-            text += f"• **Estimated Gas:** {gas_estimate:.6f} {native_symbol}\n"
-            text += f"• **Total Cost:** {total_bnb:.6f} {native_symbol}\n\n"
-            
-            if action == 'buy':
-                text += f"🪙 **Token Details:**\n"
-                text += f"• **Tokens to Receive:** {token_amount:.6f}\n"
-                text += f"• **Price per Token:** {price_per_token:.8f} {native_symbol}\n"
-                text += f"• **Slippage:** {self.get_user_slippage(user_id)}%\n\n"
-            else:
-                text += f"🪙 **Token Details:**\n"
-                estimated_native = token_amount * price_per_token
-                net_native = estimated_native - gas_estimate
-                text += f"• **Token Amount:** {token_amount:.2f}\n"
-                text += f"• **Estimated {native_symbol}:** {estimated_native:.6f} {native_symbol}\n"
-                text += f"• **Gas Fee:** {gas_estimate:.6f} {native_symbol}\n"
-                text += f"• **Net {native_symbol}:** {net_native:.6f} {native_symbol}\n\n"
-                text += f"💰 **Price Details:**\n"
-                text += f"• **Price per Token:** {price_per_token:.8f} {native_symbol}\n"
-                text += f"• **Slippage:** {self.get_user_slippage(user_id)}%\n\n"
-            
-            text += f"📊 **Price Impact:** Low\n"
-            text += f"⏱️ **Estimated Time:** 30-60 seconds\n\n"
-            text += f"⚠️ **Please review the details above.**\n"
-            text += f"Click 'Confirm {'Buy' if action == 'buy' else 'Sell'}' to proceed with the transaction."
-            
-            keyboard = self.create_inline_keyboard([
-                [
-                    {'text': f'✅ Confirm {"Buy" if action == "buy" else "Sell"}', 'callback_data': f'confirm_{action}'},
-                    {'text': '❌ Cancel', 'callback_data': 'buy_sell'}
-                ]
-            ])
+            template = _BUY_OVERVIEW_TMPL if action == 'buy' else _QUICK_SELL_OVERVIEW_TMPL
+            estimated_native = token_amount * price_per_token
+            text = template.format(
+                addr=token_address[:20],
+                chain_name=chain_data['name'],
+                dex=chain_data['dex'],
+                native=_NATIVE_SYMBOL.get(chain, 'BNB'),
+                bnb_amount=bnb_amount,
+                gas=gas_estimate,
+                total=total_bnb,
+                tokens=token_amount,
+                estimated=estimated_native,
+                net=estimated_native - gas_estimate,
+                price=price_per_token,
+                slip=self.get_user_slippage(user_id)
+            )
             
-            await self.send_message(chat_id, text, keyboard)
+            await self.send_message(chat_id, text, _CONFIRM_KEYBOARD_JSON['buy' if action == 'buy' else 'sell'])
             
         except Exception as e:
             logger.error(f"Error handling quick amount selection: {e}")
@@ -4150,26 +4518,18 @@ class SimpleTelegramBot:
         """Handle custom amount button selection"""
         try:
             # Store user_id in trading state
-            if chat_id not in self.trading_state:
-                self.trading_state[chat_id] = {}
+            state = self.trading_state.setdefault(chat_id, {})
             
-            self.trading_state[chat_id]['user_id'] = user_id
+            state['user_id'] = user_id
             
             # Get current trading state
-            action = self.trading_state[chat_id].get('action', 'buy')
-            chain = self.trading_state[chat_id].get('chain', 'BSC')
+            action = state.get('action', 'buy')
+            chain = state.get('chain', 'BSC')
             chain_data = self.get_chain_data(chain)
             
-            text = f"💰 Enter Custom Amount\n\n"
-            text += f"🌐 Network: {chain_data['name']}\n"
-            text += f"💡 Example: 0.1, 0.5, 1.0, 2.5\n\n"
-            text += f"🔧 Type the amount of {chain_data['symbol']} you want to spend:"
-            
-            keyboard = self.create_inline_keyboard([
-                [{'text': '🔙 Back to Amount Selection', 'callback_data': 'buy_sell'}]
-            ])
+            text = _CUSTOM_AMOUNT_TEXT.format(network=chain_data['name'], symbol=chain_data['symbol'])
             
-            await self.send_message(chat_id, text, keyboard)
+            await self.send_message(chat_id, text, _CUSTOM_AMOUNT_KEYBOARD_JSON)
             
         except Exception as e:
             logger.error(f"Error handling custom amount selection: {e}")
@@ -4179,37 +4539,16 @@ class SimpleTelegramBot:
         """Handle slippage editing"""
         try:
             # Store user_id in trading state
-            if chat_id not in self.trading_state:
-                self.trading_state[chat_id] = {}
+            state = self.trading_state.setdefault(chat_id, {})
             
-            self.trading_state[chat_id]['user_id'] = user_id
+            state['user_id'] = user_id
             
             # Get current slippage
             current_slippage = self.get_user_slippage(user_id)
             
-            text = f"⚙️ Slippage Settings\n\n"
-            text += f"Current Slippage: {current_slippage}%\n\n"
-            text += f"💡 Slippage tolerance allows for price movement during trade execution.\n"
-            text += f"Higher slippage = faster execution but potentially worse price.\n\n"
-            text += f"🔧 Enter new slippage percentage (0.1 - 50):"
-            
-            keyboard = self.create_inline_keyboard([
-                [
-                    {'text': '0.5%', 'callback_data': 'set_slippage_0.5'},
-                    {'text': '1%', 'callback_data': 'set_slippage_1'},
-                    {'text': '2%', 'callback_data': 'set_slippage_2'}
-                ],
-                [
-                    {'text': '5%', 'callback_data': 'set_slippage_5'},
-                    {'text': '10%', 'callback_data': 'set_slippage_10'},
-                    {'text': 'Custom', 'callback_data': 'set_slippage_custom'}
-                ],
-                [
-                    {'text': '🔙 Back to Trading', 'callback_data': 'buy_sell'}
-                ]
-            ])
+            text = _EDIT_SLIPPAGE_TEXT.format(current_slippage=current_slippage)
             
-            await self.send_message(chat_id, text, keyboard)
+            await self.send_message(chat_id, text, _SLIPPAGE_KEYBOARD_JSON)
             
         except Exception as e:
             logger.error(f"Error handling slippage edit: {e}")
@@ -4222,11 +4561,7 @@ class SimpleTelegramBot:
                 text = f"🔧 Enter Custom Slippage\n\n"
                 text += f"💡 Enter slippage percentage (0.1 - 50):"
                 
-                keyboard = self.create_inline_keyboard([
-                    [{'text': '🔙 Back to Slippage Settings', 'callback_data': f'edit_slippage_buy'}]
-                ])
-                
-                await self.send_message(chat_id, text, keyboard)
+                await self.send_message(chat_id, text, _CUSTOM_SLIPPAGE_KEYBOARD_JSON)
                 return
             
             # Parse and validate slippage
@@ -4246,11 +4581,7 @@ class SimpleTelegramBot:
             text += f"New Slippage: {slippage_value}%\n\n"
             text += f"🔄 Returning to trading..."
             
-            keyboard = self.create_inline_keyboard([
-                [{'text': '🔙 Back to Trading', 'callback_data': 'buy_sell'}]
-            ])
-            
-            await self.send_message(chat_id, text, keyboard)
+            await self.send_message(chat_id, text, _BACK_TO_TRADING_KEYBOARD_JSON)
             
         except Exception as e:
             logger.error(f"Error setting slippage: {e}")
@@ -4260,22 +4591,21 @@ class SimpleTelegramBot:
         """Handle sell percentage button selection"""
         try:
             # Store user_id in trading state
-            if chat_id not in self.trading_state:
-                self.trading_state[chat_id] = {}
+            state = self.trading_state.setdefault(chat_id, {})
             
-            self.trading_state[chat_id]['user_id'] = user_id
+            state['user_id'] = user_id
             
             # Get current trading state
-            action = self.trading_state[chat_id].get('action', 'sell')
-            token_address = self.trading_state[chat_id].get('token') or self.trading_state[chat_id].get('token_address')
-            chain = self.trading_state[chat_id].get('chain', 'BSC')
+            action = state.get('action', 'sell')
+            token_address = state.get('token_address')
+            chain = state.get('chain', 'BSC')
             
             if not token_address:
                 await self.send_message(chat_id, "❌ No token address found. Please start over.")
                 return
             
-            # Get user's token balance
-            wallet_data = self.firebase.get_user_wallet(user_id)
+            # Get user's token balance (wallet is cached and read off the event loop)
+            wallet_data = await self._get_user_wallet(user_id)
             if not wallet_data:
                 await self.send_message(chat_id, "❌ No wallet found. Please create a wallet first.")
                 return
@@ -4283,7 +4613,7 @@ class SimpleTelegramBot:
             wallet_address = wallet_data['public_key']
             
             # Get token balance using contract call
-            token_balance = await self._get_token_balance_contract_call(chain, wallet_address, token_address)
+            token_balance = await self._get_cached_token_balance(chain, wallet_address, token_address)
             
             if token_balance <= 0:
                 await self.send_message(chat_id, "❌ You don't have any tokens to sell.")
@@ -4294,46 +4624,29 @@ class SimpleTelegramBot:
             sell_amount = token_balance * percentage_value
             
             # Store the calculated amount as float
-            self.trading_state[chat_id]['amount'] = sell_amount
+            state['amount'] = sell_amount
             
             # Get chain data
             chain_data = self.get_chain_data(chain)
             
             # Show confirmation with calculated amount
-            text = f"🔴 **SELL TRANSACTION OVERVIEW**\n\n"
-            text += f"🔑 **Token:** `{token_address[:20]}...`\n"
-            text += f"🌐 Network: {chain_data['name']}\n"
-            text += f"🔄 **DEX:** {chain_data['dex']}\n\n"
-            
-            text += f"💰 **Transaction Details:**\n"
-            text += f"• **Token Amount:** {sell_amount:.6f}\n"
-            text += f"• **Percentage:** {percentage}% of balance\n"
-            text += f"• **Total Balance:** {token_balance:.6f}\n\n"
-            
-            text += f"🪙 **Token Details:**\n"
             estimated_native = sell_amount * 0.00280184  # Estimated price
             gas_estimate = 0.005
-            net_native = estimated_native - gas_estimate
-            text += f"• **Estimated {chain_data['symbol']}:** {estimated_native:.6f} {chain_data['symbol']}\n"
-            text += f"• **Gas Fee:** {gas_estimate:.6f} {chain_data['symbol']}\n"
-            text += f"• **Net {chain_data['symbol']}:** {net_native:.6f} {chain_data['symbol']}\n\n"
-            text += f"💰 **Price Details:**\n"
-            text += f"• **Price per Token:** 0.00280184 {chain_data['symbol']}\n"
-            text += f"• **Slippage:** {self.get_user_slippage(user_id)}%\n\n"
-            
-            text += f"📊 **Price Impact:** Low\n"
-            text += f"⏱️ **Estimated Time:** 30-60 seconds\n\n"
-            text += f"⚠️ **Please review the details above.**\n"
-            text += f"Click 'Confirm Sell' to proceed with the transaction."
-            
-            keyboard = self.create_inline_keyboard([
-                [
-                    {'text': '✅ Confirm Sell', 'callback_data': 'confirm_sell'},
-                    {'text': '❌ Cancel', 'callback_data': 'buy_sell'}
-                ]
-            ])
+            text = _SELL_PERCENTAGE_OVERVIEW_TMPL.format(
+                addr=token_address[:20],
+                chain_name=chain_data['name'],
+                dex=chain_data['dex'],
+                native=chain_data['symbol'],
+                tokens=sell_amount,
+                percentage=percentage,
+                balance=token_balance,
+                estimated=estimated_native,
+                gas=gas_estimate,
+                net=estimated_native - gas_estimate,
+                slip=self.get_user_slippage(user_id)
+            )
             
-            await self.send_message(chat_id, text, keyboard)
+            await self.send_message(chat_id, text, _CONFIRM_KEYBOARD_JSON['sell'])
             
         except Exception as e:
             logger.error(f"Error handling sell percentage selection: {e}")
@@ -4359,6 +4672,11 @@ def main():
         
         # Start both bot and HTTP server
         async def run_both():
+            # Let new tasks run up to their first real suspension right away (Python 3.12+)
+            eager_task_factory = getattr(asyncio, 'eager_task_factory', None)
+            if eager_task_factory:
+                asyncio.get_running_loop().set_task_factory(eager_task_factory)
+            
             # Start HTTP server
             http_runner = await start_http_server(bot)
             
@@ -4368,8 +4686,12 @@ def main():
             finally:
                 # Clean up HTTP server
                 await http_runner.cleanup()
+                # Close pooled client sessions
+                await bot.close()
         
-        asyncio.run(run_both())
+        loop_factory = uvloop.new_event_loop if uvloop else None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(run_both())
         
     except KeyboardInterrupt:
         print("\n👋 Bot stopped by user")
@@ -1,12 +1,56 @@
 import asyncio
 import aiohttp
 import logging
+import time
+from collections import OrderedDict
+from eth_abi import encode as abi_encode, decode as abi_decode
 from web3 import Web3
 from decimal import Decimal
 import json
 
+try:
+    import orjson  # faster decoding of large Mobula payloads
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Both accept the raw response bytes
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Multicall3 is deployed at the same address on BSC and Ethereum
+MULTICALL3_ADDRESS = '0xcA11bde05977b3631167028862bE2a173976CA11'
+_AGGREGATE3_SELECTOR = bytes.fromhex('82ad56cb')  # aggregate3((address,bool,bytes)[])
+_NAME_SELECTOR = bytes.fromhex('06fdde03')  # name()
+_SYMBOL_SELECTOR = bytes.fromhex('95d89b41')  # symbol()
+_DECIMALS_SELECTOR = bytes.fromhex('313ce567')  # decimals()
+_BALANCE_OF_SELECTOR = bytes.fromhex('70a08231')  # balanceOf(address)
+
+# Concurrent DexView requests allowed when pricing many tokens at once
+DEXVIEW_MAX_CONCURRENCY = 16
+
+# DexView prices are reused for a minute, keeping the most recently used tokens
+PRICE_CACHE_TTL = 60  # seconds
+PRICE_CACHE_MAX_ENTRIES = 4096
+
+# Portfolios with more assets than this are split by chain in a worker thread
+_FORMAT_IN_THREAD_MIN_ASSETS = 500
+
+# Mobula chain IDs mapped to our chain names
+_MOBULA_CHAINS = {
+    'evm:56': 'BSC',
+    'evm:1': 'ETH',
+    '56': 'BSC',
+    '1': 'ETH'
+}
+
+def _decode_abi_string(data):
+    """Decode a name()/symbol() return value, accepting both string and bytes32 encodings"""
+    try:
+        return abi_decode(['string'], data)[0]
+    except Exception:
+        return data.rstrip(b'\x00').decode('utf-8', errors='ignore')
+
 class PositionsManager:
     def __init__(self):
         # API endpoints
@@ -19,9 +63,56 @@ class PositionsManager:
         # Web3 instances for balance checking
         self.web3_instances = {}
         
+        # Pooled HTTP session, created lazily on first request inside the event loop
+        self._session = None
+        
+        # Short-lived Mobula portfolio caches so BSC and ETH views share one API call
+        self._portfolio_ttl = 30  # seconds
+        self._portfolio_cache = {}  # wallet -> (timestamp, raw portfolio)
+        self._formatted_cache = {}  # wallet -> (timestamp, portfolio split by chain)
+        self._portfolio_inflight = {}  # wallet -> Task of the running Mobula request
+        
+        # Bounds the fan-out of DexView price lookups
+        self._price_semaphore = asyncio.Semaphore(DEXVIEW_MAX_CONCURRENCY)
+        self._price_cache = OrderedDict()  # (token, chain) -> (timestamp, price data)
+        self._price_inflight = {}  # (token, chain) -> Task of the running DexView request
+        
         # Initialize Web3 connections
         self._initialize_web3()
     
+    async def _get_session(self):
+        """Return the shared HTTP session, (re)creating it if needed"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=15),
+                connector=aiohttp.TCPConnector(limit=128, limit_per_host=64, ttl_dns_cache=300)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._portfolio_cache.clear()
+        self._formatted_cache.clear()
+        self._price_cache.clear()
+    
+    def _cache_get(self, cache, key):
+        """Return a cached value younger than the portfolio TTL, or None"""
+        entry = cache.get(key)
+        if entry is not None and time.monotonic() - entry[0] < self._portfolio_ttl:
+            return entry[1]
+        return None
+    
+    def _cache_put(self, cache, key, value):
+        """Store value and drop entries that have expired"""
+        now = time.monotonic()
+        expired = [k for k, (ts, _) in cache.items() if now - ts >= self._portfolio_ttl]
+        for k in expired:
+            del cache[k]
+        cache[key] = (now, value)
+    
     def _initialize_web3(self):
         """Initialize Web3 connections for different chains"""
         try:
@@ -36,7 +127,21 @@ class PositionsManager:
             logger.error(f"❌ Error initializing Web3 connections: {e}")
     
     async def get_mobula_portfolio(self, wallet_address):
-        """Get portfolio data from Mobula API"""
+        """Get portfolio data from Mobula API, sharing recent and in-flight requests"""
+        cached = self._cache_get(self._portfolio_cache, wallet_address)
+        if cached is not None:
+            return cached
+        
+        task = self._portfolio_inflight.get(wallet_address)
+        if task is None:
+            task = asyncio.create_task(self._fetch_mobula_portfolio(wallet_address))
+            self._portfolio_inflight[wallet_address] = task
+            task.add_done_callback(lambda _: self._portfolio_inflight.pop(wallet_address, None))
+        # Shielded so a cancelled caller doesn't cancel the request for the others
+        return await asyncio.shield(task)
+    
+    async def _fetch_mobula_portfolio(self, wallet_address):
+        """Request the wallet portfolio from Mobula"""
         try:
             headers = {
                 'Authorization': f'Bearer {self.mobula_api_key}'
@@ -46,68 +151,56 @@ class PositionsManager:
                 'wallet': wallet_address
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.mobula_api_url, headers=headers, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('data', {})
-                    else:
-                        logger.error(f"Mobula API error: {response.status}")
-                        return None
-                        
+            session = await self._get_session()
+            async with session.get(self.mobula_api_url, headers=headers, params=params) as response:
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    portfolio = data.get('data', {})
+                    self._cache_put(self._portfolio_cache, wallet_address, portfolio)
+                    return portfolio
+                else:
+                    logger.error(f"Mobula API error: {response.status}")
+                    return None
+                    
         except Exception as e:
             logger.error(f"Error fetching Mobula portfolio: {e}")
             return None
     
-    async def format_mobula_portfolio_by_chain(self, portfolio_data):
+    def format_mobula_portfolio_by_chain(self, portfolio_data):
         """Format Mobula portfolio data by chain"""
         try:
             if not portfolio_data or 'assets' not in portfolio_data:
                 return {"BSC": [], "ETH": []}
             
-            # Chain mapping from Mobula to our format
-            chain_mapping = {
-                'evm:56': 'BSC',  # BSC
-                'evm:1': 'ETH',   # Ethereum
-                '56': 'BSC',
-                '1': 'ETH'
-            }
-            
             bsc_assets = []
             eth_assets = []
+            append_to = {'BSC': bsc_assets.append, 'ETH': eth_assets.append}
             
             for asset in portfolio_data['assets']:
-                if asset['token_balance'] <= 0:  # Skip zero balance assets
+                balance = asset['token_balance']
+                if balance <= 0:  # Skip zero balance assets
                     continue
                 
-                # Determine chain from contracts_balances
-                chain = 'BSC'  # Default to BSC
-                for contract_balance in asset.get('contracts_balances', []):
-                    chain_id = contract_balance.get('chainId', '')
-                    if 'evm:1' in chain_id or chain_id == '1':
-                        chain = 'ETH'
-                        break
-                    elif 'evm:56' in chain_id or chain_id == '56':
-                        chain = 'BSC'
-                        break
+                # The first contract on a known chain decides where the asset goes (default BSC)
+                contracts = asset.get('contracts_balances') or ()
+                chain = next(
+                    (_MOBULA_CHAINS[c.get('chainId')] for c in contracts if c.get('chainId') in _MOBULA_CHAINS),
+                    'BSC'
+                )
                 
                 # Format asset data
-                asset_info = {
-                    'symbol': asset['asset']['symbol'],
-                    'name': asset['asset']['name'],
-                    'balance': asset['token_balance'],
+                info = asset['asset']
+                append_to[chain]({
+                    'symbol': info['symbol'],
+                    'name': info['name'],
+                    'balance': balance,
                     'price_usd': asset['price'],
                     'value_usd': asset['estimated_balance'],
                     'price_change_24h': asset['price_change_24h'],
-                    'logo': asset['asset']['logo'],
-                    'contract_address': asset['contracts_balances'][0]['address'] if asset.get('contracts_balances') else '',
+                    'logo': info['logo'],
+                    'contract_address': contracts[0]['address'] if contracts else '',
                     'allocation': asset.get('allocation', 0)
-                }
-                
-                if chain == 'BSC':
-                    bsc_assets.append(asset_info)
-                else:
-                    eth_assets.append(asset_info)
+                })
             
             return {
                 'BSC': bsc_assets,
@@ -122,14 +215,20 @@ class PositionsManager:
     async def get_chain_portfolio(self, wallet_address, chain):
         """Get portfolio data for a specific chain using Mobula API"""
         try:
-            # Get portfolio data from Mobula
-            portfolio_data = await self.get_mobula_portfolio(wallet_address)
-            
-            if not portfolio_data:
-                return []
-            
-            # Format data by chain
-            formatted_data = await self.format_mobula_portfolio_by_chain(portfolio_data)
+            formatted_data = self._cache_get(self._formatted_cache, wallet_address)
+            if formatted_data is None:
+                # Get portfolio data from Mobula
+                portfolio_data = await self.get_mobula_portfolio(wallet_address)
+                
+                if not portfolio_data:
+                    return []
+                
+                # Format data by chain; only very large portfolios are worth a thread hop
+                if len(portfolio_data.get('assets') or ()) > _FORMAT_IN_THREAD_MIN_ASSETS:
+                    formatted_data = await asyncio.to_thread(self.format_mobula_portfolio_by_chain, portfolio_data)
+                else:
+                    formatted_data = self.format_mobula_portfolio_by_chain(portfolio_data)
+                self._cache_put(self._formatted_cache, wallet_address, formatted_data)
             
             # Return data for requested chain
             return formatted_data.get(chain.upper(), [])
@@ -148,19 +247,19 @@ class PositionsManager:
                 "id": 1
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.bsc_api_url, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if 'result' in data:
-                            return data['result']
-                        else:
-                            logger.error(f"BSC API error: {data}")
-                            return None
+            session = await self._get_session()
+            async with session.post(self.bsc_api_url, json=payload) as response:
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    if 'result' in data:
+                        return data['result']
                     else:
-                        logger.error(f"BSC API request failed: {response.status}")
+                        logger.error(f"BSC API error: {data}")
                         return None
-                
+                else:
+                    logger.error(f"BSC API request failed: {response.status}")
+                    return None
+            
         except Exception as e:
             logger.error(f"Error fetching BSC token holdings: {e}")
             return None
@@ -170,21 +269,46 @@ class PositionsManager:
         try:
             api_url = f"{self.eth_api_url}/addresses/{wallet_address}/tokens?type=ERC-20"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data.get('items', [])
-                    else:
-                        logger.error(f"ETH API request failed: {response.status}")
-                        return []
-                        
+            session = await self._get_session()
+            async with session.get(api_url) as response:
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    return data.get('items', [])
+                else:
+                    logger.error(f"ETH API request failed: {response.status}")
+                    return []
+                    
         except Exception as e:
             logger.error(f"Error fetching ETH token holdings: {e}")
             return []
     
     async def get_token_price_from_dexview(self, token_address, chain):
-        """Get token price from DexView API"""
+        """Get token price from DexView API, served from memory for PRICE_CACHE_TTL seconds"""
+        key = (token_address.lower(), chain)
+        cached = self._price_cache.get(key)
+        if cached and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+            self._price_cache.move_to_end(key)
+            return cached[1]
+        
+        # Concurrent lookups of the same token share one request; shield it so a
+        # cancelled caller doesn't cancel it for the others
+        task = self._price_inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_dexview_price(token_address, chain))
+            self._price_inflight[key] = task
+            task.add_done_callback(lambda _: self._price_inflight.pop(key, None))
+        price_data = await asyncio.shield(task)
+        
+        # Only remember successful lookups so failures are retried straight away
+        if price_data is not None:
+            self._price_cache[key] = (time.monotonic(), price_data)
+            self._price_cache.move_to_end(key)
+            while len(self._price_cache) > PRICE_CACHE_MAX_ENTRIES:
+                self._price_cache.popitem(last=False)
+        return price_data
+    
+    async def _fetch_dexview_price(self, token_address, chain):
+        """Request the token's most liquid pair from DexView"""
         try:
             # Map chain names for DexView API
             chain_mapping = {
@@ -197,41 +321,45 @@ class PositionsManager:
             
             params = {'chain': mapped_chain}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(api_url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if 'pairs' and len(data['pairs']) > 0:
-                            # Get the first pair (usually the most liquid)
-                            pair = data['pairs'][0]
-                            return {
-                                'price_usd': pair.get('priceUsd', 0),
-                                'price_native': pair.get('priceNative', 0),
-                                'liquidity_usd': pair.get('liquidity', {}).get('usd', 0),
-                                'volume_24h': pair.get('volume', {}).get('h24', 0)
-                            }
-                        else:
-                            return None
+            session = await self._get_session()
+            async with self._price_semaphore, session.get(api_url, params=params) as response:
+                if response.status == 200:
+                    data = _json_loads(await response.read())
+                    if 'pairs' and len(data['pairs']) > 0:
+                        # Get the first pair (usually the most liquid)
+                        pair = data['pairs'][0]
+                        return {
+                            'price_usd': pair.get('priceUsd', 0),
+                            'price_native': pair.get('priceNative', 0),
+                            'liquidity_usd': pair.get('liquidity', {}).get('usd', 0),
+                            'volume_24h': pair.get('volume', {}).get('h24', 0)
+                        }
                     else:
-                        logger.error(f"DexView API request failed: {response.status}")
                         return None
-                        
+                else:
+                    logger.error(f"DexView API request failed: {response.status}")
+                    return None
+                    
         except Exception as e:
             logger.error(f"Error fetching token price from DexView: {e}")
             return None
     
+    async def get_token_prices(self, token_addresses, chain):
+        """Get DexView prices for several tokens concurrently, keyed by token address"""
+        prices = await asyncio.gather(
+            *(self.get_token_price_from_dexview(token_address, chain) for token_address in token_addresses)
+        )
+        return dict(zip(token_addresses, prices))
+    
     def get_token_balance(self, web3_instance, token_address, wallet_address, decimals):
         """Get token balance using Web3 contract call"""
         try:
-            # ERC-20 balanceOf function signature
-            balance_of_signature = "0x70a08231"  # balanceOf(address)
-            
-            # Encode the function call
-            encoded_data = balance_of_signature + "000000000000000000000000" + wallet_address[2:]  # Remove 0x prefix
+            # balanceOf(address) with the wallet left-padded to 32 bytes
+            encoded_data = _BALANCE_OF_SELECTOR + bytes(12) + bytes.fromhex(wallet_address[2:])
             
             # Make the call
             result = web3_instance.eth.call({
-                'to': token_address,
+                'to': Web3.to_checksum_address(token_address),
                 'data': encoded_data
             })
             
@@ -284,6 +412,14 @@ class PositionsManager:
                 'error': str(e)
             }
     
+    async def get_both_chains_portfolio(self, wallet_address):
+        """Get BSC and ETH token balances concurrently"""
+        bsc, eth = await asyncio.gather(
+            self.get_all_token_balances(wallet_address, 'BSC'),
+            self.get_all_token_balances(wallet_address, 'ETH')
+        )
+        return {'BSC': bsc, 'ETH': eth}
+    
     async def _get_bsc_balances_fallback(self, wallet_address):
         """Fallback method for BSC balances (placeholder)"""
         # This is a placeholder - you'll need to implement with actual API key
@@ -314,29 +450,27 @@ class PositionsManager:
     
     async def check_specific_contract_balance(self, wallet_address, contract_address, chain):
         """Check balance of a specific token contract"""
+        price_task = None
         try:
             if chain not in self.web3_instances:
                 return {'error': f'Chain {chain} not supported'}
             
             web3_instance = self.web3_instances[chain]
             
-            # Get token info (name, symbol, decimals)
-            token_info = await self._get_token_info(web3_instance, contract_address)
+            # The DexView price doesn't depend on the RPC reads, so fetch it alongside them
+            price_task = asyncio.create_task(self.get_token_price_from_dexview(contract_address, chain))
+            
+            # Get token info (name, symbol, decimals) and balance
+            token_info = await self.get_token_info_and_balance(web3_instance, contract_address, wallet_address)
             
             if not token_info:
                 return {'error': 'Could not get token information'}
             
-            # Get balance
-            balance = self.get_token_balance(
-                web3_instance, 
-                contract_address, 
-                wallet_address, 
-                token_info['decimals']
-            )
+            balance = token_info['balance']
             
             if balance > 0:
                 # Get price from DexView
-                price_data = await self.get_token_price_from_dexview(contract_address, chain)
+                price_data = await price_task
                 
                 # Only return if token has meaningful value
                 price_usd = price_data['price_usd'] if price_data and price_data.get('price_usd') else 0
@@ -378,46 +512,90 @@ class PositionsManager:
         except Exception as e:
             logger.error(f"Error checking contract balance: {e}")
             return {'error': str(e)}
+        finally:
+            # Not needed when the wallet holds none of the token
+            if price_task is not None and not price_task.done():
+                price_task.cancel()
     
-    async def _get_token_info(self, web3_instance, contract_address):
-        """Get basic token information (name, symbol, decimals)"""
+    async def get_token_info_and_balance(self, web3_instance, contract_address, wallet_address):
+        """Get token information plus the wallet's balance of it"""
+        return await asyncio.to_thread(self._read_token_info, web3_instance, contract_address, wallet_address)
+    
+    def _read_token_info(self, web3_instance, contract_address, wallet_address=None):
+        """Read name, symbol, decimals (and balance) in one Multicall3 call, falling back to single calls"""
+        try:
+            return self._multicall_token_info(web3_instance, contract_address, wallet_address)
+        except Exception as e:
+            logger.warning(f"Multicall3 token info failed for {contract_address}, using single calls: {e}")
+        
         try:
-            # ERC-20 function signatures
-            name_signature = "0x06fdde03"      # name()
-            symbol_signature = "0x95d89b41"    # symbol()
-            decimals_signature = "0x313ce567"  # decimals()
+            # Checksum once instead of per call
+            token = Web3.to_checksum_address(contract_address)
             
             # Get name
             name_result = web3_instance.eth.call({
-                'to': contract_address,
-                'data': name_signature
+                'to': token,
+                'data': _NAME_SELECTOR
             })
-            name = name_result.decode('utf-8').rstrip('\x00')
+            name = _decode_abi_string(name_result)
             
             # Get symbol
             symbol_result = web3_instance.eth.call({
-                'to': contract_address,
-                'data': symbol_signature
+                'to': token,
+                'data': _SYMBOL_SELECTOR
             })
-            symbol = symbol_result.decode('utf-8').rstrip('\x00')
+            symbol = _decode_abi_string(symbol_result)
             
             # Get decimals
             decimals_result = web3_instance.eth.call({
-                'to': contract_address,
-                'data': decimals_signature
+                'to': token,
+                'data': _DECIMALS_SELECTOR
             })
             decimals = int.from_bytes(decimals_result, byteorder='big')
             
-            return {
+            token_info = {
                 'name': name,
                 'symbol': symbol,
                 'decimals': decimals
             }
+            if wallet_address:
+                token_info['balance'] = self.get_token_balance(web3_instance, token, wallet_address, decimals)
+            return token_info
             
         except Exception as e:
             logger.error(f"Error getting token info: {e}")
             return None
     
+    def _multicall_token_info(self, web3_instance, contract_address, wallet_address=None):
+        """name(), symbol(), decimals() and optionally balanceOf(wallet) aggregated into one eth_call"""
+        token = Web3.to_checksum_address(contract_address)
+        calls = [
+            (token, True, _NAME_SELECTOR),
+            (token, True, _SYMBOL_SELECTOR),
+            (token, True, _DECIMALS_SELECTOR),
+        ]
+        if wallet_address:
+            calls.append((token, True, _BALANCE_OF_SELECTOR + bytes(12) + bytes.fromhex(wallet_address[2:])))
+        
+        data = _AGGREGATE3_SELECTOR + abi_encode(['(address,bool,bytes)[]'], [calls])
+        (results,) = abi_decode(['(bool,bytes)[]'], web3_instance.eth.call({'to': MULTICALL3_ADDRESS, 'data': data}))
+        (name_ok, name), (symbol_ok, symbol), (decimals_ok, decimals) = results[:3]
+        if not (name_ok and symbol_ok and decimals_ok and decimals):
+            # Not an ERC-20 contract
+            return None
+        
+        decimals = int.from_bytes(decimals, byteorder='big')
+        token_info = {
+            'name': _decode_abi_string(name),
+            'symbol': _decode_abi_string(symbol),
+            'decimals': decimals
+        }
+        if wallet_address:
+            balance_ok, balance = results[3]
+            balance = int.from_bytes(balance, byteorder='big') if balance_ok and balance else 0
+            token_info['balance'] = float(Decimal(balance) / Decimal(10 ** decimals))
+        return token_info
+    
     def format_balance_message(self, balance_data):
         """Format balance data into a readable message"""
         if not balance_data or 'balances' not in balance_data:
@@ -9,6 +9,24 @@ class TokenScanner:
         self.goplus_url = "https://api.gopluslabs.io/api/v1/token_security"
         self.supported_chains = ["BSC", "ETH"]
         
+        # Pooled HTTP session, created lazily on first request inside the event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, (re)creating it if needed"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=100, keepalive_timeout=300)
+            )
+        return self._session
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
     async def scan_token(self, token_address: str, chain: str) -> Optional[Dict[str, Any]]:
         """
         Scan a token using the DexView API and GoPlus Labs security API
@@ -26,48 +44,62 @@ class TokenScanner:
                 return {"error": f"Unsupported chain. Supported chains: {', '.join(self.supported_chains)}"}
             
             # Make both API requests in parallel
-            dexview_task = self._get_dexview_data(token_address)
+            market_task = self.get_market_data(token_address, chain.upper())
             security_task = self.get_token_security_info(token_address, chain.upper())
             
             # Wait for both requests to complete
-            dexview_data, security_data = await asyncio.gather(
-                dexview_task, security_task, return_exceptions=True
+            market_data, security_data = await asyncio.gather(
+                market_task, security_task, return_exceptions=True
             )
             
-            # Process DexView data
-            if isinstance(dexview_data, Exception):
-                return {"error": f"DexView API error: {str(dexview_data)}"}
-            
-            token_info = self._process_response(dexview_data, chain.upper())
-            
-            # Add security information if available
-            if not isinstance(security_data, Exception) and 'error' not in security_data:
-                token_info.update(security_data)
-            else:
-                # Add placeholder tax info if security API fails
-                token_info.update({
-                    'buy_tax': 0,
-                    'sell_tax': 0,
-                    'transfer_tax': 0,
-                    'holder_count': 0,
-                    'holders': [],
-                    'security_warning': 'Security data unavailable'
-                })
-            
-            return token_info
+            return self.combine_scan_data(market_data, security_data)
                         
         except Exception as e:
             return {"error": f"Error scanning token: {str(e)}"}
     
+    async def get_market_data(self, token_address: str, chain: str) -> Dict[str, Any]:
+        """Get price, liquidity and volume data for a token from DexView"""
+        dexview_data = await self._get_dexview_data(token_address)
+        return self._process_response(dexview_data, chain.upper())
+    
+    def combine_scan_data(self, market_data: Any, security_data: Any) -> Dict[str, Any]:
+        """
+        Merge DexView market data with GoPlus security data into a scan result
+        
+        Either argument may be an exception raised while fetching it. The inputs
+        are not modified, so cached responses can be passed in directly.
+        """
+        # Process DexView data
+        if isinstance(market_data, Exception):
+            return {"error": f"DexView API error: {str(market_data)}"}
+        
+        token_info = dict(market_data)
+        
+        # Add security information if available
+        if isinstance(security_data, dict) and 'error' not in security_data:
+            token_info.update(security_data)
+        else:
+            # Add placeholder tax info if security API fails
+            token_info.update({
+                'buy_tax': 0,
+                'sell_tax': 0,
+                'transfer_tax': 0,
+                'holder_count': 0,
+                'holders': [],
+                'security_warning': 'Security data unavailable'
+            })
+        
+        return token_info
+    
     async def _get_dexview_data(self, token_address: str) -> Dict[str, Any]:
         """Get data from DexView API"""
         url = f"{self.base_url}/{token_address}"
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers={'accept': '*/*'}) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    raise Exception(f"DexView API request failed with status {response.status}")
+        session = await self._get_session()
+        async with session.get(url, headers={'accept': '*/*'}) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                raise Exception(f"DexView API request failed with status {response.status}")
     
     async def get_token_security_info(self, token_address: str, chain: str) -> Optional[Dict[str, Any]]:
         """
@@ -96,13 +128,13 @@ class TokenScanner:
             url = f"{self.goplus_url}/{chain_id}"
             params = {'contract_addresses': token_address}
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params, headers={'accept': '*/*'}) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return self._process_security_response(data, token_address)
-                    else:
-                        return {"error": f"GoPlus API request failed with status {response.status}"}
+            session = await self._get_session()
+            async with session.get(url, params=params, headers={'accept': '*/*'}) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return self._process_security_response(data, token_address)
+                else:
+                    return {"error": f"GoPlus API request failed with status {response.status}"}
                         
         except Exception as e:
             return {"error": f"Error fetching security info: {str(e)}"}
@@ -439,6 +471,8 @@ async def test_scanner():
     print("\nCompact Result:")
     print(scanner.format_scan_result(result, compact=True))
     print(f"Length: {len(scanner.format_scan_result(result, compact=True))} chars")
+    
+    await scanner.close()
 
 if __name__ == "__main__":
     asyncio.run(test_scanner())
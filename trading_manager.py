@@ -2,7 +2,7 @@ import json
 import logging
 from typing import Dict, Any, Optional, Tuple
 from web3 import Web3
-from web3.exceptions import ContractLogicError, Web3ValidationError as ValidationError
+from web3.exceptions import ContractLogicError, TransactionNotFound, Web3ValidationError as ValidationError
 from eth_account import Account
 from config import PANCAKESWAP_CONTRACT, RPC_ENDPOINTS, TRADING_CONFIG
 
@@ -13,6 +13,7 @@ class TradingManager:
         self.web3_instances = {}
         self.router_contracts = {}
         self.trading_contracts = {}  # New custom trading contracts
+        self._validated_contracts = set()  # chains whose trading contract code was confirmed on-chain
         self._initialize_contracts()
     
     def _initialize_contracts(self):
@@ -340,8 +341,28 @@ class TradingManager:
             logger.error(f"Error getting sell estimate: {e}")
             return None
     
+    def _validate_trading_contract(self, chain: str) -> Optional[str]:
+        """Check the chain's trading contract has code, once per process; returns an error message or None"""
+        if chain in self._validated_contracts:
+            return None
+        
+        trading_contract = self.trading_contracts[chain]
+        try:
+            contract_code = self.web3_instances[chain].eth.get_code(trading_contract.address)
+            if contract_code == b'':
+                logger.error(f"Trading contract has no code at {trading_contract.address}")
+                return 'Trading contract not deployed or invalid'
+            logger.info(f"Trading contract validated at {trading_contract.address}")
+        except Exception as e:
+            logger.error(f"Error checking trading contract: {e}")
+            return f'Trading contract validation error: {str(e)}'
+        
+        self._validated_contracts.add(chain)
+        return None
+    
     def buy_tokens(self, chain: str, token_address: str, bnb_amount: float, 
-                   user_address: str, private_key: str, slippage: float = None) -> Dict[str, Any]:
+                   user_address: str, private_key: str, slippage: float = None,
+                   price_estimate: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Buy tokens with BNB using custom trading contract"""
         try:
             if chain not in self.trading_contracts:
@@ -355,15 +376,9 @@ class TradingManager:
             trading_contract = self.trading_contracts[chain]
             
             # Check if trading contract exists and has code
-            try:
-                contract_code = web3.eth.get_code(trading_contract.address)
-                if contract_code == b'':
-                    logger.error(f"Trading contract has no code at {trading_contract.address}")
-                    return {'success': False, 'error': 'Trading contract not deployed or invalid'}
-                logger.info(f"Trading contract validated at {trading_contract.address}")
-            except Exception as e:
-                logger.error(f"Error checking trading contract: {e}")
-                return {'success': False, 'error': f'Trading contract validation error: {str(e)}'}
+            validation_error = self._validate_trading_contract(chain)
+            if validation_error:
+                return {'success': False, 'error': validation_error}
             
             # Validate inputs
             if not web3.is_address(token_address):
@@ -372,8 +387,9 @@ class TradingManager:
             if bnb_amount <= 0:
                 return {'success': False, 'error': 'Invalid BNB amount'}
             
-            # Get price estimate
-            price_estimate = self.get_token_price_estimate(chain, token_address, bnb_amount)
+            # Get price estimate, unless the caller already has a fresh one
+            if price_estimate is None:
+                price_estimate = self.get_token_price_estimate(chain, token_address, bnb_amount)
             if not price_estimate:
                 return {'success': False, 'error': 'Could not get price estimate'}
             
@@ -664,15 +680,9 @@ class TradingManager:
             trading_contract = self.trading_contracts[chain]
             
             # Check if trading contract exists and has code
-            try:
-                contract_code = web3.eth.get_code(trading_contract.address)
-                if contract_code == b'':
-                    logger.error(f"Trading contract has no code at {trading_contract.address}")
-                    return {'success': False, 'error': 'Trading contract not deployed or invalid'}
-                logger.info(f"Trading contract validated at {trading_contract.address}")
-            except Exception as e:
-                logger.error(f"Error checking trading contract: {e}")
-                return {'success': False, 'error': f'Trading contract validation error: {str(e)}'}
+            validation_error = self._validate_trading_contract(chain)
+            if validation_error:
+                return {'success': False, 'error': validation_error}
             
             native_symbol = 'ETH' if chain in ['ETH', 'SEPOLIA'] else 'BNB'
             logger.info(f"Selling {token_amount} tokens of {token_address[:20]}... for {native_symbol}")
@@ -1017,8 +1027,11 @@ class TradingManager:
                     'logs': len(receipt['logs'])
                 }
             else:
-                return {'success': False, 'error': 'Transaction not found or pending'}
+                return {'success': False, 'pending': True, 'error': 'Transaction not found or pending'}
                 
+        except TransactionNotFound:
+            # Not mined yet; callers polling for confirmation will ask again
+            return {'success': False, 'pending': True, 'error': 'Transaction not found or pending'}
         except Exception as e:
             logger.error(f"Error getting transaction status: {e}")
             return {'success': False, 'error': f'Error: {str(e)}'}
@@ -6,6 +6,13 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# Display names shown to users, by chain key
+CHAIN_DISPLAY_NAMES = {
+    'ETH': 'Ethereum',
+    'BSC': 'Binance Smart Chain',
+    'BSC-TEST': 'BSC Testnet'
+}
+
 class TransferManager:
     def __init__(self):
         # Web3 instances for different chains
@@ -42,6 +49,9 @@ class TransferManager:
             }
         }
         
+        # Native symbol per chain, flattened out of chain_configs for quick lookups
+        self.native_symbols = {chain: config['native_symbol'] for chain, config in self.chain_configs.items()}
+        
         # Initialize Web3 connections
         self._initialize_web3()
     
@@ -227,6 +237,9 @@ class TransferManager:
             symbol_signature = "0x95d89b41"    # symbol()
             decimals_signature = "0x313ce567"  # decimals()
             
+            # Set when any field falls back to a placeholder value
+            fallback = False
+            
             # Get name
             try:
                 name_result = web3_instance.eth.call({
@@ -276,17 +289,21 @@ class TransferManager:
                 decimals = int.from_bytes(decimals_result, byteorder='big')
             except Exception:
                 decimals = 18  # Default to 18 decimals
+                fallback = True
             
             # Validate that we got meaningful data
             if not name or name == "Unknown Token":
                 name = f"Token ({contract_address[:8]}...)"
+                fallback = True
             if not symbol or symbol == "UNKNOWN":
                 symbol = "UNKNOWN"
+                fallback = True
             
             return {
                 'name': name,
                 'symbol': symbol,
-                'decimals': decimals
+                'decimals': decimals,
+                'resolved': not fallback
             }
             
         except Exception as e:
@@ -295,7 +312,8 @@ class TransferManager:
             return {
                 'name': f"Token ({contract_address[:8]}...)",
                 'symbol': "UNKNOWN",
-                'decimals': 18
+                'decimals': 18,
+                'resolved': False
             }
     
     def validate_address(self, address):
@@ -315,16 +333,11 @@ class TransferManager:
     
     def get_chain_display_name(self, chain):
         """Get display name for chain"""
-        display_names = {
-            'ETH': 'Ethereum',
-            'BSC': 'Binance Smart Chain',
-            'BSC-TEST': 'BSC Testnet'
-        }
-        return display_names.get(chain, chain)
+        return CHAIN_DISPLAY_NAMES.get(chain, chain)
     
     def get_native_symbol(self, chain):
         """Get native token symbol for chain"""
-        return self.chain_configs[chain]['native_symbol']
+        return self.native_symbols[chain]
     
     def format_transfer_summary(self, transfer_type, chain, amount, token_symbol=None, to_address=None):
         """Format transfer summary for user confirmation"""